@@ -0,0 +1,102 @@
+"""
+cache das claims de cada usuário, compiladas em bitsets
+
+as claims ativas de um usuário são guardadas como um único inteiro em que
+o bit de posição 'claim_id' indica a posse da claim. assim, verificar uma ou
+várias claims é uma operação de bits sobre um valor já em memória, sem
+consultar 'user_claims'. usuários inexistentes são guardados como None
+
+a invalidação entre workers usa o canal 'user_claims_changed', alimentado
+pelos gatilhos criados na migração das notificações de claims: o payload é
+o id do usuário afetado, ou '*' quando o catálogo de claims muda
+"""
+
+from typing import Callable, Iterable
+from ..config import settings
+from .notify_listener import NotifyListener
+from .ttl_cache import MISSING, TTLCache
+
+USER_CLAIMS_CHANNEL = "user_claims_changed"
+
+claim_cache = TTLCache(settings.CLAIM_CACHE_MAX_SIZE, settings.CLAIM_CACHE_TTL)
+
+
+def to_bits(claim_ids: Iterable[int]) -> int:
+    """
+    compila um conjunto de ids de claims em um bitset
+
+    :param claim_ids: ids das claims
+    :return: inteiro com o bit de cada id ligado
+    """
+    bits = 0
+    for claim_id in claim_ids:
+        bits |= 1 << claim_id
+    return bits
+
+
+def has_bit(bits: int, claim_id: int) -> bool:
+    """
+    verifica se o bit de uma claim está ligado no bitset
+
+    ids fora do intervalo 1..CLAIM_ID_MAX nunca estão concedidos, o que
+    evita deslocamentos negativos e inteiros arbitrariamente grandes
+
+    :param bits: bitset de claims
+    :param claim_id: id da claim
+    :return: True se a claim estiver presente no bitset
+    """
+    return 1 <= claim_id <= settings.CLAIM_ID_MAX and bool(bits >> claim_id & 1)
+
+
+def from_bits(bits: int) -> list[int]:
+    """
+    expande um bitset de volta para a lista ordenada de ids de claims
+
+    :param bits: bitset de claims
+    :return: ids das claims presentes no bitset
+    """
+    claim_ids = []
+    while bits:
+        lowest = bits & -bits
+        claim_ids.append(lowest.bit_length() - 1)
+        bits ^= lowest
+    return claim_ids
+
+
+def get_claim_bits(user_id: int, loader: Callable[[], int | None]) -> int | None:
+    """
+    busca o bitset de claims de um usuário, carregando-o com 'loader' em caso de falta
+
+    :param user_id: id do usuário
+    :param loader: função que compila o bitset a partir do banco
+    :return: o bitset das claims ativas do usuário, ou None se ele não existir
+    """
+    cached = claim_cache.get(user_id)
+    if cached is not MISSING:
+        return cached
+
+    generation = claim_cache.generation
+    bits = loader()
+    claim_cache.set(user_id, bits, generation=generation)
+    return bits
+
+
+def invalidate(payload: str) -> None:
+    """
+    aplica uma notificação do canal 'user_claims_changed'
+
+    :param payload: id do usuário alterado, ou '*' quando o catálogo de claims mudou
+    """
+    if payload == "*":
+        claim_cache.clear()
+    else:
+        claim_cache.invalidate(int(payload))
+
+
+def register_invalidation(listener: NotifyListener) -> None:
+    """
+    inscreve o cache de claims no ouvinte de notificações do worker
+
+    :param listener: ouvinte de LISTEN/NOTIFY do worker
+    """
+    listener.subscribe(USER_CLAIMS_CHANNEL, invalidate, on_reconnect=claim_cache.clear)
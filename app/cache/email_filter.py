@@ -0,0 +1,181 @@
+"""
+filtro de bloom dos e-mails cadastrados
+
+a maioria dos e-mails verificados antes de um cadastro ainda não existe.
+o filtro responde "com certeza ausente" sem consultar o banco e "talvez
+presente" nos demais casos, quando a consulta continua sendo feita. não há
+falsos negativos para os e-mails que o filtro viu; os falsos positivos
+acontecem na taxa EMAIL_FILTER_FALSE_POSITIVE_RATE enquanto a quantidade de
+e-mails não passar da capacidade
+
+o filtro é montado em uma leitura em lotes de 'users.email' e recebe os
+e-mails inseridos por este worker. os inseridos por outros workers ou
+processos (como o seed) só entram na próxima reconstrução, por isso ele só
+serve para evitar verificações de duplicados cujo erro o ON CONFLICT do
+insert corrige, e nunca para responder se um usuário existe. antes da primeira carga, tudo é "talvez presente"
+"""
+
+import hashlib
+import math
+import threading
+from typing import Iterable
+from ..config import settings
+
+# folga de capacidade sobre a quantidade carregada, para os cadastros até a próxima reconstrução
+_HEADROOM = 2
+
+
+class BloomFilter:
+    """
+    filtro de bloom com tamanho calculado a partir da capacidade e da taxa de falsos positivos
+
+    :param capacity: quantidade de itens prevista
+    :param false_positive_rate: taxa de falsos positivos desejada com 'capacity' itens
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # hashing duplo (kirsch-mitzenmacher): k posições a partir de dois valores de 64 bits
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        """
+        registra um item; não é seguro chamar de várias threads ao mesmo tempo
+
+        :param item: item a ser registrado
+        """
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def memory_bytes(self) -> int:
+        """
+        :return: tamanho do vetor de bits, em bytes
+        """
+        return len(self._bits)
+
+    @property
+    def estimated_false_positive_rate(self) -> float:
+        """
+        :return: taxa de falsos positivos esperada com a quantidade atual de itens
+        """
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+
+class EmailFilter:
+    """
+    filtro de e-mails do worker, substituído por inteiro a cada reconstrução
+
+    :param false_positive_rate: taxa de falsos positivos desejada
+    :param min_capacity: capacidade mínima de cada filtro montado
+    """
+
+    def __init__(self, false_positive_rate: float, min_capacity: int):
+        self.false_positive_rate = false_positive_rate
+        self.min_capacity = min_capacity
+        self._filter: BloomFilter | None = None
+        self._lock = threading.Lock()
+        # e-mails inseridos durante uma reconstrução, que a leitura pode não ter visto
+        self._added_while_loading: list[str] | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    def might_contain(self, email: str) -> bool:
+        """
+        indica se o e-mail pode estar cadastrado
+
+        :param email: e-mail consultado, sem diferenciar maiúsculas
+        :return: False apenas quando o e-mail com certeza não está cadastrado
+        """
+        current = self._filter
+        return current is None or email.lower() in current
+
+    def add(self, email: str) -> None:
+        """
+        registra um e-mail recém-inserido
+
+        :param email: e-mail inserido
+        """
+        email = email.lower()
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(email)
+            if self._added_while_loading is not None:
+                self._added_while_loading.append(email)
+
+    def rebuild(self, count: int, batches: Iterable[list[str]]) -> BloomFilter:
+        """
+        monta um novo filtro e o coloca no lugar do atual
+
+        o filtro atual continua respondendo durante a leitura. os e-mails
+        inseridos nesse meio-tempo são repassados ao novo filtro antes da troca
+
+        :param count: quantidade aproximada de e-mails, usada no dimensionamento
+        :param batches: lotes de e-mails cadastrados, em minúsculas
+        :return: o novo filtro
+        """
+        with self._lock:
+            self._added_while_loading = []
+        try:
+            bloom = BloomFilter(max(self.min_capacity, count * _HEADROOM), self.false_positive_rate)
+            for batch in batches:
+                for email in batch:
+                    bloom.add(email)
+        except BaseException:
+            with self._lock:
+                self._added_while_loading = None
+            raise
+        with self._lock:
+            for email in self._added_while_loading:
+                bloom.add(email)
+            self._added_while_loading = None
+            self._filter = bloom
+        return bloom
+
+    def clear(self) -> None:
+        """
+        descarta o filtro; até a próxima reconstrução, todo e-mail é "talvez presente"
+        """
+        with self._lock:
+            self._filter = None
+
+    def stats(self) -> dict:
+        """
+        resume o estado do filtro
+
+        :return: dicionário com capacidade, itens, memória e taxas de falsos positivos
+        """
+        current = self._filter
+        if current is None:
+            return {"ready": False, "false_positive_rate": self.false_positive_rate}
+        return {
+            "ready": True,
+            "capacity": current.capacity,
+            "count": current.count,
+            "bits": current.size,
+            "hashes": current.hashes,
+            "memory_bytes": current.memory_bytes,
+            "false_positive_rate": self.false_positive_rate,
+            "estimated_false_positive_rate": current.estimated_false_positive_rate,
+        }
+
+
+email_filter = EmailFilter(settings.EMAIL_FILTER_FALSE_POSITIVE_RATE, settings.EMAIL_FILTER_MIN_CAPACITY)
@@ -0,0 +1,145 @@
+"""
+ouvinte de notificações LISTEN/NOTIFY do postgres
+
+cada worker mantém uma conexão dedicada, fora do pool, escutando os canais
+registrados. as notificações são repassadas aos callbacks inscritos, o que
+permite invalidar caches locais quando outro worker ou processo altera uma
+tabela
+
+com uma réplica de leitura, um cache invalidado pode ser repovoado a partir
+da réplica antes que ela aplique a alteração; por isso, com
+'redispatch_after', cada notificação é entregue de novo depois desse
+intervalo, quando a réplica já deve estar em dia
+"""
+
+import collections
+import logging
+import select
+import threading
+import time
+from typing import Callable
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class NotifyListener:
+    """
+    thread que escuta canais do postgres e despacha as notificações recebidas
+    """
+
+    def __init__(self, engine: Engine, poll_interval: float = 1.0, retry_interval: float = 5.0, redispatch_after: float = 0):
+        """
+        :param engine: engine síncrono usado para abrir a conexão dedicada
+        :param poll_interval: intervalo máximo, em segundos, entre verificações de parada
+        :param retry_interval: espera, em segundos, antes de reconectar após uma falha
+        :param redispatch_after: se positivo, segundos após os quais cada notificação é entregue de novo
+        """
+        self.engine = engine
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+        self.redispatch_after = redispatch_after
+        self._pending: collections.deque[tuple[float, str, str]] = collections.deque()
+        self._callbacks: dict[str, list[Callable[[str], None]]] = {}
+        self._on_reconnect: list[Callable[[], None]] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, channel: str, callback: Callable[[str], None], on_reconnect: Callable[[], None] | None = None) -> None:
+        """
+        inscreve um callback em um canal; um canal pode ter vários callbacks
+
+        :param channel: nome do canal do postgres
+        :param callback: função chamada com o payload de cada notificação
+        :param on_reconnect: função chamada após cada (re)conexão, já que notificações podem ter sido perdidas
+        """
+        self._callbacks.setdefault(channel, []).append(callback)
+        if on_reconnect is not None:
+            self._on_reconnect.append(on_reconnect)
+
+    def start(self) -> None:
+        """
+        inicia a thread de escuta em segundo plano
+        """
+        if self._thread is None and self._callbacks:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="notify-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        sinaliza a parada da thread e aguarda o seu término
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval * 2)
+            self._thread = None
+
+    def dispatch(self, channel: str, payload: str) -> None:
+        """
+        repassa uma notificação aos callbacks do canal
+
+        :param channel: canal que recebeu a notificação
+        :param payload: conteúdo enviado pelo pg_notify
+        """
+        for callback in self._callbacks.get(channel, ()):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("falha ao processar notificação do canal %s", channel)
+
+    def receive(self, channel: str, payload: str) -> None:
+        """
+        despacha uma notificação recebida e agenda a sua nova entrega, se configurada
+
+        :param channel: canal que recebeu a notificação
+        :param payload: conteúdo enviado pelo pg_notify
+        """
+        self.dispatch(channel, payload)
+        if self.redispatch_after > 0:
+            self._pending.append((time.monotonic() + self.redispatch_after, channel, payload))
+
+    def dispatch_pending(self) -> None:
+        """
+        entrega de novo as notificações cujo intervalo de 'redispatch_after' já passou
+        """
+        now = time.monotonic()
+        while self._pending and self._pending[0][0] <= now:
+            _, channel, payload = self._pending.popleft()
+            self.dispatch(channel, payload)
+
+    def _wait_timeout(self) -> float:
+        if not self._pending:
+            return self.poll_interval
+        return max(0.0, min(self.poll_interval, self._pending[0][0] - time.monotonic()))
+
+    def _connect(self):
+        cargs, cparams = self.engine.dialect.create_connect_args(self.engine.url)
+        connection = self.engine.dialect.connect(*cargs, **cparams)
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            for channel in self._callbacks:
+                cursor.execute(f'LISTEN "{channel}"')
+        return connection
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                for on_reconnect in self._on_reconnect:
+                    on_reconnect()
+                while not self._stop.is_set():
+                    readable, _, _ = select.select([connection], [], [], self._wait_timeout())
+                    if readable:
+                        connection.poll()
+                        while connection.notifies:
+                            notification = connection.notifies.pop(0)
+                            self.receive(notification.channel, notification.payload)
+                    self.dispatch_pending()
+            except Exception:
+                logger.exception("conexão de LISTEN perdida, nova tentativa em %ss", self.retry_interval)
+                self._stop.wait(self.retry_interval)
+            finally:
+                if connection is not None:
+                    connection.close()
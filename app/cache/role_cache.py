@@ -0,0 +1,129 @@
+"""
+cache de leitura para os papéis (roles)
+
+a tabela 'roles' quase nunca muda, então as consultas por id são servidas
+da memória do worker. ids inexistentes também são guardados (entradas
+negativas) por um tempo menor. o cache guarda apenas os valores das colunas
+e devolve objetos Role transitórios, que não dependem de nenhuma sessão, de
+modo que um acerto não abre conexão com o banco
+
+a invalidação entre workers usa o canal 'roles_changed', alimentado pelo
+gatilho criado na migração das notificações de roles
+
+as faltas simultâneas do mesmo id são agrupadas em uma única consulta
+(single_flight), e só essa consulta grava o resultado no cache
+"""
+
+from typing import Awaitable, Callable
+from ..config import settings
+from ..models.role_model import Role
+from .notify_listener import NotifyListener
+from .single_flight import SingleFlight
+from .ttl_cache import MISSING, TTLCache
+
+ROLES_CHANNEL = "roles_changed"
+
+role_cache = TTLCache(settings.ROLE_CACHE_MAX_SIZE, settings.ROLE_CACHE_TTL)
+role_lookups = SingleFlight(settings.SINGLE_FLIGHT_TIMEOUT)
+
+
+def get_role_by_id(role_id: int, loader: Callable[[], Role | None]) -> Role | None:
+    """
+    busca um papel no cache, carregando-o com 'loader' em caso de falta
+
+    :param role_id: id do papel
+    :param loader: função que consulta o banco quando o papel não está em cache
+    :return: o papel encontrado ou None se ele não existir
+    """
+    cached = role_cache.get(role_id)
+    if cached is not MISSING:
+        return _from_entry(cached)
+    return fetch_role_by_id(role_id, lambda: _load(role_id, loader))
+
+
+async def get_role_by_id_async(role_id: int, loader: Callable[[], Awaitable[Role | None]]) -> Role | None:
+    """
+    equivalente assíncrono de 'get_role_by_id'
+
+    :param role_id: id do papel
+    :param loader: corrotina que consulta o banco quando o papel não está em cache
+    :return: o papel encontrado ou None se ele não existir
+    """
+    cached = role_cache.get(role_id)
+    if cached is not MISSING:
+        return _from_entry(cached)
+    return await fetch_role_by_id_async(role_id, lambda: _load_async(role_id, loader))
+
+
+def fetch_role_by_id(role_id: int, loader: Callable[[], Role | None]) -> Role | None:
+    """
+    consulta um papel sem ler o cache, agrupando as consultas simultâneas do mesmo id
+
+    :param role_id: id do papel
+    :param loader: função que consulta o banco
+    :return: o papel encontrado ou None se ele não existir
+    """
+    return role_lookups.do(role_id, loader, share=_to_entry, adopt=_from_entry)
+
+
+async def fetch_role_by_id_async(role_id: int, loader: Callable[[], Awaitable[Role | None]]) -> Role | None:
+    """
+    equivalente assíncrono de 'fetch_role_by_id'
+
+    :param role_id: id do papel
+    :param loader: corrotina que consulta o banco
+    :return: o papel encontrado ou None se ele não existir
+    """
+    return await role_lookups.do_async(role_id, loader, share=_to_entry, adopt=_from_entry)
+
+
+# a geração é lida antes da consulta e só a consulta agrupada grava no cache,
+# então uma invalidação ocorrida durante ela descarta o valor carregado
+def _load(role_id: int, loader: Callable[[], Role | None]) -> Role | None:
+    generation = role_cache.generation
+    role = loader()
+    _store(role_id, _to_entry(role), generation)
+    return role
+
+
+async def _load_async(role_id: int, loader: Callable[[], Awaitable[Role | None]]) -> Role | None:
+    generation = role_cache.generation
+    role = await loader()
+    _store(role_id, _to_entry(role), generation)
+    return role
+
+
+def _to_entry(role: Role | None) -> tuple[int, str] | None:
+    return None if role is None else (role.id, role.description)
+
+
+def _from_entry(entry: tuple[int, str] | None) -> Role | None:
+    return None if entry is None else Role(id=entry[0], description=entry[1])
+
+
+def _store(role_id: int, entry: tuple[int, str] | None, generation: int) -> None:
+    if entry is None:
+        role_cache.set(role_id, None, ttl=settings.ROLE_CACHE_NEGATIVE_TTL, generation=generation)
+    else:
+        role_cache.set(role_id, entry, generation=generation)
+
+
+def invalidate(payload: str) -> None:
+    """
+    aplica uma notificação do canal 'roles_changed'
+
+    :param payload: id do papel alterado, ou '*' quando a tabela inteira mudou
+    """
+    if payload == "*":
+        role_cache.clear()
+    else:
+        role_cache.invalidate(int(payload))
+
+
+def register_invalidation(listener: NotifyListener) -> None:
+    """
+    inscreve o cache de papéis no ouvinte de notificações do worker
+
+    :param listener: ouvinte de LISTEN/NOTIFY do worker
+    """
+    listener.subscribe(ROLES_CHANNEL, invalidate, on_reconnect=role_cache.clear)
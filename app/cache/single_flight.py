@@ -0,0 +1,137 @@
+"""
+agrupamento de consultas idênticas simultâneas (single-flight)
+
+quando várias requisições buscam a mesma chave ao mesmo tempo, apenas a
+primeira (a líder) executa a consulta; as demais esperam e recebem o mesmo
+resultado, ou a mesma exceção. a chave sai do mapa assim que a consulta
+termina, então nada é guardado além do tempo da consulta
+
+a líder recebe o próprio retorno de 'fn'. como as demais estão em outras
+sessões e threads, elas não recebem o objeto da líder: 'share' o converte,
+ainda na líder, em valores simples (tuplas, dicionários), e 'adopt' monta a
+partir deles o objeto de cada chamada, na sua própria sessão
+
+se a líder demorar mais que 'timeout', ou for cancelada no modo assíncrono,
+quem está esperando executa a consulta por conta própria, como se não
+houvesse agrupamento
+
+as chamadas síncronas (threadpool) e assíncronas (event loop) usam mapas
+separados, já que uma não pode esperar pela outra
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    mapa das consultas em andamento por chave
+
+    :param timeout: espera máxima pela consulta da líder, em segundos; None espera sem limite
+    """
+
+    def __init__(self, timeout: float | None = None):
+        self.timeout = timeout
+        self._calls: dict[Hashable, _Call] = {}
+        self._futures: dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], share: Callable = _identity, adopt: Callable = _identity) -> Any:
+        """
+        executa 'fn' ou espera a execução em andamento para a mesma chave
+
+        :param key: chave da consulta
+        :param fn: função que faz a consulta
+        :param share: converte o retorno da líder no valor entregue às demais chamadas
+        :param adopt: monta, em cada chamada que esperou, o resultado a partir do valor compartilhado
+        :return: o retorno de 'fn' na líder, ou 'adopt' do valor compartilhado nas demais
+        :raises Exception: a exceção levantada pela consulta da líder
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return adopt(call.value)
+
+        try:
+            value = fn()
+            call.value = share(value)
+            return value
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]], share: Callable = _identity, adopt: Callable = _identity
+    ) -> Any:
+        """
+        equivalente assíncrono de 'do'; 'share' e 'adopt' continuam síncronas
+
+        :param key: chave da consulta
+        :param fn: corrotina que faz a consulta
+        :param share: converte o retorno da líder no valor entregue às demais chamadas
+        :param adopt: monta, em cada chamada que esperou, o resultado a partir do valor compartilhado
+        :return: o retorno de 'fn' na líder, ou 'adopt' do valor compartilhado nas demais
+        :raises Exception: a exceção levantada pela consulta da líder
+        """
+        loop = asyncio.get_running_loop()
+        future = self._futures.get(key)
+        if future is not None and future.get_loop() is loop:
+            self.shared += 1
+            try:
+                shared = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+            except asyncio.TimeoutError:
+                return await fn()
+            except asyncio.CancelledError:
+                # só a líder cancelada é tratada aqui; o cancelamento desta chamada é repassado
+                if not future.cancelled():
+                    raise
+                return await fn()
+            return adopt(shared)
+
+        future = self._futures[key] = loop.create_future()
+        try:
+            value = await fn()
+            shared = share(value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # evita o aviso de exceção não lida quando ninguém estava esperando
+            future.exception()
+            raise
+        else:
+            future.set_result(shared)
+            return value
+        finally:
+            if self._futures.get(key) is future:
+                del self._futures[key]
@@ -0,0 +1,63 @@
+"""
+cache dos contadores de versão das tabelas
+
+os etags das rotas de catálogo dependem apenas desses contadores, então
+mantê-los em memória permite responder 304 sem consultar o banco. o ttl
+curto limita a defasagem quando não há notificações (por exemplo, no
+sqlite); no postgres o canal 'table_versions_changed' invalida a entrada
+assim que a tabela muda
+"""
+
+from typing import Awaitable, Callable
+from ..config import settings
+from .notify_listener import NotifyListener
+from .ttl_cache import MISSING, TTLCache
+
+TABLE_VERSIONS_CHANNEL = "table_versions_changed"
+
+version_cache = TTLCache(max_size=64, ttl=settings.TABLE_VERSION_CACHE_TTL)
+
+
+def get_version(table_name: str, loader: Callable[[], int | None]) -> int | None:
+    """
+    retorna a versão da tabela, carregando-a com 'loader' em caso de falta
+
+    :param table_name: nome da tabela versionada
+    :param loader: função que consulta a versão no banco
+    :return: o contador de alterações da tabela, ou None se ela não é versionada
+    """
+    cached = version_cache.get(table_name)
+    if cached is not MISSING:
+        return cached
+
+    generation = version_cache.generation
+    version = loader()
+    version_cache.set(table_name, version, generation=generation)
+    return version
+
+
+async def get_version_async(table_name: str, loader: Callable[[], Awaitable[int | None]]) -> int | None:
+    """
+    equivalente assíncrono de 'get_version'
+
+    :param table_name: nome da tabela versionada
+    :param loader: corrotina que consulta a versão no banco
+    :return: o contador de alterações da tabela, ou None se ela não é versionada
+    """
+    cached = version_cache.get(table_name)
+    if cached is not MISSING:
+        return cached
+
+    generation = version_cache.generation
+    version = await loader()
+    version_cache.set(table_name, version, generation=generation)
+    return version
+
+
+def register_invalidation(listener: NotifyListener) -> None:
+    """
+    inscreve o cache de versões no ouvinte de notificações do worker
+
+    :param listener: ouvinte de LISTEN/NOTIFY do worker
+    """
+    listener.subscribe(TABLE_VERSIONS_CHANNEL, version_cache.invalidate, on_reconnect=version_cache.clear)
@@ -0,0 +1,94 @@
+"""
+cache em memória com limite de tamanho e expiração por entrada
+
+as entradas mais antigas são descartadas quando o limite é atingido (lru)
+e cada entrada expira após o seu próprio ttl. a classe é segura para uso
+a partir de várias threads, já que os endpoints síncronos rodam no threadpool
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+MISSING = object()
+
+
+class TTLCache:
+    """
+    cache lru com expiração por tempo
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        :param max_size: número máximo de entradas mantidas
+        :param ttl: tempo de vida padrão das entradas, em segundos
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        busca uma entrada válida no cache
+
+        :param key: chave da entrada
+        :return: o valor armazenado ou MISSING se ausente ou expirado
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None, generation: int | None = None) -> None:
+        """
+        armazena uma entrada, descartando a menos usada se o limite for atingido
+
+        quando 'generation' é informado e alguma invalidação aconteceu desde
+        que ele foi lido, o valor é descartado, pois pode ter sido carregado
+        antes da alteração que gerou a invalidação
+
+        :param key: chave da entrada
+        :param value: valor a ser armazenado (None é um valor válido)
+        :param ttl: tempo de vida desta entrada; usa o padrão do cache se omitido
+        :param generation: valor de 'generation' lido antes de carregar o dado
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        remove uma entrada do cache, se existir
+
+        :param key: chave da entrada
+        """
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        remove todas as entradas do cache
+        """
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
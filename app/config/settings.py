@@ -0,0 +1,104 @@
+"""
+configurações da aplicação lidas a partir de variáveis de ambiente
+
+os valores são carregados uma única vez na importação do módulo, usando o
+arquivo .env quando presente, e expostos como constantes de módulo
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """
+    lê uma variável de ambiente booleana ('1', 'true', 'yes' e 'on' são verdadeiros)
+
+    :param name: nome da variável
+    :param default: valor usado quando a variável não está definida
+    :return: o valor booleano
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+DB_MODE = os.getenv("DB_MODE", "sync").lower()
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+
+DB_REPLICA_READ_AFTER_WRITE = float(os.getenv("DB_REPLICA_READ_AFTER_WRITE", 5))
+
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", os.cpu_count() or 1))
+
+PASSWORD_HASH_TARGET_MS = float(os.getenv("PASSWORD_HASH_TARGET_MS", 250))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 0))
+BCRYPT_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", 10))
+BCRYPT_MAX_ROUNDS = int(os.getenv("BCRYPT_MAX_ROUNDS", 15))
+BCRYPT_ROUNDS_TOLERANCE = int(os.getenv("BCRYPT_ROUNDS_TOLERANCE", 1))
+
+ADMISSION_ENABLED = _env_bool("ADMISSION_ENABLED", True)
+ADMISSION_CAPACITY = int(os.getenv("ADMISSION_CAPACITY", DB_POOL_SIZE + DB_MAX_OVERFLOW))
+ADMISSION_READ_RESERVE = int(os.getenv("ADMISSION_READ_RESERVE", max(1, ADMISSION_CAPACITY // 3)))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 2))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", 1))
+ADMISSION_READ_QUEUE = int(os.getenv("ADMISSION_READ_QUEUE", 256))
+ADMISSION_CREATE_USER_CONCURRENCY = int(os.getenv("ADMISSION_CREATE_USER_CONCURRENCY", 2 * HASH_POOL_WORKERS))
+ADMISSION_CREATE_USER_QUEUE = int(os.getenv("ADMISSION_CREATE_USER_QUEUE", 64))
+ADMISSION_BULK_USERS_CONCURRENCY = int(os.getenv("ADMISSION_BULK_USERS_CONCURRENCY", 1))
+ADMISSION_BULK_USERS_QUEUE = int(os.getenv("ADMISSION_BULK_USERS_QUEUE", 4))
+
+ROLE_CACHE_ENABLED = _env_bool("ROLE_CACHE_ENABLED", True)
+ROLE_CACHE_MAX_SIZE = int(os.getenv("ROLE_CACHE_MAX_SIZE", 1024))
+ROLE_CACHE_TTL = float(os.getenv("ROLE_CACHE_TTL", 300))
+ROLE_CACHE_NEGATIVE_TTL = float(os.getenv("ROLE_CACHE_NEGATIVE_TTL", 30))
+
+SINGLE_FLIGHT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_TIMEOUT", 5))
+
+TABLE_VERSION_CACHE_TTL = float(os.getenv("TABLE_VERSION_CACHE_TTL", 5))
+CACHE_CONTROL_MAX_AGE = int(os.getenv("CACHE_CONTROL_MAX_AGE", 60))
+
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 50000))
+BULK_INSERT_CHUNK_SIZE = int(os.getenv("BULK_INSERT_CHUNK_SIZE", 1000))
+HASH_BATCH_SIZE = int(os.getenv("HASH_BATCH_SIZE", 32))
+
+USER_INSERT_BATCHING = _env_bool("USER_INSERT_BATCHING", False)
+USER_INSERT_BATCH_WINDOW_MS = float(os.getenv("USER_INSERT_BATCH_WINDOW_MS", 2))
+USER_INSERT_BATCH_MAX_ROWS = int(os.getenv("USER_INSERT_BATCH_MAX_ROWS", 100))
+
+EMAIL_FILTER_ENABLED = _env_bool("EMAIL_FILTER_ENABLED", False)
+EMAIL_FILTER_FALSE_POSITIVE_RATE = float(os.getenv("EMAIL_FILTER_FALSE_POSITIVE_RATE", 0.01))
+EMAIL_FILTER_MIN_CAPACITY = int(os.getenv("EMAIL_FILTER_MIN_CAPACITY", 100000))
+EMAIL_FILTER_REBUILD_INTERVAL = float(os.getenv("EMAIL_FILTER_REBUILD_INTERVAL", 3600))
+
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", 86400))
+IDEMPOTENCY_LOCK_TIMEOUT = float(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", 30))
+IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", 10))
+IDEMPOTENCY_CLEANUP_INTERVAL = float(os.getenv("IDEMPOTENCY_CLEANUP_INTERVAL", 3600))
+IDEMPOTENCY_SECRET = os.getenv("IDEMPOTENCY_SECRET")
+
+USERS_PAGE_DEFAULT_LIMIT = int(os.getenv("USERS_PAGE_DEFAULT_LIMIT", 50))
+USERS_PAGE_MAX_LIMIT = int(os.getenv("USERS_PAGE_MAX_LIMIT", 1000))
+USERS_STREAM_BATCH_SIZE = int(os.getenv("USERS_STREAM_BATCH_SIZE", 1000))
+
+CLAIM_CACHE_MAX_SIZE = int(os.getenv("CLAIM_CACHE_MAX_SIZE", 10000))
+CLAIM_CACHE_TTL = float(os.getenv("CLAIM_CACHE_TTL", 300))
+CLAIM_ID_MAX = int(os.getenv("CLAIM_ID_MAX", 65535))
+
+FAST_JSON = _env_bool("FAST_JSON", False)
+
+DB_CREATE_ALL = _env_bool("DB_CREATE_ALL", False)
+
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 500))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 10))
@@ -0,0 +1,172 @@
+"""
+controle de admissão das requisições por rota
+
+cada rota declara um 'RouteLimit' com a sua prioridade, o máximo de
+execuções simultâneas e o tamanho da fila de espera, e o usa como
+dependência. todas as rotas dividem ADMISSION_CAPACITY vagas, o número de
+conexões que o pool do banco consegue entregar ao mesmo tempo. as rotas de
+escrita (prioridade WRITE) nunca ocupam as últimas ADMISSION_READ_RESERVE
+vagas, e quando uma vaga é liberada as leituras na fila são atendidas
+antes. assim uma rajada de criações de usuário (bcrypt e três consultas
+cada) não deixa as leituras baratas esperando atrás dela
+
+uma requisição que encontra a fila da rota cheia, ou que espera mais que
+ADMISSION_QUEUE_TIMEOUT, é recusada na hora com 503 e Retry-After. o
+estado é do worker e só é alterado no event loop, então não usa locks
+"""
+
+import asyncio
+import time
+from collections import deque
+from fastapi import HTTPException
+from ..config import settings
+from ..metrics.instruments import ADMISSION_IN_FLIGHT, ADMISSION_QUEUED, ADMISSION_REJECTED, ADMISSION_WAIT
+
+READ = 0
+WRITE = 1
+
+
+class RouteLimit:
+    """
+    limites de uma rota, usados como dependência: Depends(limite)
+
+    :param route: rótulo da rota nas métricas, por exemplo 'POST /users/'
+    :param priority: READ ou WRITE
+    :param concurrency: execuções simultâneas da rota; 0 limita apenas pela capacidade compartilhada
+    :param queue: requisições que podem aguardar uma vaga antes de a rota responder 503
+    """
+
+    def __init__(self, route: str, priority: int, concurrency: int, queue: int):
+        self.route = route
+        self.priority = priority
+        self.concurrency = concurrency
+        self.queue = queue
+        self.active = 0
+        self.waiting = 0
+
+    async def __call__(self):
+        if not settings.ADMISSION_ENABLED:
+            yield
+            return
+        await admission.acquire(self)
+        try:
+            yield
+        finally:
+            admission.release(self)
+
+
+class AdmissionController:
+    """
+    vagas compartilhadas entre as rotas, com filas por prioridade
+
+    :param capacity: vagas de todas as rotas
+    :param read_reserve: vagas que apenas as leituras podem ocupar
+    :param timeout: espera máxima na fila, em segundos
+    """
+
+    def __init__(self, capacity: int, read_reserve: int, timeout: float):
+        self.capacity = capacity
+        self.read_reserve = min(read_reserve, capacity - 1)
+        self.timeout = timeout
+        self.in_use = 0
+        self._waiters: tuple[deque, deque] = (deque(), deque())
+
+    def _ceiling(self, priority: int) -> int:
+        return self.capacity if priority == READ else self.capacity - self.read_reserve
+
+    @staticmethod
+    def _at_route_limit(limit: RouteLimit) -> bool:
+        return bool(limit.concurrency) and limit.active >= limit.concurrency
+
+    def _can_run(self, limit: RouteLimit) -> bool:
+        if self._at_route_limit(limit):
+            return False
+        return self.in_use < self._ceiling(limit.priority)
+
+    def _take(self, limit: RouteLimit) -> None:
+        self.in_use += 1
+        limit.active += 1
+        ADMISSION_IN_FLIGHT.inc(limit.route)
+
+    async def acquire(self, limit: RouteLimit) -> None:
+        """
+        aguarda uma vaga para a rota
+
+        :param limit: limites da rota
+        :raises HTTPException: 503 com Retry-After se a fila estiver cheia ou a espera passar do limite
+        """
+        # quem chega não passa à frente de quem já espera com a mesma prioridade
+        # ou maior, exceto de quem espera apenas pelo limite da própria rota:
+        # uma rota saturada não segura as demais enquanto há vagas livres
+        queued_ahead = any(
+            not self._at_route_limit(waiting_limit)
+            for priority in range(limit.priority + 1)
+            for waiting_limit, _ in self._waiters[priority]
+        )
+        if not queued_ahead and self._can_run(limit):
+            self._take(limit)
+            ADMISSION_WAIT.observe(0, limit.route)
+            return
+        if limit.waiting >= limit.queue:
+            self._reject(limit, "queue_full")
+
+        waiter = (limit, asyncio.get_running_loop().create_future())
+        self._waiters[limit.priority].append(waiter)
+        limit.waiting += 1
+        ADMISSION_QUEUED.inc(limit.route)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait((waiter[1],), timeout=self.timeout)
+        except asyncio.CancelledError:
+            # o cliente desistiu: devolve a vaga se ela chegou a ser concedida
+            if waiter[1].done():
+                self.release(limit)
+            else:
+                self._leave_queue(waiter)
+            raise
+        if not waiter[1].done():
+            self._leave_queue(waiter)
+            self._reject(limit, "timeout")
+        ADMISSION_WAIT.observe(time.perf_counter() - start, limit.route)
+
+    def release(self, limit: RouteLimit) -> None:
+        """
+        devolve a vaga da rota e admite as requisições em espera que couberem
+
+        :param limit: limites da rota
+        """
+        self.in_use -= 1
+        limit.active -= 1
+        ADMISSION_IN_FLIGHT.dec(limit.route)
+        self._admit_waiting()
+
+    def _admit_waiting(self) -> None:
+        # leituras primeiro; dentro de cada prioridade, por ordem de chegada,
+        # pulando as rotas que já estão no próprio limite
+        for waiters in self._waiters:
+            for waiter in list(waiters):
+                limit, future = waiter
+                if self.in_use >= self.capacity:
+                    return
+                if self._can_run(limit):
+                    self._leave_queue(waiter)
+                    self._take(limit)
+                    future.set_result(None)
+
+    def _leave_queue(self, waiter: tuple) -> None:
+        limit = waiter[0]
+        self._waiters[limit.priority].remove(waiter)
+        limit.waiting -= 1
+        ADMISSION_QUEUED.dec(limit.route)
+
+    @staticmethod
+    def _reject(limit: RouteLimit, reason: str) -> None:
+        ADMISSION_REJECTED.inc(limit.route, reason)
+        raise HTTPException(
+            status_code=503,
+            detail="server busy, retry later",
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)},
+        )
+
+
+admission = AdmissionController(settings.ADMISSION_CAPACITY, settings.ADMISSION_READ_RESERVE, settings.ADMISSION_QUEUE_TIMEOUT)
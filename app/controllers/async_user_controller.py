@@ -0,0 +1,122 @@
+"""
+versão assíncrona dos endpoints de usuários e roles (papeis)
+
+estes endpoints usam o engine assíncrono e são registrados no lugar dos
+equivalentes síncronos quando DB_MODE=async
+
+endpoints:
+- obter role por id
+- criar um novo usuário
+"""
+
+from fastapi import APIRouter, Depends, Header, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..services.async_user_service import AsyncUserService
+from ..services.async_role_service import AsyncRoleService
+from ..services.idempotency_service import IdempotencyService
+from ..services.table_version_service import TableVersionService
+from ..database.async_database import get_async_db
+from ..database.database import get_db
+from ..database.replica import pin_reads_to_primary
+from ..schemas.user_schema import UserCreate, UserResponse
+from ..schemas.role_schema import RoleResponse
+from . import http_cache
+from .fast_json import FastJSONRoute
+from .user_controller import CREATE_USER_LIMIT, GET_ROLE_LIMIT
+
+router = APIRouter(route_class=FastJSONRoute)
+
+@router.get(
+    "/role/{role_id}",
+    response_model=RoleResponse,
+    summary="obter role por id",
+    description="obtém um papel (role) específico a partir do id fornecido",
+    responses={304: {"description": "o papel não mudou desde o etag informado"}},
+    dependencies=[Depends(GET_ROLE_LIMIT)]
+)
+async def get_role_by_id(role_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """
+    endpoint assíncrono para obter um papel (role) por id
+
+    args:
+        role_id (int): id do papel a ser buscado
+        request (Request): requisição, usada para ler o If-None-Match
+        response (Response): resposta, usada para enviar ETag e Cache-Control
+        db (AsyncSession): sessão assíncrona injetada automaticamente
+
+    returns:
+        RoleResponse: dados do papel correspondente
+
+    raises:
+        HTTPException: retorna 404 se o papel não for encontrado
+    """
+    etag = http_cache.make_etag("roles", await TableVersionService.get_version_async(db, "roles"), role_id)
+    if http_cache.is_not_modified(request, etag):
+        return http_cache.not_modified(etag)
+
+    role = await AsyncRoleService.get_role_by_id(db, role_id)
+    if http_cache.is_not_modified(request, etag, found=True):
+        return http_cache.not_modified(etag)
+    http_cache.apply_cache_headers(response, etag)
+    return role
+
+@router.post(
+    "/users/",
+    response_model=UserResponse,
+    summary="criar usuário",
+    description="cria um novo usuário no sistema",
+    dependencies=[Depends(CREATE_USER_LIMIT)]
+)
+async def create_user(
+    user: UserCreate,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_db: Session = Depends(get_db),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=255)
+):
+    """
+    endpoint assíncrono para criar um novo usuário no sistema
+
+    segue o mesmo contrato do endpoint síncrono: as leituras seguintes do
+    cliente vão ao primário por alguns segundos e o cabeçalho Idempotency-Key
+    evita criar o usuário de novo nas repetições. as chaves de idempotência
+    usam uma sessão síncrona, que só abre conexão quando há cabeçalho
+
+    args:
+        user (UserCreate): dados do usuário a ser criado
+        response (Response): resposta injetada, que recebe o cookie de leitura no primário
+        db (AsyncSession): sessão assíncrona injetada automaticamente
+        idempotency_db (Session): sessão síncrona usada pelas chaves de idempotência
+        idempotency_key (str | None): chave escolhida pelo cliente para as repetições
+
+    returns:
+        UserResponse: dados do usuário criado
+
+    raises:
+        HTTPException:
+            - 400 se o e-mail já estiver registrado
+            - 404 se a role informada não existir
+            - 409 se a requisição original com a mesma chave ainda não terminou
+            - 422 se a chave já foi usada com outros dados
+            - 503 se a fila de admissão da rota estiver cheia
+    """
+    if idempotency_key is None:
+        created = await AsyncUserService.create_user(db, user)
+        pin_reads_to_primary(response)
+        return created
+
+    async def create() -> dict:
+        created = await AsyncUserService.create_user(db, user)
+        return UserResponse.model_validate(created, from_attributes=True).model_dump(mode="json")
+
+    request_hash = IdempotencyService.request_hash(
+        user.model_dump(exclude={"password"}), sensitive={"password": user.password}
+    )
+    body, replayed = await IdempotencyService.run(
+        idempotency_db, CREATE_USER_LIMIT.route, idempotency_key, request_hash, create
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    pin_reads_to_primary(response)
+    return body
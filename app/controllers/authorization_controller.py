@@ -0,0 +1,99 @@
+"""
+este módulo contém os endpoints de autorização baseados em claims
+
+endpoints:
+- verificar as permissões de um usuário
+- conceder uma claim a um usuário
+- revogar uma claim de um usuário
+"""
+
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query, Response
+from pydantic import Field
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database.database import get_db
+from ..database.replica import get_read_db, pin_reads_to_primary
+from ..services.authorization_service import AuthorizationService
+from ..schemas.permission_schema import PermissionsResponse
+from .fast_json import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
+
+@router.get(
+    "/users/{user_id}/permissions",
+    response_model=PermissionsResponse,
+    summary="verificar permissões",
+    description="retorna as claims ativas do usuário e verifica um lote de claims de uma só vez"
+)
+def get_permissions(
+    user_id: int,
+    claim_id: list[Annotated[int, Field(ge=1, le=settings.CLAIM_ID_MAX)]] = Query(
+        [], description="ids das claims a verificar (pode ser repetido)"
+    ),
+    db: Session = Depends(get_read_db)
+):
+    """
+    endpoint para verificar as permissões de um usuário
+
+    as claims do usuário vêm do bitset em cache, então um acerto não consulta o banco
+
+    args:
+        user_id (int): id do usuário
+        claim_id (list[int]): ids das claims a verificar
+        db (Session): sessão de banco de dados injetada automaticamente
+
+    returns:
+        PermissionsResponse: claims do usuário e resultado de cada verificação
+
+    raises:
+        HTTPException: retorna 404 se o usuário não for encontrado e 422 se
+            algum id de claim estiver fora do intervalo 1..CLAIM_ID_MAX
+    """
+    return AuthorizationService.get_permissions(db, user_id, claim_id)
+
+@router.put(
+    "/users/{user_id}/claims/{claim_id}",
+    status_code=204,
+    summary="conceder claim",
+    description="concede uma claim a um usuário"
+)
+def grant_claim(user_id: int, claim_id: int, db: Session = Depends(get_db)):
+    """
+    endpoint para conceder uma claim a um usuário
+
+    args:
+        user_id (int): id do usuário
+        claim_id (int): id da claim
+        db (Session): sessão de banco de dados injetada automaticamente
+
+    raises:
+        HTTPException: retorna 404 se o usuário ou a claim não existirem
+    """
+    AuthorizationService.grant_claim(db, user_id, claim_id)
+    response = Response(status_code=204)
+    pin_reads_to_primary(response)
+    return response
+
+@router.delete(
+    "/users/{user_id}/claims/{claim_id}",
+    status_code=204,
+    summary="revogar claim",
+    description="revoga uma claim de um usuário"
+)
+def revoke_claim(user_id: int, claim_id: int, db: Session = Depends(get_db)):
+    """
+    endpoint para revogar uma claim de um usuário
+
+    args:
+        user_id (int): id do usuário
+        claim_id (int): id da claim
+        db (Session): sessão de banco de dados injetada automaticamente
+
+    raises:
+        HTTPException: retorna 404 se a claim não estiver concedida ao usuário
+    """
+    AuthorizationService.revoke_claim(db, user_id, claim_id)
+    response = Response(status_code=204)
+    pin_reads_to_primary(response)
+    return response
@@ -0,0 +1,172 @@
+"""
+caminho rápido de serialização json para os endpoints
+
+no caminho padrão, o fastapi valida o retorno do endpoint contra o
+response_model, converte o modelo validado em tipos json e só então o
+codifica com o módulo json da biblioteca padrão. como os retornos dos
+serviços já são confiáveis (objetos orm, linhas e dicionários montados pelo
+próprio código), a revalidação é trabalho repetido
+
+com FAST_JSON ativo, a classe de rota 'FastJSONRoute' compila, uma única vez
+por rota, uma função que projeta o retorno na forma do response_model
+(lendo apenas os campos declarados, sem validar) e codifica o resultado com
+orjson. ela é aplicada a todas as rotas de um router via
+APIRouter(route_class=FastJSONRoute)
+"""
+
+import functools
+import inspect
+from collections.abc import Mapping
+from types import NoneType, UnionType
+from typing import Any, Callable, Union, get_args, get_origin
+from fastapi import Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from ..config import settings
+
+_SUB_RESPONSE_PARAM = "_fast_json_response"
+_FAST_JSON_MARK = "__fast_json__"
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def compile_projector(annotation: Any) -> Callable[[Any], Any]:
+    """
+    compila uma função que converte um valor confiável na forma json da anotação
+
+    modelos pydantic são lidos campo a campo, por atributo ou por chave
+    quando o valor é um mapeamento; listas, dicionários e opcionais são
+    percorridos; os demais tipos são repassados ao orjson como estão
+
+    :param annotation: tipo do response_model (ou de um de seus campos)
+    :return: função de projeção para valores desse tipo
+    """
+    origin = get_origin(annotation)
+
+    if origin in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        if len(args) != 1:
+            return _identity
+        inner = compile_projector(args[0])
+        if inner is _identity:
+            return _identity
+        return lambda value: None if value is None else inner(value)
+
+    if origin in (list, tuple, set, frozenset):
+        args = get_args(annotation)
+        inner = compile_projector(args[0]) if args else _identity
+        if inner is _identity:
+            return list
+        return lambda values: [inner(value) for value in values]
+
+    if origin is dict:
+        args = get_args(annotation)
+        inner = compile_projector(args[1]) if len(args) == 2 else _identity
+        if inner is _identity:
+            return dict
+        return lambda values: {key: inner(value) for key, value in values.items()}
+
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return _compile_model(annotation)
+
+    return _identity
+
+
+def _compile_model(model: type[BaseModel]) -> Callable[[Any], Any]:
+    fields = [
+        (name, field.serialization_alias or field.alias or name, compile_projector(field.annotation))
+        for name, field in model.model_fields.items()
+    ]
+
+    def project(value: Any) -> dict:
+        if isinstance(value, Mapping):
+            return {key: projector(value.get(name)) for name, key, projector in fields}
+        return {key: projector(getattr(value, name, None)) for name, key, projector in fields}
+
+    return project
+
+
+def _response_model(kwargs: dict) -> Any:
+    response_model = kwargs.get("response_model")
+    if isinstance(response_model, DefaultPlaceholder):
+        return None
+    return response_model
+
+
+def _sub_response_param(endpoint: Callable) -> tuple[str, bool]:
+    """
+    encontra o parâmetro do tipo Response do endpoint
+
+    o fastapi entrega a resposta parcial a um único parâmetro do tipo
+    Response; os cabeçalhos que o endpoint define nela (ETag, Cache-Control)
+    precisam ser copiados para a resposta final
+
+    :param endpoint: função do endpoint
+    :return: nome do parâmetro e se ele precisa ser adicionado à assinatura
+    """
+    for name, parameter in inspect.signature(endpoint).parameters.items():
+        if parameter.annotation is Response:
+            return name, False
+    return _SUB_RESPONSE_PARAM, True
+
+
+def _add_sub_response(endpoint: Callable, handler: Callable) -> None:
+    signature = inspect.signature(endpoint)
+    parameter = inspect.Parameter(_SUB_RESPONSE_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Response)
+    handler.__signature__ = signature.replace(parameters=[*signature.parameters.values(), parameter])
+
+
+class FastJSONRoute(APIRoute):
+    """
+    rota que, com FAST_JSON ativo, serializa o retorno sem revalidá-lo
+
+    o response_model continua registrado na rota, então a documentação
+    openapi não muda. retornos que já são um Response (304, streaming) são
+    entregues sem alteração
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        response_model = _response_model(kwargs)
+        # include_router recria as rotas com o endpoint já envolvido
+        already_wrapped = getattr(endpoint, _FAST_JSON_MARK, False)
+        if settings.FAST_JSON and response_model is not None and not already_wrapped:
+            endpoint = self._fast_endpoint(endpoint, response_model, kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _fast_endpoint(endpoint: Callable, response_model: Any, status_code: int | None) -> Callable:
+        project = compile_projector(response_model)
+
+        def render(content: Any, sub_response: Response) -> Response:
+            if isinstance(content, Response):
+                return content
+            response = ORJSONResponse(project(content), status_code=sub_response.status_code or status_code or 200)
+            for key, value in sub_response.headers.items():
+                if key != "content-length":
+                    response.headers.append(key, value)
+            return response
+
+        param, injected = _sub_response_param(endpoint)
+
+        def take_sub_response(kwargs: dict) -> Response:
+            return kwargs.pop(param) if injected else kwargs[param]
+
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def handler(*args, **kwargs):
+                sub_response = take_sub_response(kwargs)
+                return render(await endpoint(*args, **kwargs), sub_response)
+        else:
+            @functools.wraps(endpoint)
+            def handler(*args, **kwargs):
+                sub_response = take_sub_response(kwargs)
+                return render(endpoint(*args, **kwargs), sub_response)
+
+        if injected:
+            _add_sub_response(endpoint, handler)
+        setattr(handler, _FAST_JSON_MARK, True)
+        return handler
@@ -0,0 +1,80 @@
+"""
+funções auxiliares para requisições condicionais http (etag / 304)
+
+os etags são fortes e derivados da versão da tabela de origem, de modo que
+o 304 pode ser decidido sem buscar as linhas do recurso. sem versão (tabela
+sem a linha de 'table_versions', por exemplo com DB_CREATE_ALL ou sem a
+migração dos gatilhos), o recurso é enviado sem ETag e nunca recebe 304
+"""
+
+from fastapi import Request, Response
+from ..config import settings
+
+
+def make_etag(table_name: str, version: int | None, *parts) -> str | None:
+    """
+    monta um etag forte a partir da versão da tabela e de partes do recurso
+
+    :param table_name: tabela de origem do recurso
+    :param version: versão atual da tabela, ou None se ela não é versionada
+    :param parts: identificadores adicionais do recurso (por exemplo, o id)
+    :return: o etag entre aspas, pronto para o cabeçalho, ou None sem versão
+    """
+    if version is None:
+        return None
+    suffix = "".join(f"-{part}" for part in parts)
+    return f'"{table_name}-v{version}{suffix}"'
+
+
+def is_not_modified(request: Request, etag: str | None, found: bool = False) -> bool:
+    """
+    verifica se o cabeçalho If-None-Match da requisição corresponde ao etag
+
+    um etag igual basta, pois ele só existia se o recurso existia naquela
+    versão da tabela. 'If-None-Match: *' só vale para um recurso que existe,
+    então é considerado apenas quando 'found' indica que ele foi encontrado
+
+    :param request: requisição recebida
+    :param etag: etag atual do recurso, ou None se não houver
+    :param found: se o recurso já foi buscado e existe
+    :return: True se o cliente já possui a representação atual
+    """
+    header = request.headers.get("if-none-match")
+    if not header or etag is None:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return (found and "*" in candidates) or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    """
+    cabeçalhos de cache enviados junto com o recurso
+
+    :param etag: etag atual do recurso
+    :return: dicionário com ETag e Cache-Control
+    """
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.CACHE_CONTROL_MAX_AGE}",
+    }
+
+
+def apply_cache_headers(response: Response, etag: str | None) -> None:
+    """
+    adiciona ETag e Cache-Control à resposta do endpoint
+
+    :param response: resposta injetada pelo fastapi
+    :param etag: etag atual do recurso; sem etag, nenhum cabeçalho é adicionado
+    """
+    if etag is not None:
+        response.headers.update(cache_headers(etag))
+
+
+def not_modified(etag: str) -> Response:
+    """
+    monta a resposta 304 para um recurso que o cliente já possui
+
+    :param etag: etag atual do recurso
+    :return: resposta sem corpo com status 304
+    """
+    return Response(status_code=304, headers=cache_headers(etag))
@@ -0,0 +1,46 @@
+"""
+este módulo contém endpoints internos de diagnóstico da aplicação
+
+endpoints:
+- estatísticas do pool de conexões
+- estado e memória do filtro de e-mails
+"""
+
+from fastapi import APIRouter
+from ..cache.email_filter import email_filter
+from ..database.database import get_engine
+from ..database.pool_stats import pool_stats
+from ..schemas.email_filter_schema import EmailFilterStatsResponse
+from ..schemas.pool_schema import PoolStatsResponse
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+@router.get(
+    "/pool",
+    response_model=PoolStatsResponse,
+    summary="estatísticas do pool",
+    description="retorna a ocupação atual e os tempos de espera do pool de conexões deste worker"
+)
+def get_pool_stats():
+    """
+    endpoint para inspecionar o pool de conexões do worker atual
+
+    returns:
+        PoolStatsResponse: conexões em uso, ociosas, overflow e tempos de espera
+    """
+    return pool_stats.snapshot(get_engine().pool)
+
+@router.get(
+    "/email-filter",
+    response_model=EmailFilterStatsResponse,
+    summary="estatísticas do filtro de e-mails",
+    description="retorna o tamanho, a memória usada e as taxas de falsos positivos do filtro de e-mails deste worker"
+)
+def get_email_filter_stats():
+    """
+    endpoint para inspecionar o filtro de e-mails do worker atual
+
+    returns:
+        EmailFilterStatsResponse: capacidade, e-mails registrados, memória e taxas de falsos positivos
+    """
+    return email_filter.stats()
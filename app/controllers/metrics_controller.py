@@ -0,0 +1,32 @@
+"""
+este módulo expõe as métricas da aplicação no formato do prometheus
+
+endpoints:
+- métricas do worker
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ..metrics import registry
+
+router = APIRouter(tags=["internal"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="métricas",
+    description="latência por rota, uso do banco por requisição e tempo de hash do worker, no formato do prometheus"
+)
+def get_metrics():
+    """
+    endpoint para a coleta do prometheus
+
+    cada worker mantém as próprias métricas, então com vários workers cada
+    coleta reflete apenas o worker que atendeu a requisição
+
+    returns:
+        PlainTextResponse: métricas no formato de exposição em texto
+    """
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
@@ -3,31 +3,66 @@ este módulo contém os endpoints relacionados a usuários e roles (papeis) do s
 
 endpoints:
 - obter role por id
+- listar claims
+- listar usuários
+- listar usuários com role e claims
 - criar um novo usuário
+- criar usuários em lote
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from ..services.user_service import UserService
 from ..services.role_service import RoleService
+from ..services.claim_service import ClaimService
+from ..services.table_version_service import TableVersionService
+from ..services.idempotency_service import IdempotencyService
+from ..config import settings
 from ..database.database import get_db
-from ..schemas.user_schema import UserCreate, UserResponse
+from ..database.replica import get_read_db, get_read_session_factory, pin_reads_to_primary
+from ..schemas.user_schema import UserCreate, UserResponse, BulkUserResponse, UserPage, UserDetailPage
 from ..schemas.role_schema import RoleResponse
+from ..schemas.claim_schema import ClaimResponse
+from . import http_cache
+from .admission import READ, WRITE, RouteLimit
+from .fast_json import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
+
+# limites de admissão de cada endpoint (ver admission.py): as leituras só
+# esperam quando todas as vagas estão ocupadas; as criações têm limite próprio,
+# já que cada uma ocupa um processo de hash por centenas de milissegundos
+GET_ROLE_LIMIT = RouteLimit("GET /role/{role_id}", READ, 0, settings.ADMISSION_READ_QUEUE)
+GET_CLAIMS_LIMIT = RouteLimit("GET /claims", READ, 0, settings.ADMISSION_READ_QUEUE)
+LIST_USERS_LIMIT = RouteLimit("GET /users", READ, 0, settings.ADMISSION_READ_QUEUE)
+LIST_USER_DETAILS_LIMIT = RouteLimit("GET /users/details", READ, 0, settings.ADMISSION_READ_QUEUE)
+CREATE_USER_LIMIT = RouteLimit(
+    "POST /users/", WRITE, settings.ADMISSION_CREATE_USER_CONCURRENCY, settings.ADMISSION_CREATE_USER_QUEUE
+)
+CREATE_USERS_BULK_LIMIT = RouteLimit(
+    "POST /users/bulk", WRITE, settings.ADMISSION_BULK_USERS_CONCURRENCY, settings.ADMISSION_BULK_USERS_QUEUE
+)
 
 @router.get(
     "/role/{role_id}",
     response_model=RoleResponse,
     summary="obter role por id",
-    description="obtém um papel (role) específico a partir do id fornecido"
+    description="obtém um papel (role) específico a partir do id fornecido",
+    responses={304: {"description": "o papel não mudou desde o etag informado"}},
+    dependencies=[Depends(GET_ROLE_LIMIT)]
 )
-def get_role_by_id(role_id: int, db: Session = Depends(get_db)):
+def get_role_by_id(role_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
     """
     endpoint para obter um papel (role) por id
 
+    o etag depende apenas da versão da tabela 'roles' e do id, então um
+    If-None-Match correspondente é respondido com 304 sem buscar a linha
+
     args:
         role_id (int): id do papel a ser buscado
+        request (Request): requisição, usada para ler o If-None-Match
+        response (Response): resposta, usada para enviar ETag e Cache-Control
         db (Session): sessão de banco de dados injetada automaticamente
 
     returns:
@@ -36,24 +71,142 @@ def get_role_by_id(role_id: int, db: Session = Depends(get_db)):
     raises:
         HTTPException: retorna 404 se o papel não for encontrado
     """
+    etag = http_cache.make_etag("roles", TableVersionService.get_version(db, "roles"), role_id)
+    if http_cache.is_not_modified(request, etag):
+        return http_cache.not_modified(etag)
+
     role = RoleService.get_role_by_id(db, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="role not found")
+    if http_cache.is_not_modified(request, etag, found=True):
+        return http_cache.not_modified(etag)
+    http_cache.apply_cache_headers(response, etag)
     return role
 
+@router.get(
+    "/claims",
+    response_model=list[ClaimResponse],
+    summary="listar claims",
+    description="lista o catálogo de claims cadastradas",
+    responses={304: {"description": "o catálogo não mudou desde o etag informado"}},
+    dependencies=[Depends(GET_CLAIMS_LIMIT)]
+)
+def get_all_claims(request: Request, response: Response, db: Session = Depends(get_read_db)):
+    """
+    endpoint para listar o catálogo de claims
+
+    args:
+        request (Request): requisição, usada para ler o If-None-Match
+        response (Response): resposta, usada para enviar ETag e Cache-Control
+        db (Session): sessão de banco de dados injetada automaticamente
+
+    returns:
+        list[ClaimResponse]: claims cadastradas
+    """
+    etag = http_cache.make_etag("claims", TableVersionService.get_version(db, "claims"))
+    # a coleção sempre existe, então 'If-None-Match: *' vale
+    if http_cache.is_not_modified(request, etag, found=True):
+        return http_cache.not_modified(etag)
+
+    claims = ClaimService.get_all_claims(db)
+    http_cache.apply_cache_headers(response, etag)
+    return claims
+
+@router.get(
+    "/users",
+    response_model=UserPage,
+    summary="listar usuários",
+    description="lista os usuários com paginação por cursor ou, com stream=true, como ndjson",
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+    dependencies=[Depends(LIST_USERS_LIMIT)]
+)
+def list_users(
+    cursor: int | None = Query(None, description="next_cursor da página anterior"),
+    limit: int = Query(settings.USERS_PAGE_DEFAULT_LIMIT, ge=1, le=settings.USERS_PAGE_MAX_LIMIT),
+    stream: bool = Query(False, description="envia todos os usuários a partir do cursor como ndjson"),
+    db: Session = Depends(get_read_db),
+    session_factory=Depends(get_read_session_factory)
+):
+    """
+    endpoint para listar usuários
+
+    a paginação usa o id como chave (keyset), então o custo de cada página
+    é constante. no modo stream as linhas são lidas com um cursor do lado do
+    servidor e enviadas à medida que chegam, com memória constante
+
+    args:
+        cursor (int | None): next_cursor retornado pela página anterior
+        limit (int): tamanho da página (ignorado no modo stream)
+        stream (bool): envia a listagem completa como ndjson
+        db (Session): sessão de banco de dados injetada automaticamente
+        session_factory: fábrica de sessões usada pelo modo stream
+
+    returns:
+        UserPage: itens da página e cursor da próxima
+    """
+    if stream:
+        return StreamingResponse(
+            UserService.stream_users_ndjson(session_factory, cursor),
+            media_type="application/x-ndjson"
+        )
+    return UserService.list_users(db, cursor, limit)
+
+@router.get(
+    "/users/details",
+    response_model=UserDetailPage,
+    summary="listar usuários com role e claims",
+    description="lista os usuários com a role e as claims de cada um, com paginação por cursor",
+    dependencies=[Depends(LIST_USER_DETAILS_LIMIT)]
+)
+def list_users_with_role_and_claims(
+    cursor: int | None = Query(None, description="next_cursor da página anterior"),
+    limit: int = Query(settings.USERS_PAGE_DEFAULT_LIMIT, ge=1, le=settings.USERS_PAGE_MAX_LIMIT),
+    db: Session = Depends(get_read_db)
+):
+    """
+    endpoint para listar usuários com os seus papéis e claims
+
+    cada usuário aparece uma única vez, com as claims agregadas em uma
+    lista (vazia quando o usuário não possui claims)
+
+    args:
+        cursor (int | None): next_cursor retornado pela página anterior
+        limit (int): tamanho da página
+        db (Session): sessão de banco de dados injetada automaticamente
+
+    returns:
+        UserDetailPage: itens da página e cursor da próxima
+    """
+    return UserService.list_users_with_role_and_claims(db, cursor, limit)
+
 @router.post(
     "/users/",
     response_model=UserResponse,
     summary="criar usuário",
-    description="cria um novo usuário no sistema"
+    description="cria um novo usuário no sistema",
+    dependencies=[Depends(CREATE_USER_LIMIT)]
 )
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(
+    user: UserCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=255)
+):
     """
     endpoint para criar um novo usuário no sistema
 
+    as leituras seguintes do mesmo cliente vão ao primário por alguns
+    segundos, para que o usuário criado seja visto mesmo com a réplica atrasada
+
+    com o cabeçalho Idempotency-Key, as repetições da requisição recebem a
+    resposta da primeira (marcada com Idempotent-Replayed: true) sem criar
+    o usuário de novo; uma repetição simultânea espera a primeira terminar
+
     args:
         user (UserCreate): dados do usuário a ser criado
+        response (Response): resposta injetada, que recebe o cookie de leitura no primário
         db (Session): sessão de banco de dados injetada automaticamente
+        idempotency_key (str | None): chave escolhida pelo cliente para as repetições
 
     returns:
         UserResponse: dados do usuário criado
@@ -61,9 +214,58 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     raises:
         HTTPException:
             - 400 se o e-mail já estiver registrado
+            - 404 se a role informada não existir
+            - 409 se a requisição original com a mesma chave ainda não terminou
+            - 422 se a chave já foi usada com outros dados
+            - 503 se a fila de admissão da rota estiver cheia
+    """
+    if idempotency_key is None:
+        created = await UserService.create_user_async(db, user)
+        pin_reads_to_primary(response)
+        return created
+
+    async def create() -> dict:
+        created = await UserService.create_user_async(db, user)
+        return UserResponse.model_validate(created, from_attributes=True).model_dump(mode="json")
+
+    request_hash = IdempotencyService.request_hash(
+        user.model_dump(exclude={"password"}), sensitive={"password": user.password}
+    )
+    body, replayed = await IdempotencyService.run(db, CREATE_USER_LIMIT.route, idempotency_key, request_hash, create)
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    pin_reads_to_primary(response)
+    return body
+
+@router.post(
+    "/users/bulk",
+    response_model=BulkUserResponse,
+    summary="criar usuários em lote",
+    description="cria vários usuários em uma única requisição, retornando o resultado de cada item",
+    dependencies=[Depends(CREATE_USERS_BULK_LIMIT)]
+)
+async def create_users_bulk(users: list[UserCreate], response: Response, db: Session = Depends(get_db)):
+    """
+    endpoint para criar usuários em lote
+
+    itens inválidos não interrompem o lote: cada posição da lista recebe o
+    seu próprio resultado, com o status http equivalente ao da criação
+    individual (200, 400 ou 404)
+
+    args:
+        users (list[UserCreate]): dados dos usuários a serem criados
+        response (Response): resposta injetada, que recebe o cookie de leitura no primário
+        db (Session): sessão de banco de dados injetada automaticamente
+
+    returns:
+        BulkUserResponse: contagens e resultado de cada item
+
+    raises:
+        HTTPException:
+            - 413 se a lista exceder o limite de itens por requisição
+            - 503 se a fila de admissão da rota estiver cheia
     """
-    existing_user = UserService.get_user_by_email(db, user.email)
-    if existing_user:
-        raise HTTPException(status_code=400, detail="email already registered")
-    
-    return UserService.create_user(db, user)
\ No newline at end of file
+    result = await UserService.create_users_bulk(db, users)
+    if result["created"]:
+        pin_reads_to_primary(response)
+    return result
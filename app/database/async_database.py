@@ -0,0 +1,69 @@
+"""
+variante assíncrona da camada de banco de dados
+
+o engine assíncrono (asyncpg no postgres) é criado sob demanda, para que o
+modo síncrono continue funcionando sem os drivers assíncronos instalados
+"""
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from ..config import settings
+from .database import engine_options, instrument_engine
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def to_async_url(url: str) -> str:
+    """
+    converte uma url de banco síncrona para o driver assíncrono equivalente
+
+    :param url: url no formato 'dialeto+driver://...'
+    :return: url usando o driver assíncrono, ou a própria url se não houver equivalente
+    """
+    scheme, separator, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    retorna o engine assíncrono, criando-o na primeira chamada
+
+    :return: engine assíncrono configurado por ASYNC_DATABASE_URL ou derivado de DATABASE_URL
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+        options = engine_options(url)
+        options.pop("poolclass", None)
+        _async_engine = create_async_engine(url, **options)
+        instrument_engine(_async_engine.sync_engine)
+        _async_session_factory = async_sessionmaker(
+            bind=_async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+async def get_async_db():
+    """
+    dependência que fornece uma AsyncSession por requisição
+    """
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """
+    fecha as conexões do engine assíncrono, se ele tiver sido criado
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
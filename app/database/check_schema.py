@@ -0,0 +1,75 @@
+"""
+verificação do esquema do banco de dados
+
+a aplicação não cria mais as tabelas na inicialização; o esquema é de
+responsabilidade das migrações do alembic. este comando confere se o banco
+está na revisão mais recente das migrações e se todas as tabelas dos
+modelos existem, e termina com código 1 caso contrário
+
+uso:
+    python -m app.database.check_schema
+"""
+
+import sys
+from pathlib import Path
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from ..models.base import Base
+from .. import models  # noqa: F401  (registra os modelos no metadata)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def expected_heads(alembic_ini: Path = ALEMBIC_INI) -> set[str]:
+    """
+    lê as revisões mais recentes (heads) das migrações
+
+    :param alembic_ini: caminho do alembic.ini do projeto
+    :return: conjunto de revisões head
+    """
+    config = Config(str(alembic_ini))
+    config.set_main_option("script_location", str(alembic_ini.parent / config.get_main_option("script_location")))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+def check_schema(engine: Engine, heads: set[str] | None = None) -> list[str]:
+    """
+    compara o banco de dados com as migrações e com os modelos
+
+    :param engine: engine do banco a ser verificado
+    :param heads: revisões esperadas; por padrão, os heads das migrações do projeto
+    :return: lista de problemas encontrados (vazia se o esquema estiver em dia)
+    """
+    heads = expected_heads() if heads is None else heads
+    problems = []
+    with engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+        tables = set(inspect(connection).get_table_names())
+
+    if not current:
+        problems.append("o banco não possui revisão do alembic; execute 'alembic upgrade head'")
+    elif current != heads:
+        problems.append(f"revisão do banco {sorted(current)} diferente da esperada {sorted(heads)}")
+
+    missing = sorted(set(Base.metadata.tables) - tables)
+    if missing:
+        problems.append(f"tabelas ausentes: {', '.join(missing)}")
+    return problems
+
+
+def main() -> int:
+    from .database import get_engine
+
+    problems = check_schema(get_engine())
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    if not problems:
+        print("esquema do banco de dados em dia")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
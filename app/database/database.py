@@ -1,18 +1,103 @@
+"""
+engine e sessões síncronas da aplicação
+
+o engine é criado na primeira vez em que é pedido (normalmente no lifespan
+da aplicação), e não na importação do módulo, para que importar a
+aplicação não carregue o driver do banco nem dependa de o banco estar no ar.
+'engine' e 'SessionLocal' continuam acessíveis como atributos do módulo
+"""
+
+import threading
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
+from ..config import settings
+from .pool_stats import InstrumentedQueuePool, pool_stats
+from ..metrics import instruments
+from ..diagnostics import query_diagnostics
+
+DATABASE_URL = settings.DATABASE_URL
+
+
+def engine_options(url: str) -> dict:
+    """
+    monta os parâmetros de pool do engine a partir das configurações
+
+    o sqlite usa pools próprios e não aceita essas opções, por isso recebe
+    apenas o pre-ping
+
+    :param url: url do banco de dados
+    :return: argumentos nomeados para create_engine
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    registra no engine os listeners de métricas e de diagnóstico habilitados
 
-load_dotenv()
+    :param engine: engine síncrono (para engines assíncronos, use 'sync_engine')
+    """
+    if settings.METRICS_ENABLED:
+        instruments.attach_engine(engine)
+    if settings.SLOW_QUERY_MS > 0 or settings.N_PLUS_ONE_THRESHOLD > 0:
+        query_diagnostics.attach_engine(engine)
 
-DATABASE_URL = os.getenv('DATABASE_URL')
-engine = create_engine(DATABASE_URL)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_engine: Engine | None = None
+_session_factory: sessionmaker | None = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """
+    retorna o engine compartilhado, criando-o na primeira chamada
+
+    :return: o engine síncrono da aplicação
+    """
+    global _engine, _session_factory
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+                pool_stats.attach(engine)
+                instrument_engine(engine)
+                _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _engine = engine
+    return _engine
+
+
+def __getattr__(name: str):
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def get_db():
-    db = SessionLocal()
+    db = get_session_factory()()
     try:
         yield db
     finally:
         db.close()
+
+def get_session_factory():
+    """
+    dependência que fornece a fábrica de sessões
+
+    usada por respostas em streaming, que precisam abrir a própria sessão
+    porque as dependências com yield são encerradas antes do envio do corpo
+    """
+    get_engine()
+    return _session_factory
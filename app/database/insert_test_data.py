@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from ..models.claim_model import Claim
 from ..models.user_model import User
 from ..models.role_model import Role
-from ..database.database import engine
+from ..database.database import get_engine
 
 def insert_test_data(db: Session):
     admin_role = Role(description="Administrador")
@@ -44,7 +44,7 @@ def insert_test_data(db: Session):
 
 
 def insert_data():
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
     db = SessionLocal()
 
     insert_test_data(db)
@@ -0,0 +1,125 @@
+"""
+estatísticas do pool de conexões do sqlalchemy
+
+os contadores são alimentados pelos eventos de pool ('connect', 'checkout'
+e 'checkin') e pelo InstrumentedQueuePool, que mede quanto tempo cada
+requisição espera para obter uma conexão
+"""
+
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    """
+    acumula contadores de uso do pool de conexões
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        zera todos os contadores
+        """
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.timeouts = 0
+            self.waits = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def attach(self, target) -> None:
+        """
+        registra os listeners de pool no engine ou pool informado
+
+        :param target: engine ou pool do sqlalchemy
+        """
+        event.listen(target, "connect", self._on_connect)
+        event.listen(target, "checkout", self._on_checkout)
+        event.listen(target, "checkin", self._on_checkin)
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """
+        registra o tempo gasto para obter uma conexão do pool
+
+        :param seconds: tempo de espera em segundos
+        :param timed_out: indica se a espera terminou em timeout
+        """
+        with self._lock:
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        """
+        combina os contadores acumulados com o estado atual do pool
+
+        :param pool: pool do engine a ser inspecionado
+        :return: dicionário com ocupação e tempos de espera
+        """
+        is_queue_pool = isinstance(pool, QueuePool)
+        with self._lock:
+            return {
+                "pool_class": type(pool).__name__,
+                "size": pool.size() if is_queue_pool else None,
+                "checked_out": pool.checkedout() if is_queue_pool else None,
+                "idle": pool.checkedin() if is_queue_pool else None,
+                "overflow": pool.overflow() if is_queue_pool else None,
+                "max_overflow": pool._max_overflow if is_queue_pool else None,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "waits": self.waits,
+                "wait_avg_ms": round(self.wait_total / self.waits * 1000, 3) if self.waits else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que registra em 'pool_stats' o tempo de espera por conexões
+    """
+
+    _depth = threading.local()
+
+    def _do_get(self):
+        # o QueuePool chama _do_get recursivamente em corridas de overflow;
+        # só a chamada mais externa é medida
+        depth = getattr(self._depth, "value", 0)
+        self._depth.value = depth + 1
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            if depth == 0:
+                pool_stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        finally:
+            self._depth.value = depth
+        if depth == 0:
+            pool_stats.record_wait(time.perf_counter() - start)
+        return entry
@@ -0,0 +1,126 @@
+"""
+roteamento de leituras para a réplica do banco de dados
+
+com DATABASE_REPLICA_URL definida, os endpoints somente leitura recebem a
+sessão de 'get_read_db', aberta na réplica; as escritas continuam em
+'get_db', no primário. sem réplica configurada, 'get_read_db' entrega a
+própria sessão do primário
+
+como a réplica pode estar atrasada, um endpoint que escreve chama
+'pin_reads_to_primary', que envia um cookie fazendo as leituras do mesmo
+cliente irem ao primário por DB_REPLICA_READ_AFTER_WRITE segundos. assim o
+cliente que acabou de criar um usuário o encontra na leitura seguinte
+"""
+
+import threading
+import time
+from fastapi import Depends, Request, Response
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from ..config import settings
+from .database import engine_options, get_db, get_session_factory, instrument_engine
+
+PRIMARY_READS_COOKIE = "read_primary_until"
+
+_replica_engine: Engine | None = None
+_replica_session_factory: sessionmaker | None = None
+_replica_lock = threading.Lock()
+
+
+def get_replica_engine() -> Engine | None:
+    """
+    retorna o engine da réplica, criando-o na primeira chamada
+
+    :return: o engine da réplica, ou None se DATABASE_REPLICA_URL não estiver definida
+    """
+    global _replica_engine, _replica_session_factory
+    if _replica_engine is None and settings.DATABASE_REPLICA_URL:
+        with _replica_lock:
+            if _replica_engine is None:
+                url = settings.DATABASE_REPLICA_URL
+                engine = create_engine(url, **engine_options(url))
+                instrument_engine(engine)
+                _replica_session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _replica_engine = engine
+    return _replica_engine
+
+
+def get_replica_session_factory() -> sessionmaker | None:
+    """
+    :return: a fábrica de sessões da réplica, ou None se não houver réplica
+    """
+    get_replica_engine()
+    return _replica_session_factory
+
+
+def dispose_replica_engine() -> None:
+    """
+    fecha as conexões da réplica, se o engine tiver sido criado
+    """
+    global _replica_engine, _replica_session_factory
+    if _replica_engine is not None:
+        _replica_engine.dispose()
+        _replica_engine = None
+        _replica_session_factory = None
+
+
+def pin_reads_to_primary(response: Response) -> None:
+    """
+    faz as próximas leituras do cliente irem ao primário por DB_REPLICA_READ_AFTER_WRITE segundos
+
+    :param response: resposta do endpoint que acabou de escrever
+    """
+    if settings.DATABASE_REPLICA_URL and settings.DB_REPLICA_READ_AFTER_WRITE > 0:
+        seconds = settings.DB_REPLICA_READ_AFTER_WRITE
+        response.set_cookie(
+            PRIMARY_READS_COOKIE, f"{time.time() + seconds:.3f}",
+            max_age=max(1, round(seconds)), httponly=True, samesite="lax"
+        )
+
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    """
+    verifica se o cliente escreveu há pouco e deve ler do primário
+
+    :param request: requisição atual
+    :return: True enquanto o cookie de 'pin_reads_to_primary' estiver válido
+    """
+    value = request.cookies.get(PRIMARY_READS_COOKIE)
+    if value is None:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+def _read_factory(request: Request) -> sessionmaker | None:
+    if reads_pinned_to_primary(request):
+        return None
+    return get_replica_session_factory()
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """
+    dependência que fornece a sessão das leituras: a réplica, quando houver
+
+    a sessão do primário ('get_db') só abre uma conexão se for usada, então
+    recebê-la aqui não custa uma conexão quando a leitura vai para a réplica
+    """
+    factory = _read_factory(request)
+    if factory is None:
+        yield db
+        return
+    replica_db = factory()
+    try:
+        yield replica_db
+    finally:
+        replica_db.close()
+
+
+def get_read_session_factory(request: Request, session_factory=Depends(get_session_factory)):
+    """
+    dependência equivalente a 'get_session_factory' para leituras em streaming
+    """
+    return _read_factory(request) or session_factory
@@ -0,0 +1,286 @@
+"""
+gerador de dados sintéticos em volume de produção
+
+cria roles, claims e N usuários com distribuições realistas: poucas roles
+concentram a maior parte dos usuários, a quantidade de claims por usuário
+segue uma lei de potência (a maioria tem poucas, alguns têm dezenas) e as
+claims mais populares aparecem com mais frequência
+
+os usuários são gerados em blocos de ids consecutivos e cada bloco tem o
+próprio gerador aleatório, derivado da semente e do número do bloco. assim
+o resultado é o mesmo para a mesma semente, qualquer que seja o número de
+processos. no postgres (psycopg2) os blocos são carregados com COPY; nos
+demais bancos, com INSERTs de várias linhas. todos os usuários recebem o
+mesmo hash bcrypt, calculado uma única vez, da senha '--password'
+
+os triggers de notificação de user_claims ficam desligados durante a carga
+(uma notificação por linha custaria mais que a própria carga) e uma única
+notificação '*' é enviada ao final
+
+uso:
+    python -m app.database.seed --users 10000000 --workers 8 --seed 42
+    python -m app.database.seed --users 100000 --url sqlite:///./seed.db --create-tables
+"""
+
+import argparse
+import io
+import itertools
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import NullPool
+from ..config import settings
+from ..models.base import Base
+from ..models.role_model import Role
+from ..models.claim_model import Claim
+from ..models.user_model import User
+from ..models.user_claim_model import UserClaim
+from .. import models  # noqa: F401  (registra os modelos no metadata)
+
+BASE_DATE = date(2020, 1, 1)
+CREATED_AT_SPAN_DAYS = 5 * 365
+
+_FIRST_NAMES = (
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "João",
+    "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thiago", "Vitória", "Lucas",
+)
+_LAST_NAMES = (
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa",
+)
+
+
+@dataclass(frozen=True)
+class SeedPlan:
+    """
+    parâmetros da geração, compartilhados com os processos de carga
+    """
+
+    url: str
+    seed: int
+    users: int
+    roles: int
+    claims: int
+    chunk_size: int
+    claims_alpha: float
+    max_claims_per_user: int
+    password_hash: str
+
+
+def _zipf_cumulative(size: int, exponent: float) -> list[float]:
+    return list(itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(size)))
+
+
+def generate_chunk(plan: SeedPlan, chunk: int) -> tuple[list[tuple], list[tuple]]:
+    """
+    gera os usuários de um bloco e as claims de cada um
+
+    :param plan: parâmetros da geração
+    :param chunk: número do bloco; os ids vão de chunk * chunk_size + 1 em diante
+    :return: linhas de users (id, name, email, password, role_id, created_at,
+        updated_at) e de user_claims (user_id, claim_id)
+    """
+    rng = random.Random(f"{plan.seed}:{chunk}")
+    role_weights = _zipf_cumulative(plan.roles, 1.0)
+    claim_weights = _zipf_cumulative(plan.claims, 1.0)
+    count_weights = _zipf_cumulative(plan.max_claims_per_user + 1, plan.claims_alpha)
+    role_ids = range(1, plan.roles + 1)
+    claim_offsets = range(plan.claims)
+    counts = range(plan.max_claims_per_user + 1)
+
+    first_id = chunk * plan.chunk_size + 1
+    last_id = min(first_id + plan.chunk_size, plan.users + 1)
+    size = last_id - first_id
+    roles = rng.choices(role_ids, cum_weights=role_weights, k=size)
+    claim_counts = rng.choices(counts, cum_weights=count_weights, k=size)
+    first_claims = rng.choices(claim_offsets, cum_weights=claim_weights, k=size)
+
+    users, user_claims = [], []
+    for position, user_id in enumerate(range(first_id, last_id)):
+        created_at = BASE_DATE + timedelta(days=rng.randrange(CREATED_AT_SPAN_DAYS))
+        updated_at = created_at + timedelta(days=rng.randrange(365)) if rng.random() < 0.3 else None
+        name = f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+        users.append((user_id, name, f"user{user_id}@example.com", plan.password_hash, roles[position], created_at, updated_at))
+        # claims consecutivas a partir de uma claim popular: distintas e baratas de sortear
+        start = first_claims[position]
+        for offset in range(claim_counts[position]):
+            user_claims.append((user_id, (start + offset) % plan.claims + 1))
+    return users, user_claims
+
+
+def _copy_rows(connection: Connection, table: str, columns: tuple[str, ...], rows: list[tuple]) -> None:
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(r"\N" if value is None else str(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+
+_USER_COLUMNS = ("id", "name", "email", "password", "role_id", "created_at", "updated_at")
+_USER_CLAIM_COLUMNS = ("user_id", "claim_id")
+
+
+def _uses_copy(engine: Engine) -> bool:
+    return engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+
+
+def load_chunk(engine: Engine, plan: SeedPlan, chunk: int) -> tuple[int, int]:
+    """
+    gera e grava um bloco em uma única transação
+
+    :param engine: engine do banco de destino
+    :param plan: parâmetros da geração
+    :param chunk: número do bloco
+    :return: quantidade de usuários e de user_claims gravados
+    """
+    users, user_claims = generate_chunk(plan, chunk)
+    with engine.begin() as connection:
+        if _uses_copy(engine):
+            connection.execute(text("SET LOCAL synchronous_commit = off"))
+            _copy_rows(connection, "users", _USER_COLUMNS, users)
+            _copy_rows(connection, "user_claims", _USER_CLAIM_COLUMNS, user_claims)
+        else:
+            connection.execute(insert(User.__table__), [dict(zip(_USER_COLUMNS, row)) for row in users])
+            if user_claims:
+                connection.execute(insert(UserClaim.__table__), [dict(zip(_USER_CLAIM_COLUMNS, row)) for row in user_claims])
+    return len(users), len(user_claims)
+
+
+_worker_engine: Engine | None = None
+
+
+def _load_chunk_in_worker(plan: SeedPlan, chunk: int) -> tuple[int, int]:
+    global _worker_engine
+    if _worker_engine is None:
+        _worker_engine = create_engine(plan.url, poolclass=NullPool)
+    return load_chunk(_worker_engine, plan, chunk)
+
+
+def _prepare(engine: Engine, plan: SeedPlan, truncate: bool) -> None:
+    with engine.begin() as connection:
+        if truncate:
+            if engine.dialect.name == "postgresql":
+                connection.execute(text("TRUNCATE user_claims, users, claims, roles RESTART IDENTITY"))
+            else:
+                for model in (UserClaim, User, Claim, Role):
+                    connection.execute(model.__table__.delete())
+        elif any(connection.scalar(select(func.count()).select_from(model)) for model in (User, Role, Claim)):
+            raise RuntimeError("o banco já possui roles, claims ou usuários; use --truncate para substituir os dados")
+
+        connection.execute(insert(Role.__table__), [
+            {"id": role_id, "description": f"Role {role_id}"} for role_id in range(1, plan.roles + 1)
+        ])
+        connection.execute(insert(Claim.__table__), [
+            {"id": claim_id, "description": f"Claim {claim_id}", "active": True} for claim_id in range(1, plan.claims + 1)
+        ])
+        if engine.dialect.name == "postgresql":
+            connection.execute(text("ALTER TABLE user_claims DISABLE TRIGGER USER"))
+
+
+def _enable_triggers(engine: Engine) -> None:
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            connection.execute(text("ALTER TABLE user_claims ENABLE TRIGGER USER"))
+
+
+def _finish(engine: Engine) -> None:
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as connection:
+        for table in ("roles", "claims", "users"):
+            connection.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {table}))"
+            ))
+        connection.execute(text("SELECT pg_notify('user_claims_changed', '*')"))
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE roles, claims, users, user_claims"))
+
+
+def seed(plan: SeedPlan, workers: int = 1, truncate: bool = False, create_tables: bool = False) -> tuple[int, int]:
+    """
+    popula o banco de dados segundo o plano
+
+    :param plan: parâmetros da geração
+    :param workers: processos de carga; o sqlite usa sempre um, pois não aceita escritas paralelas
+    :param truncate: apaga os dados existentes antes da carga
+    :param create_tables: cria as tabelas dos modelos caso não existam
+    :return: quantidade de usuários e de user_claims gravados
+    :raises RuntimeError: se o banco já tiver dados e 'truncate' for falso
+    """
+    engine = create_engine(plan.url, poolclass=NullPool)
+    try:
+        if create_tables:
+            Base.metadata.create_all(bind=engine)
+        _prepare(engine, plan, truncate)
+    except Exception:
+        engine.dispose()
+        raise
+    try:
+        chunks = range((plan.users + plan.chunk_size - 1) // plan.chunk_size)
+        if engine.dialect.name == "sqlite" or workers <= 1:
+            results = [load_chunk(engine, plan, chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_load_chunk_in_worker, itertools.repeat(plan), chunks))
+    finally:
+        _enable_triggers(engine)
+    try:
+        _finish(engine)
+    finally:
+        engine.dispose()
+    return sum(users for users, _ in results), sum(claims for _, claims in results)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.DATABASE_URL, help="url síncrona do banco (padrão: DATABASE_URL)")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--roles", type=int, default=20)
+    parser.add_argument("--claims", type=int, default=200)
+    parser.add_argument("--claims-alpha", type=float, default=1.6, help="expoente da lei de potência de claims por usuário")
+    parser.add_argument("--max-claims-per-user", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--password", default="password123", help="senha de todos os usuários gerados")
+    parser.add_argument("--truncate", action="store_true", help="apaga roles, claims e usuários existentes")
+    parser.add_argument("--create-tables", action="store_true", help="cria as tabelas antes da carga")
+    args = parser.parse_args()
+
+    from ..services.user_service import UserService
+
+    plan = SeedPlan(
+        url=args.url,
+        seed=args.seed,
+        users=args.users,
+        roles=args.roles,
+        claims=args.claims,
+        chunk_size=args.chunk_size,
+        claims_alpha=args.claims_alpha,
+        max_claims_per_user=min(args.max_claims_per_user, args.claims),
+        password_hash=UserService.hash_password(args.password),
+    )
+    start = time.perf_counter()
+    try:
+        users, user_claims = seed(plan, args.workers, args.truncate, args.create_tables)
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"{users} usuários e {user_claims} user_claims em {elapsed:.1f}s ({users / elapsed:.0f} usuários/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""
+middleware asgi que agrupa os comandos sql de cada requisição
+
+ao fim da requisição, comandos com o mesmo texto sql executados
+N_PLUS_ONE_THRESHOLD vezes ou mais são registrados como possível n+1
+"""
+
+from .query_diagnostics import QueryLog, current_query_log, report_n_plus_one
+
+
+class QueryDiagnosticsMiddleware:
+    """
+    mantém um QueryLog por requisição http e reporta os n+1 encontrados
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        query_log = QueryLog()
+        token = current_query_log.set(query_log)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_query_log.reset(token)
+            route = scope.get("route")
+            report_n_plus_one(query_log, f"{scope['method']} {getattr(route, 'path', scope['path'])}")
@@ -0,0 +1,223 @@
+"""
+diagnóstico dos comandos sql: log de consultas lentas e detecção de n+1
+
+os relacionamentos preguiçosos (User.role, User.claims, Role.users) fazem
+com que um laço sobre objetos dispare uma consulta por item sem que isso
+apareça no código. os listeners deste módulo, registrados no engine,
+registram:
+
+- comandos mais lentos que SLOW_QUERY_MS, com os parâmetros e o método de
+  repositório (ou serviço) que os executou. os valores das colunas sensíveis
+  (como users.password) são trocados por '***' antes de ir para o log
+- comandos com o mesmo texto sql repetidos N_PLUS_ONE_THRESHOLD vezes ou
+  mais dentro de uma requisição, o sinal típico de um n+1
+
+'count_queries' conta os comandos executados em um bloco, em qualquer
+engine e thread, e é a base do fixture 'query_budget' dos testes
+"""
+
+import logging
+import re
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+_CALLER_MODULES = ("app.repositories", "app.services", "app.controllers")
+_MAX_PARAMS_LENGTH = 500
+_REDACTED = "***"
+# nomes dos parâmetros das colunas sensíveis, inclusive os numerados pelo sqlalchemy
+# ('password_1' em um WHERE, 'password__0' em um INSERT de várias linhas)
+_SENSITIVE_PARAMETER = re.compile(r"^password(?:_{1,2}\d+)?$")
+
+
+class QueryLog:
+    """
+    comandos executados durante uma requisição, agrupados pelo texto sql
+    """
+
+    __slots__ = ("shapes", "callers")
+
+    def __init__(self):
+        self.shapes: dict[str, int] = {}
+        self.callers: dict[str, str] = {}
+
+    @property
+    def count(self) -> int:
+        return sum(self.shapes.values())
+
+    def record(self, statement: str) -> None:
+        """
+        registra uma execução do comando, guardando quem o executou na repetição que atinge o limite
+
+        :param statement: texto sql do comando
+        """
+        executions = self.shapes.get(statement, 0) + 1
+        self.shapes[statement] = executions
+        if executions == settings.N_PLUS_ONE_THRESHOLD:
+            self.callers[statement] = find_caller()
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        :param threshold: número de execuções a partir do qual o comando é suspeito
+        :return: pares (comando, execuções) repetidos ao menos 'threshold' vezes
+        """
+        return [(statement, executions) for statement, executions in self.shapes.items() if executions >= threshold]
+
+
+current_query_log: ContextVar[QueryLog | None] = ContextVar("current_query_log", default=None)
+
+
+def find_caller() -> str:
+    """
+    encontra o primeiro método da aplicação na pilha de chamadas
+
+    os repositórios têm preferência sobre serviços e controllers, já que são
+    eles que montam as consultas
+
+    :return: 'módulo.função:linha', ou '?' se nenhum frame da aplicação for encontrado
+    """
+    found: dict[str, str] = {}
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        for prefix in _CALLER_MODULES:
+            if module.startswith(prefix) and prefix not in found:
+                name = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+                found[prefix] = f"{module}.{name}:{frame.f_lineno}"
+        frame = frame.f_back
+    for prefix in _CALLER_MODULES:
+        if prefix in found:
+            return found[prefix]
+    return "?"
+
+
+def _redact_row(row, names: list[str] | None):
+    if isinstance(row, dict):
+        return {name: _REDACTED if _SENSITIVE_PARAMETER.match(name) else value for name, value in row.items()}
+    if not isinstance(row, (list, tuple)):
+        return row
+    if not names:
+        # sem os nomes não há como saber quais posições são sensíveis
+        return tuple(type(value).__name__ for value in row)
+    # um INSERT de várias linhas repete os parâmetros de uma linha na mesma ordem
+    return tuple(
+        _REDACTED if _SENSITIVE_PARAMETER.match(names[position % len(names)]) else value
+        for position, value in enumerate(row)
+    )
+
+
+def _redact_parameters(parameters, context, executemany: bool):
+    """
+    troca por '***' os valores dos parâmetros das colunas sensíveis
+
+    parâmetros nomeados são reconhecidos pela chave; os posicionais, pelos
+    nomes em 'context.compiled.positiontup'
+
+    :param parameters: parâmetros enviados ao driver
+    :param context: contexto de execução do comando
+    :param executemany: se 'parameters' é uma lista de linhas
+    :return: os parâmetros, sem os valores sensíveis
+    """
+    names = getattr(getattr(context, "compiled", None), "positiontup", None)
+    if executemany and isinstance(parameters, (list, tuple)):
+        return [_redact_row(row, names) for row in parameters]
+    return _redact_row(parameters, names)
+
+
+def _format_parameters(parameters) -> str:
+    text = repr(parameters)
+    if len(text) > _MAX_PARAMS_LENGTH:
+        return text[:_MAX_PARAMS_LENGTH] + "..."
+    return text
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._diagnostics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_diagnostics_start", None)
+    if start is not None and settings.SLOW_QUERY_MS > 0:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms >= settings.SLOW_QUERY_MS:
+            logger.warning(
+                "consulta lenta (%.1f ms) em %s: %s | parâmetros: %s",
+                elapsed_ms, find_caller(), statement,
+                _format_parameters(_redact_parameters(parameters, context, executemany)),
+            )
+    query_log = current_query_log.get()
+    if query_log is not None:
+        query_log.record(statement)
+
+
+def attach_engine(engine: Engine) -> None:
+    """
+    registra os listeners de diagnóstico no engine
+
+    :param engine: engine síncrono (para engines assíncronos, use 'sync_engine')
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def report_n_plus_one(query_log: QueryLog, where: str) -> list[tuple[str, int]]:
+    """
+    registra no log os comandos repetidos de uma requisição
+
+    :param query_log: comandos executados na requisição
+    :param where: descrição da requisição (por exemplo 'GET /users/{user_id}')
+    :return: os comandos considerados n+1
+    """
+    if settings.N_PLUS_ONE_THRESHOLD <= 0:
+        return []
+    repeated = query_log.repeated(settings.N_PLUS_ONE_THRESHOLD)
+    for statement, executions in repeated:
+        logger.warning(
+            "possível n+1 em %s: comando executado %d vezes a partir de %s: %s",
+            where, executions, query_log.callers.get(statement, "?"), statement,
+        )
+    return repeated
+
+
+@contextmanager
+def count_queries():
+    """
+    conta os comandos sql executados dentro do bloco, em qualquer engine e thread
+
+    útil nos testes, em que o TestClient executa a aplicação em outra thread
+
+    :return: um QueryLog preenchido à medida que os comandos são executados
+    """
+    query_log = QueryLog()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        query_log.record(statement)
+
+    event.listen(Engine, "after_cursor_execute", record)
+    try:
+        yield query_log
+    finally:
+        event.remove(Engine, "after_cursor_execute", record)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """
+    falha se o bloco executar mais comandos sql do que o orçamento
+
+    :param max_queries: número máximo de comandos permitidos
+    :return: o QueryLog do bloco
+    :raises AssertionError: se o orçamento for excedido, listando os comandos executados
+    """
+    with count_queries() as query_log:
+        yield query_log
+    if query_log.count > max_queries:
+        executed = "\n".join(f"  {executions}x {statement}" for statement, executions in query_log.shapes.items())
+        raise AssertionError(f"{query_log.count} comandos sql executados, orçamento de {max_queries}:\n{executed}")
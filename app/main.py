@@ -1,10 +1,77 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from .config import settings
 from .models.base import Base
-from .database.database import engine
+from .database.database import get_engine, get_session_factory
+from .database.async_database import dispose_async_engine
+from .database.replica import get_replica_engine, dispose_replica_engine
+from .cache import role_cache, table_version_cache, claim_cache
+from .cache.notify_listener import NotifyListener
 from .controllers.user_controller import router as user_router
+from .controllers.async_user_controller import router as async_user_router
+from .controllers.internal_controller import router as internal_router
+from .controllers.authorization_controller import router as authorization_router
+from .controllers.metrics_controller import router as metrics_router
+from .metrics.middleware import MetricsMiddleware
+from .diagnostics.middleware import QueryDiagnosticsMiddleware
+from .services.hashing_executor import shutdown_hashing_executor
+from .services import password_hashing
+from .services.idempotency_service import IdempotencyService
+from .services.user_service import UserService
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # calibra o custo do bcrypt antes da primeira requisição, e não dentro dela
+    await run_in_threadpool(password_hashing.get_rounds)
+    engine = get_engine()
+    if settings.DB_CREATE_ALL:
+        await run_in_threadpool(Base.metadata.create_all, bind=engine)
+    replica = get_replica_engine()
+    # com réplica, as invalidações são repetidas depois do atraso tolerado,
+    # para descartar valores lidos da réplica antes de ela aplicar a alteração
+    notify_listener = NotifyListener(
+        engine, redispatch_after=settings.DB_REPLICA_READ_AFTER_WRITE if replica is not None else 0
+    )
+    if engine.dialect.name == "postgresql":
+        table_version_cache.register_invalidation(notify_listener)
+        claim_cache.register_invalidation(notify_listener)
+        if settings.ROLE_CACHE_ENABLED:
+            role_cache.register_invalidation(notify_listener)
+    notify_listener.start()
+    idempotency_cleanup = None
+    if settings.IDEMPOTENCY_CLEANUP_INTERVAL > 0:
+        idempotency_cleanup = asyncio.create_task(IdempotencyService.purge_expired_periodically(
+            get_session_factory(), settings.IDEMPOTENCY_CLEANUP_INTERVAL
+        ))
+    email_filter_loader = None
+    if settings.EMAIL_FILTER_ENABLED:
+        # a carga roda em segundo plano: até terminar, as buscas por e-mail consultam o banco
+        email_filter_loader = asyncio.create_task(UserService.rebuild_email_filter_periodically(
+            get_session_factory(), settings.EMAIL_FILTER_REBUILD_INTERVAL
+        ))
+    yield
+    if email_filter_loader is not None:
+        email_filter_loader.cancel()
+    if idempotency_cleanup is not None:
+        idempotency_cleanup.cancel()
+    notify_listener.stop()
+    shutdown_hashing_executor()
+    dispose_replica_engine()
+    await dispose_async_engine()
 
-app.include_router(user_router)
+app = FastAPI(lifespan=lifespan)
+
+if settings.N_PLUS_ONE_THRESHOLD > 0:
+    app.add_middleware(QueryDiagnosticsMiddleware)
 
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+if settings.DB_MODE == "async":
+    app.include_router(async_user_router)
+app.include_router(user_router)
+app.include_router(authorization_router)
+app.include_router(internal_router)
@@ -0,0 +1,107 @@
+"""
+métricas da aplicação e a coleta dos tempos de banco de dados
+
+as métricas por requisição (quantidade de comandos sql e tempo de banco)
+são acumuladas em um objeto guardado em uma ContextVar pelo middleware. o
+contexto é copiado para o threadpool do starlette, então os eventos do
+engine disparados pelos endpoints síncronos enxergam o mesmo objeto
+"""
+
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .registry import Counter, Gauge, Histogram
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "latência das requisições http por rota e status",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "comandos sql executados por requisição",
+    ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+HTTP_REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "tempo gasto no banco de dados por requisição",
+    ("method", "route"),
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "tempo de cpu de cada hash bcrypt",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0),
+)
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight",
+    "requisições admitidas e em execução por rota",
+    ("route",),
+)
+ADMISSION_QUEUED = Gauge(
+    "admission_queued",
+    "requisições aguardando admissão por rota",
+    ("route",),
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total",
+    "requisições recusadas com 503 por rota e motivo (queue_full ou timeout)",
+    ("route", "reason"),
+)
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds",
+    "tempo de espera na fila até a admissão",
+    ("route",),
+    buckets=(0, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+class RequestDBStats:
+    """
+    acumulador dos comandos sql de uma requisição
+    """
+
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+request_db_stats: ContextVar[RequestDBStats | None] = ContextVar("request_db_stats", default=None)
+
+
+# os comandos executados fora de uma requisição (startup, ouvinte de
+# notificações) não são medidos, o que mantém o custo dos eventos mínimo
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and request_db_stats.get() is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_metrics_start", None)
+    if start is not None:
+        stats = request_db_stats.get()
+        stats.statements += 1
+        stats.seconds += time.perf_counter() - start
+
+
+def attach_engine(engine: Engine) -> None:
+    """
+    registra a medição dos comandos sql no engine
+
+    :param engine: engine síncrono (para engines assíncronos, use 'sync_engine')
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def observe_password_hash(seconds: float) -> None:
+    """
+    registra a duração de um hash de senha
+
+    :param seconds: tempo gasto no hash, em segundos
+    """
+    PASSWORD_HASH_DURATION.observe(seconds)
@@ -0,0 +1,53 @@
+"""
+middleware asgi que mede cada requisição http
+
+o rótulo 'route' usa o template da rota (por exemplo '/role/{role_id}'),
+lido do escopo depois do roteamento, para que a cardinalidade não cresça
+com os ids. requisições que não casam com nenhuma rota usam 'unmatched'
+"""
+
+import time
+from .instruments import (
+    HTTP_REQUEST_DB_DURATION,
+    HTTP_REQUEST_DB_STATEMENTS,
+    HTTP_REQUEST_DURATION,
+    RequestDBStats,
+    request_db_stats,
+)
+
+
+class MetricsMiddleware:
+    """
+    registra latência, status e uso do banco de cada requisição http
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestDBStats()
+        token = request_db_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            request_db_stats.reset(token)
+            route = scope.get("route")
+            template = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            HTTP_REQUEST_DURATION.observe(elapsed, method, template, status)
+            HTTP_REQUEST_DB_STATEMENTS.observe(stats.statements, method, template)
+            HTTP_REQUEST_DB_DURATION.observe(stats.seconds, method, template)
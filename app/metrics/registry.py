@@ -0,0 +1,202 @@
+"""
+contadores e histogramas no formato de exposição do prometheus
+
+cada thread escreve apenas no seu próprio fragmento (shard) de valores,
+guardado em um threading.local, então registrar uma observação não usa
+locks nem disputa com outras threads. o lock só é usado quando uma thread
+escreve pela primeira vez em uma métrica, para registrar o seu fragmento.
+a coleta soma os fragmentos de todas as threads; como os valores são
+apenas acumulados, uma leitura concorrente pode ficar no máximo uma
+observação atrás
+"""
+
+import bisect
+import threading
+
+REGISTRY: list["_Metric"] = []
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+class _Metric:
+    """
+    base das métricas: nome, ajuda, rótulos e fragmentos por thread
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._shards_lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _snapshots(self) -> list[list[tuple]]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        # list(dict.items()) é executado sem liberar o GIL, então a cópia é
+        # consistente mesmo com a thread dona inserindo novos rótulos
+        return [list(shard.items()) for shard in shards]
+
+    def _labels(self, values: tuple, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> list[str]:
+        """
+        gera as linhas da métrica no formato texto do prometheus
+
+        :return: linhas de HELP, TYPE e amostras
+        """
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """
+    contador monotônico
+    """
+
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        """
+        incrementa o contador
+
+        :param labels: valores dos rótulos, na ordem de 'labelnames'
+        :param amount: valor a somar
+        """
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        """
+        :param labels: valores dos rótulos
+        :return: o total somado de todas as threads
+        """
+        return sum(dict(items).get(labels, 0.0) for items in self._snapshots())
+
+    def _samples(self) -> list[str]:
+        totals: dict[tuple, float] = {}
+        for items in self._snapshots():
+            for labels, value in items:
+                totals[labels] = totals.get(labels, 0.0) + value
+        return [f"{self.name}{self._labels(labels)} {_number(value)}" for labels, value in sorted(totals.items())]
+
+
+class Gauge(Counter):
+    """
+    valor que sobe e desce, como a quantidade de requisições em andamento
+
+    cada thread acumula os próprios incrementos e decrementos, e a coleta
+    soma os fragmentos, então inc e dec podem ocorrer em threads diferentes
+    """
+
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1.0) -> None:
+        """
+        decrementa o valor
+
+        :param labels: valores dos rótulos, na ordem de 'labelnames'
+        :param amount: valor a subtrair
+        """
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """
+    histograma com buckets fixos
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels) -> None:
+        """
+        registra uma observação
+
+        :param value: valor observado (em segundos, para durações)
+        :param labels: valores dos rótulos, na ordem de 'labelnames'
+        """
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            # contagem de cada bucket (o último é o +Inf) seguida da soma
+            entry = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        entry[bisect.bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    def count(self, *labels) -> int:
+        """
+        :param labels: valores dos rótulos
+        :return: número de observações somado de todas as threads
+        """
+        total = 0
+        for items in self._snapshots():
+            entry = dict(items).get(labels)
+            if entry is not None:
+                total += sum(entry[:-1])
+        return total
+
+    def _samples(self) -> list[str]:
+        totals: dict[tuple, list] = {}
+        for items in self._snapshots():
+            for labels, entry in items:
+                merged = totals.setdefault(labels, [0] * len(entry))
+                for index, value in enumerate(entry):
+                    merged[index] += value
+
+        lines = []
+        for labels, entry in sorted(totals.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), entry):
+                cumulative += bucket_count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{self._labels(labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {_number(entry[-1])}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {cumulative}")
+        return lines
+
+
+def render(metrics: list[_Metric] | None = None) -> str:
+    """
+    gera o texto de exposição de todas as métricas registradas
+
+    :param metrics: métricas a exportar; por padrão, todas as do registro
+    :return: o corpo da resposta de /metrics
+    """
+    lines = []
+    for metric in REGISTRY if metrics is None else metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
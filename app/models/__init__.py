@@ -2,5 +2,7 @@ from .role_model import Role
 from .user_model import User
 from .claim_model import Claim
 from .user_claim_model import UserClaim
+from .table_version_model import TableVersion
+from .idempotency_key_model import IdempotencyKey
 
-__all__ = ["Role", "User", "Claim", "UserClaim"]
+__all__ = ["Role", "User", "Claim", "UserClaim", "TableVersion", "IdempotencyKey"]
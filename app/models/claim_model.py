@@ -15,7 +15,7 @@ class Claim(Base):
 
     __tablename__ = "claims"
 
-    id = Column(Integer, primary_key=True, index=True, doc="identificador único do claim")
+    id = Column(Integer, primary_key=True, doc="identificador único do claim")
     description = Column(String, nullable=False, index=True, doc="descrição do claim")
     active = Column(Boolean, nullable=False, default=True, doc="indica se o claim está ativo")
 
@@ -0,0 +1,31 @@
+"""
+define o modelo orm para a tabela 'idempotency_keys'
+
+cada linha registra uma requisição feita com o cabeçalho Idempotency-Key:
+enquanto ela está em andamento, 'status_code' é nulo e 'locked_until'
+limita por quanto tempo as repetições esperam por ela; depois de
+concluída, guarda a resposta enviada até 'expires_at'
+
+'claim_token' é trocado a cada reserva. a requisição só grava ou libera a
+chave com o próprio token, então uma requisição lenta cujo prazo acabou não
+sobrescreve a linha de quem a assumiu
+"""
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from .base import Base
+
+class IdempotencyKey(Base):
+    """
+    modelo para a tabela 'idempotency_keys'
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    route = Column(String, primary_key=True, doc="rota da requisição, por exemplo 'POST /users/'")
+    key = Column(String(255), primary_key=True, doc="valor do cabeçalho Idempotency-Key")
+    request_hash = Column(String(64), nullable=False, doc="sha-256 dos dados da requisição, com a senha apenas como HMAC")
+    status_code = Column(Integer, nullable=True, doc="status da resposta; nulo enquanto a requisição está em andamento")
+    response_body = Column(Text, nullable=True, doc="corpo json da resposta")
+    claim_token = Column(String(32), nullable=False, doc="token aleatório da reserva atual")
+    locked_until = Column(DateTime(timezone=True), nullable=False, doc="fim do prazo da requisição em andamento")
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True, doc="quando a chave pode ser descartada")
@@ -15,7 +15,7 @@ class Role(Base):
 
     __tablename__ = "roles"
 
-    id = Column(Integer, primary_key=True, index=True, doc="identificador único do role")
+    id = Column(Integer, primary_key=True, doc="identificador único do role")
     description = Column(String, nullable=False, index=True, doc="descrição do role")
 
     users = relationship(
@@ -0,0 +1,19 @@
+"""
+define o modelo orm para a tabela 'table_versions'
+
+cada linha guarda um contador que é incrementado sempre que a tabela
+correspondente é alterada, servindo de base para os etags http
+"""
+
+from sqlalchemy import Column, String, BigInteger
+from .base import Base
+
+class TableVersion(Base):
+    """
+    modelo para a tabela 'table_versions'
+    """
+
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True, doc="nome da tabela versionada")
+    version = Column(BigInteger, nullable=False, default=0, doc="contador de alterações da tabela")
@@ -24,5 +24,6 @@ class UserClaim(Base):
         Integer, 
         ForeignKey("claims.id"), 
         primary_key=True, 
+        index=True, 
         doc="identificador do claim associado"
     )
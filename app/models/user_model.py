@@ -5,7 +5,7 @@ o modelo representa os usuários do sistema com suas informações básicas, rel
 """
 
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, Integer, String, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Index, func
 from .base import Base
 
 class User(Base):
@@ -18,7 +18,6 @@ class User(Base):
     id = Column(
         Integer, 
         primary_key=True, 
-        index=True, 
         doc="identificador único do usuário"
     )
     name = Column(
@@ -30,9 +29,7 @@ class User(Base):
     email = Column(
         String, 
         nullable=False, 
-        unique=True, 
-        index=True, 
-        doc="endereço de email único do usuário"
+        doc="endereço de email do usuário, único sem diferenciar maiúsculas (ix_users_email_lower)"
     )
     password = Column(
         String, 
@@ -43,6 +40,7 @@ class User(Base):
         Integer, 
         ForeignKey("roles.id"), 
         nullable=False, 
+        index=True, 
         doc="identificador da role associada ao usuário"
     )
     created_at = Column(
@@ -67,3 +65,6 @@ class User(Base):
         back_populates="users", 
         doc="relação com as claims associadas ao usuário"
     )
+
+# a unicidade do e-mail não diferencia maiúsculas; as buscas usam lower(email)
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
@@ -0,0 +1,30 @@
+"""
+repositório assíncrono para interagir com a tabela 'claims'
+
+equivalente ao ClaimRepository, mas utilizando uma AsyncSession do sqlalchemy
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.claim_model import Claim
+
+class AsyncClaimRepository:
+    """
+    repositório assíncrono para a tabela 'claims'
+    """
+    def __init__(self, db: AsyncSession):
+        """
+        inicializa o repositório com uma sessão assíncrona de banco de dados
+
+        :param db: sessão assíncrona ativa do banco de dados
+        """
+        self.db = db
+
+    async def get_all_claims(self):
+        """
+        retorna todas as claims armazenadas no banco de dados
+
+        :return: lista de objetos 'Claim'
+        """
+        result = await self.db.execute(select(Claim))
+        return result.scalars().all()
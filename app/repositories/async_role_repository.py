@@ -0,0 +1,25 @@
+"""
+repositório assíncrono para acessar os dados de 'role' no banco de dados
+
+equivalente ao RoleRepository, mas utilizando uma AsyncSession do sqlalchemy
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.role_model import Role
+
+class AsyncRoleRepository:
+    """
+    repositório assíncrono para a tabela 'roles'
+    """
+    @staticmethod
+    async def get_role_by_id(db: AsyncSession, role_id: int):
+        """
+        recupera um 'role' específico pelo id
+
+        :param db: sessão assíncrona ativa do banco de dados
+        :param role_id: id do role a ser recuperado
+        :return: objeto Role ou None se não encontrado
+        """
+        result = await db.execute(select(Role).where(Role.id == role_id))
+        return result.scalars().first()
@@ -0,0 +1,28 @@
+"""
+repositório assíncrono para consultar os contadores de versão das tabelas
+
+equivalente ao TableVersionRepository, mas utilizando uma AsyncSession do sqlalchemy
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.table_version_model import TableVersion
+
+class AsyncTableVersionRepository:
+    """
+    repositório assíncrono para a tabela 'table_versions'
+    """
+    @staticmethod
+    async def get_version(db: AsyncSession, table_name: str) -> int | None:
+        """
+        recupera a versão atual de uma tabela
+
+        :param db: sessão assíncrona ativa do banco de dados
+        :param table_name: nome da tabela versionada
+        :return: o contador de alterações, ou None se a tabela não é versionada
+            (sem a linha criada pela migração, junto com os gatilhos)
+        """
+        result = await db.execute(
+            select(TableVersion.version).where(TableVersion.table_name == table_name)
+        )
+        return result.scalar()
@@ -0,0 +1,94 @@
+"""
+repositório assíncrono para acessar os dados de 'user' no banco de dados
+
+equivalente ao UserRepository, mas utilizando uma AsyncSession do sqlalchemy
+"""
+
+from sqlalchemy import select, func
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.user_model import User
+from ..models.claim_model import Claim
+from ..models.role_model import Role
+from .dialect import insert_for
+
+class AsyncUserRepository:
+    """
+    repositório assíncrono para a tabela 'users'
+    """
+
+    def __init__(self, db: AsyncSession):
+        """
+        inicializa o repositório com a sessão assíncrona do banco de dados
+
+        :param db: sessão assíncrona ativa do banco de dados
+        """
+        self.db = db
+
+    async def create_user(self, db: AsyncSession, user: User):
+        """
+        cria um novo usuário no banco de dados
+
+        :param db: sessão assíncrona ativa do banco de dados
+        :param user: objeto User a ser criado
+        :return: o usuário criado após o commit no banco de dados
+        """
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        return user
+
+    async def insert_user(self, db: AsyncSession, values: dict) -> Row | None:
+        """
+        insere um usuário com um único INSERT ... ON CONFLICT DO NOTHING RETURNING
+
+        :param db: sessão assíncrona ativa do banco de dados
+        :param values: valores das colunas do novo usuário
+        :return: linha com id, name e email, ou None se o e-mail já existir
+        """
+        statement = (
+            insert_for(db.get_bind().dialect.name, User)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+            .returning(User.id, User.name, User.email)
+        )
+        try:
+            row = (await db.execute(statement)).first()
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return row
+
+    async def get_all_users(self):
+        """
+        recupera todos os usuários cadastrados
+
+        :return: lista de objetos User
+        """
+        result = await self.db.execute(select(User))
+        return result.scalars().all()
+
+    async def get_user_by_email(self, db: AsyncSession, email: str) -> User:
+        """
+        recupera um usuário específico pelo email, sem diferenciar maiúsculas
+
+        :param db: sessão assíncrona ativa do banco de dados
+        :param email: email do usuário a ser recuperado
+        :return: usuário encontrado ou None se não encontrado
+        """
+        result = await db.execute(select(User).where(func.lower(User.email) == email.lower()))
+        return result.scalars().first()
+
+    async def get_users_with_role_and_claims(self):
+        """
+        recupera todos os usuários com seus respectivos roles e claims
+
+        :return: lista de tuplas contendo dados dos usuários, roles e claims
+        """
+        result = await self.db.execute(
+            select(User, Role, Claim)
+            .join(Role, User.role_id == Role.id)
+            .join(User.claims)
+        )
+        return result.all()
@@ -0,0 +1,28 @@
+"""
+construções sql que dependem do dialeto do banco de dados
+
+o postgres e o sqlite oferecem INSERT ... ON CONFLICT com construtores
+próprios no sqlalchemy; este módulo escolhe o adequado para a sessão
+"""
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def insert_for(dialect_name: str, table):
+    """
+    cria um INSERT com suporte a ON CONFLICT para o dialeto informado
+
+    :param dialect_name: nome do dialeto ('postgresql' ou 'sqlite')
+    :param table: modelo ou tabela alvo
+    :return: o construtor de insert específico do dialeto
+    :raises NotImplementedError: se o dialeto não suportar ON CONFLICT
+    """
+    try:
+        return _INSERTS[dialect_name](table)
+    except KeyError:
+        raise NotImplementedError(f"INSERT ... ON CONFLICT não suportado no dialeto '{dialect_name}'")
@@ -0,0 +1,166 @@
+"""
+repositório para a tabela 'idempotency_keys'
+
+cada método encerra a própria transação: a chave reservada precisa ficar
+visível para as repetições da requisição antes de o trabalho começar, e quem
+espera não deve segurar uma conexão entre uma consulta e outra
+"""
+
+import secrets
+from datetime import datetime
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from ..models.idempotency_key_model import IdempotencyKey
+from .dialect import insert_for
+
+class IdempotencyRepository:
+    """
+    repositório para a tabela 'idempotency_keys'
+    """
+    @staticmethod
+    def claim(db: Session, route: str, key: str, request_hash: str, now: datetime, locked_until: datetime, expires_at: datetime) -> str | None:
+        """
+        reserva a chave para uma requisição nova
+
+        a reserva também vale sobre uma chave expirada ou sobre uma requisição
+        em andamento cujo prazo ('locked_until') acabou, o que acontece quando
+        o processo que a atendia caiu. cada reserva grava um token novo, exigido
+        por 'complete' e 'release'
+
+        :param db: sessão ativa do banco de dados
+        :param route: rota da requisição
+        :param key: valor do cabeçalho Idempotency-Key
+        :param request_hash: impressão digital dos dados da requisição
+        :param now: instante atual
+        :param locked_until: prazo para a requisição terminar
+        :param expires_at: validade da chave
+        :return: o token da reserva, ou None se a chave não foi reservada para esta requisição
+        """
+        token = secrets.token_hex(16)
+        values = {
+            "route": route,
+            "key": key,
+            "request_hash": request_hash,
+            "status_code": None,
+            "response_body": None,
+            "claim_token": token,
+            "locked_until": locked_until,
+            "expires_at": expires_at,
+        }
+        try:
+            claimed = db.execute(
+                insert_for(db.get_bind().dialect.name, IdempotencyKey)
+                .values(**values)
+                .on_conflict_do_nothing(index_elements=[IdempotencyKey.route, IdempotencyKey.key])
+                .returning(IdempotencyKey.key)
+            ).first() is not None
+            if not claimed:
+                taken_over = db.execute(
+                    update(IdempotencyKey)
+                    .where(
+                        IdempotencyKey.route == route,
+                        IdempotencyKey.key == key,
+                        or_(
+                            IdempotencyKey.expires_at <= now,
+                            and_(IdempotencyKey.status_code.is_(None), IdempotencyKey.locked_until <= now),
+                        ),
+                    )
+                    .values(**values)
+                )
+                claimed = taken_over.rowcount == 1
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return token if claimed else None
+
+    @staticmethod
+    def get(db: Session, route: str, key: str) -> Row | None:
+        """
+        lê o estado de uma chave
+
+        :param db: sessão ativa do banco de dados
+        :param route: rota da requisição
+        :param key: valor do cabeçalho Idempotency-Key
+        :return: linha com request_hash, status_code e response_body, ou None se a chave não existir
+        """
+        row = db.execute(
+            select(IdempotencyKey.request_hash, IdempotencyKey.status_code, IdempotencyKey.response_body)
+            .where(IdempotencyKey.route == route, IdempotencyKey.key == key)
+        ).first()
+        db.commit()
+        return row
+
+    @staticmethod
+    def complete(db: Session, route: str, key: str, token: str, status_code: int, response_body: str, expires_at: datetime) -> bool:
+        """
+        grava a resposta da requisição que reservou a chave
+
+        :param db: sessão ativa do banco de dados
+        :param route: rota da requisição
+        :param key: valor do cabeçalho Idempotency-Key
+        :param token: token devolvido por 'claim'
+        :param status_code: status http enviado
+        :param response_body: corpo json enviado
+        :param expires_at: validade da resposta guardada
+        :return: False se outra requisição assumiu a chave nesse meio-tempo
+        """
+        try:
+            result = db.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.route == route, IdempotencyKey.key == key, IdempotencyKey.claim_token == token)
+                .values(status_code=status_code, response_body=response_body, expires_at=expires_at)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return result.rowcount == 1
+
+    @staticmethod
+    def release(db: Session, route: str, key: str, token: str) -> None:
+        """
+        libera uma chave em andamento, para que a próxima repetição execute de novo
+
+        :param db: sessão ativa do banco de dados
+        :param route: rota da requisição
+        :param key: valor do cabeçalho Idempotency-Key
+        :param token: token devolvido por 'claim'
+        """
+        try:
+            db.execute(
+                delete(IdempotencyKey)
+                .where(
+                    IdempotencyKey.route == route,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.claim_token == token,
+                    IdempotencyKey.status_code.is_(None),
+                )
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    @staticmethod
+    def delete_expired(db: Session, now: datetime) -> int:
+        """
+        apaga as chaves vencidas, usando o índice de expires_at
+
+        :param db: sessão ativa do banco de dados
+        :param now: instante atual
+        :return: quantidade de chaves apagadas
+        """
+        try:
+            result = db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.expires_at <= now,
+                    or_(IdempotencyKey.status_code.is_not(None), IdempotencyKey.locked_until <= now),
+                )
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return result.rowcount
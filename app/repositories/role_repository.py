@@ -7,6 +7,7 @@ interagir com o banco de dados relacional
 """
 
 from ..models.role_model import Role
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 class RoleRepository:
@@ -25,3 +26,16 @@ class RoleRepository:
         :return: objeto Role ou None se não encontrado
         """
         return db.query(Role).filter(Role.id == role_id).first()
+
+    @staticmethod
+    def get_existing_role_ids(db: Session, role_ids: set[int]) -> set[int]:
+        """
+        verifica, com uma única consulta, quais ids de 'role' existem
+
+        :param db: sessão ativa do banco de dados
+        :param role_ids: ids a serem verificados
+        :return: subconjunto dos ids que existem na tabela
+        """
+        if not role_ids:
+            return set()
+        return set(db.scalars(select(Role.id).where(Role.id.in_(role_ids))))
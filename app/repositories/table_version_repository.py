@@ -0,0 +1,28 @@
+"""
+repositório para consultar os contadores de versão das tabelas
+
+os contadores são mantidos por gatilhos no postgres e permitem calcular
+etags sem ler as linhas das tabelas versionadas
+"""
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..models.table_version_model import TableVersion
+
+class TableVersionRepository:
+    """
+    repositório para a tabela 'table_versions'
+    """
+    @staticmethod
+    def get_version(db: Session, table_name: str) -> int | None:
+        """
+        recupera a versão atual de uma tabela
+
+        :param db: sessão ativa do banco de dados
+        :param table_name: nome da tabela versionada
+        :return: o contador de alterações, ou None se a tabela não é versionada
+            (sem a linha criada pela migração, junto com os gatilhos)
+        """
+        return db.execute(
+            select(TableVersion.version).where(TableVersion.table_name == table_name)
+        ).scalar()
@@ -0,0 +1,83 @@
+"""
+repositório para interagir com a tabela 'user_claims'
+
+este repositório concentra as consultas de autorização: as claims ativas de
+um usuário e a concessão ou revogação de claims
+"""
+
+from sqlalchemy import select, delete
+from sqlalchemy.orm import Session
+from ..models.user_model import User
+from ..models.claim_model import Claim
+from ..models.user_claim_model import UserClaim
+from .dialect import insert_for
+
+class UserClaimRepository:
+    """
+    repositório para a tabela 'user_claims'
+    """
+
+    @staticmethod
+    def get_active_claim_ids(db: Session, user_id: int) -> list[int] | None:
+        """
+        retorna os ids das claims ativas de um usuário com uma única consulta
+
+        o LEFT JOIN a partir de 'users' distingue um usuário sem claims
+        (lista vazia) de um usuário inexistente (None)
+
+        :param db: sessão ativa do banco de dados
+        :param user_id: id do usuário
+        :return: ids das claims ativas, ou None se o usuário não existir
+        """
+        statement = (
+            select(User.id, Claim.id)
+            .select_from(User)
+            .outerjoin(UserClaim, UserClaim.user_id == User.id)
+            .outerjoin(Claim, (Claim.id == UserClaim.claim_id) & Claim.active.is_(True))
+            .where(User.id == user_id)
+        )
+        rows = db.execute(statement).all()
+        if not rows:
+            return None
+        return [claim_id for _, claim_id in rows if claim_id is not None]
+
+    @staticmethod
+    def grant_claim(db: Session, user_id: int, claim_id: int) -> None:
+        """
+        concede uma claim a um usuário; conceder uma claim já concedida não tem efeito
+
+        :param db: sessão ativa do banco de dados
+        :param user_id: id do usuário
+        :param claim_id: id da claim
+        :raises IntegrityError: se o usuário ou a claim não existirem
+        """
+        statement = (
+            insert_for(db.get_bind().dialect.name, UserClaim)
+            .values(user_id=user_id, claim_id=claim_id)
+            .on_conflict_do_nothing()
+        )
+        try:
+            db.execute(statement)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    @staticmethod
+    def revoke_claim(db: Session, user_id: int, claim_id: int) -> bool:
+        """
+        revoga uma claim de um usuário
+
+        :param db: sessão ativa do banco de dados
+        :param user_id: id do usuário
+        :param claim_id: id da claim
+        :return: True se a claim estava concedida e foi removida
+        """
+        statement = delete(UserClaim).where(UserClaim.user_id == user_id, UserClaim.claim_id == claim_id)
+        try:
+            result = db.execute(statement)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return result.rowcount > 0
@@ -7,10 +7,29 @@ interagir com o banco de dados relacional e realizar operações de
 leitura e escrita no banco
 """
 
-from sqlalchemy.orm import Session
+from typing import Iterator
+from sqlalchemy import select, func, literal_column, update
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.engine import Row
 from ..models.user_model import User
 from ..models.claim_model import Claim
 from ..models.role_model import Role
+from ..models.user_claim_model import UserClaim
+from .dialect import insert_for
+
+def _json_object(**columns):
+    """
+    monta um json_build_object do postgres com chaves literais
+
+    as chaves são renderizadas como literais sql (e não como parâmetros),
+    pois o postgres não consegue inferir o tipo de parâmetros em funções variádicas
+    """
+    arguments = []
+    for key, column in columns.items():
+        arguments.extend([literal_column(f"'{key}'"), column])
+    return func.json_build_object(*arguments)
+
 
 class UserRepository:
     """
@@ -40,7 +59,102 @@ class UserRepository:
         db.commit()
         db.refresh(user)
         return user
+
+    def insert_user(self, db: Session, values: dict) -> Row | None:
+        """
+        insere um usuário com um único INSERT ... ON CONFLICT DO NOTHING RETURNING
+
+        o conflito de e-mail (em ix_users_email_lower, sem diferenciar
+        maiúsculas) não gera erro: nenhuma linha é retornada. uma
+        role inexistente viola a chave estrangeira e levanta IntegrityError
+
+        :param db: sessão ativa do banco de dados
+        :param values: valores das colunas do novo usuário
+        :return: linha com id, name e email, ou None se o e-mail já existir
+        """
+        statement = (
+            insert_for(db.get_bind().dialect.name, User)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+            .returning(User.id, User.name, User.email)
+        )
+        try:
+            row = db.execute(statement).first()
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return row
     
+    def insert_users(self, db: Session, rows: list[dict]) -> list[Row]:
+        """
+        insere vários usuários com um INSERT de múltiplas linhas por lote
+
+        o sqlalchemy agrupa as linhas em INSERT ... VALUES (...), (...)
+        ('insertmanyvalues'), mantendo o RETURNING. e-mails que já existirem
+        no momento do insert são ignorados pelo ON CONFLICT DO NOTHING
+
+        :param db: sessão ativa do banco de dados
+        :param rows: valores das colunas de cada usuário
+        :return: linhas com id, name e email dos usuários efetivamente criados
+        """
+        if not rows:
+            return []
+        statement = (
+            insert_for(db.get_bind().dialect.name, User)
+            .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+            .returning(User.id, User.name, User.email)
+        )
+        try:
+            created = db.execute(statement, rows).all()
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return created
+
+    def update_password_hash(self, db: Session, user_id: int, old_hash: str, new_hash: str) -> bool:
+        """
+        troca o hash da senha apenas se o hash gravado ainda for 'old_hash'
+
+        a condição evita sobrescrever uma senha alterada entre a leitura do
+        usuário e a gravação do novo hash
+
+        :param db: sessão ativa do banco de dados
+        :param user_id: id do usuário
+        :param old_hash: hash lido junto com o usuário
+        :param new_hash: hash a ser gravado
+        :return: True se o hash foi atualizado
+        """
+        statement = (
+            update(User)
+            .where(User.id == user_id, User.password == old_hash)
+            .values(password=new_hash)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            updated = db.execute(statement).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return updated == 1
+
+    def get_existing_emails(self, db: Session, emails: list[str]) -> set[str]:
+        """
+        verifica, com uma única consulta, quais e-mails já estão cadastrados
+
+        a comparação não diferencia maiúsculas e usa o índice ix_users_email_lower
+
+        :param db: sessão ativa do banco de dados
+        :param emails: e-mails a serem verificados
+        :return: e-mails já cadastrados, em minúsculas
+        """
+        if not emails:
+            return set()
+        lowered = func.lower(User.email)
+        return set(db.scalars(select(lowered).where(lowered.in_({email.lower() for email in emails}))))
+
     def get_all_users(self):
         """
         recupera todos os usuários cadastrados
@@ -49,15 +163,70 @@ class UserRepository:
         """
         return self.db.query(User).all()
     
+    def get_users_page(self, after_id: int | None, limit: int) -> list[Row]:
+        """
+        recupera uma página de usuários usando paginação por chave (keyset)
+
+        ao contrário de 'get_all_users', apenas as colunas públicas são lidas
+        (sem o hash da senha) e o custo não cresce com a posição da página,
+        pois a consulta usa 'id > cursor' sobre a chave primária
+
+        :param after_id: id do último usuário da página anterior, ou None para a primeira
+        :param limit: quantidade máxima de usuários retornados
+        :return: linhas com id, name e email, ordenadas por id
+        """
+        statement = select(User.id, User.name, User.email).order_by(User.id).limit(limit)
+        if after_id is not None:
+            statement = statement.where(User.id > after_id)
+        return self.db.execute(statement).all()
+
+    def stream_users(self, after_id: int | None, batch_size: int) -> Iterator[list[Row]]:
+        """
+        percorre os usuários em lotes usando um cursor do lado do servidor
+
+        com 'yield_per' o driver usa 'stream_results', então apenas um lote
+        fica em memória por vez, independentemente do tamanho da tabela
+
+        :param after_id: id a partir do qual a leitura começa, ou None para o início
+        :param batch_size: quantidade de linhas buscadas por vez
+        :return: iterador de lotes de linhas com id, name e email
+        """
+        statement = select(User.id, User.name, User.email).order_by(User.id)
+        if after_id is not None:
+            statement = statement.where(User.id > after_id)
+        result = self.db.execute(statement.execution_options(yield_per=batch_size))
+        yield from result.partitions()
+
+    def count_users(self) -> int:
+        """
+        conta os usuários cadastrados
+
+        :return: quantidade de usuários
+        """
+        return self.db.scalar(select(func.count()).select_from(User))
+
+    def stream_emails(self, batch_size: int) -> Iterator[list[str]]:
+        """
+        percorre os e-mails cadastrados, em minúsculas, com um cursor do lado do servidor
+
+        :param batch_size: quantidade de e-mails buscados por vez
+        :return: iterador de lotes de e-mails
+        """
+        statement = select(func.lower(User.email)).execution_options(yield_per=batch_size)
+        for batch in self.db.execute(statement).scalars().partitions():
+            yield list(batch)
+
     def get_user_by_email(self, db: Session, email: str) -> User:
         """
-        recupera um usuário específico pelo email
+        recupera um usuário específico pelo email, sem diferenciar maiúsculas
+
+        a comparação usa lower(email), coberta pelo índice único ix_users_email_lower
 
         :param db: sessão ativa do banco de dados
         :param email: email do usuário a ser recuperado
         :return: usuário encontrado ou None se não encontrado
         """
-        return db.query(User).filter(User.email == email).first()
+        return db.query(User).filter(func.lower(User.email) == email.lower()).first()
 
     def get_users_with_role_and_claims(self):
         """
@@ -72,3 +241,79 @@ class UserRepository:
             .join(Claim)
             .all()
         )
+
+    def get_users_with_role_and_claims_page(self, after_id: int | None, limit: int) -> list[dict]:
+        """
+        recupera uma página de usuários, cada um com a sua role e a lista de claims
+
+        no postgres o agrupamento é feito no próprio banco com json_agg, de
+        modo que cada usuário gera uma única linha; usuários sem claims são
+        mantidos (left join) com uma lista vazia. nos demais dialetos as
+        relações são carregadas com joinedload/selectinload
+
+        :param after_id: id do último usuário da página anterior, ou None para a primeira
+        :param limit: quantidade máxima de usuários retornados
+        :return: lista de dicionários com id, name, email, role e claims, ordenada por id
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            rows = self.db.execute(self._nested_users_statement(after_id, limit)).mappings()
+            return [dict(row) for row in rows]
+
+        statement = (
+            select(User)
+            .options(joinedload(User.role), selectinload(User.claims))
+            .order_by(User.id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            statement = statement.where(User.id > after_id)
+        return [
+            {
+                "id": user.id,
+                "name": user.name,
+                "email": user.email,
+                "role": {"id": user.role.id, "description": user.role.description},
+                "claims": [
+                    {"id": claim.id, "description": claim.description, "active": claim.active}
+                    for claim in sorted(user.claims, key=lambda claim: claim.id)
+                ],
+            }
+            for user in self.db.scalars(statement)
+        ]
+
+    @staticmethod
+    def _nested_users_statement(after_id: int | None, limit: int):
+        """
+        monta a consulta agregada (json_agg) usada no postgres
+
+        a página de usuários é recortada antes dos joins com as claims, então
+        o LIMIT se aplica a usuários e não a linhas do produto cartesiano
+
+        :param after_id: id do último usuário da página anterior, ou None para a primeira
+        :param limit: quantidade máxima de usuários retornados
+        :return: instrução select com as colunas id, name, email, role e claims
+        """
+        page = select(User.id, User.name, User.email, User.role_id).order_by(User.id).limit(limit)
+        if after_id is not None:
+            page = page.where(User.id > after_id)
+        page = page.subquery("page")
+
+        claim_object = _json_object(id=Claim.id, description=Claim.description, active=Claim.active)
+        claims = func.coalesce(
+            func.json_agg(aggregate_order_by(claim_object, Claim.id)).filter(Claim.id.isnot(None)),
+            literal_column("'[]'::json"),
+        )
+        return (
+            select(
+                page.c.id,
+                page.c.name,
+                page.c.email,
+                _json_object(id=Role.id, description=Role.description).label("role"),
+                claims.label("claims"),
+            )
+            .join(Role, Role.id == page.c.role_id)
+            .outerjoin(UserClaim, UserClaim.user_id == page.c.id)
+            .outerjoin(Claim, Claim.id == UserClaim.claim_id)
+            .group_by(page.c.id, page.c.name, page.c.email, Role.id, Role.description)
+            .order_by(page.c.id)
+        )
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field, ConfigDict
+
+class ClaimResponse(BaseModel):
+    id: int = Field(..., json_schema_extra={"title": "ID da Claim", "example": 1})
+    description: str = Field(..., json_schema_extra={"title": "Descrição da Claim", "example": "Visualizar Relatórios"})
+    active: bool = Field(..., json_schema_extra={"title": "Claim Ativa", "example": True})
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "id": 1,
+                "description": "Visualizar Relatórios",
+                "active": True
+            }
+        }
+    )
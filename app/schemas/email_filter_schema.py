@@ -0,0 +1,12 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class EmailFilterStatsResponse(BaseModel):
+    ready: bool = Field(..., title="Filtro Carregado")
+    capacity: Optional[int] = Field(None, title="Capacidade")
+    count: Optional[int] = Field(None, title="E-mails Registrados")
+    bits: Optional[int] = Field(None, title="Tamanho em Bits")
+    hashes: Optional[int] = Field(None, title="Funções de Hash")
+    memory_bytes: Optional[int] = Field(None, title="Memória Usada (bytes)")
+    false_positive_rate: float = Field(..., title="Taxa de Falsos Positivos Configurada")
+    estimated_false_positive_rate: Optional[float] = Field(None, title="Taxa de Falsos Positivos Estimada")
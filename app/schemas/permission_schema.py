@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field, ConfigDict
+
+class PermissionsResponse(BaseModel):
+    user_id: int = Field(..., title="ID do Usuário")
+    claims: list[int] = Field(..., title="IDs das Claims Ativas do Usuário")
+    checks: dict[int, bool] = Field(..., title="Resultado de Cada Claim Verificada")
+    has_all: bool = Field(..., title="Usuário Possui Todas as Claims Verificadas")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "user_id": 1,
+                "claims": [1, 2],
+                "checks": {"1": True, "3": False},
+                "has_all": False
+            }
+        }
+    )
@@ -0,0 +1,17 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class PoolStatsResponse(BaseModel):
+    pool_class: str = Field(..., title="Classe do Pool")
+    size: Optional[int] = Field(None, title="Tamanho Fixo do Pool")
+    checked_out: Optional[int] = Field(None, title="Conexões em Uso")
+    idle: Optional[int] = Field(None, title="Conexões Ociosas")
+    overflow: Optional[int] = Field(None, title="Conexões de Overflow Abertas")
+    max_overflow: Optional[int] = Field(None, title="Limite de Overflow")
+    connects: int = Field(..., title="Conexões Abertas desde o Início")
+    checkouts: int = Field(..., title="Total de Checkouts")
+    checkins: int = Field(..., title="Total de Checkins")
+    timeouts: int = Field(..., title="Esperas Encerradas por Timeout")
+    waits: int = Field(..., title="Esperas Medidas")
+    wait_avg_ms: float = Field(..., title="Espera Média (ms)")
+    wait_max_ms: float = Field(..., title="Espera Máxima (ms)")
@@ -1,5 +1,7 @@
 from typing import Optional
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from .role_schema import RoleResponse
+from .claim_schema import ClaimResponse
 
 class UserCreate(BaseModel):
     name: str = Field(..., title="Nome do Usuário", max_length=100)
@@ -32,3 +34,66 @@ class UserResponse(BaseModel):
             }
         }
     }
+
+class BulkUserResult(BaseModel):
+    index: int = Field(..., title="Posição do Item na Requisição")
+    status_code: int = Field(..., title="Status HTTP Equivalente do Item")
+    user: Optional[UserResponse] = Field(None, title="Usuário Criado")
+    detail: Optional[str] = Field(None, title="Motivo da Falha")
+
+class BulkUserResponse(BaseModel):
+    created: int = Field(..., title="Quantidade de Usuários Criados")
+    failed: int = Field(..., title="Quantidade de Itens com Falha")
+    results: list[BulkUserResult] = Field(..., title="Resultado de Cada Item, na Ordem Recebida")
+
+    model_config: ConfigDict = {
+        "json_schema_extra": {
+            "example": {
+                "created": 1,
+                "failed": 1,
+                "results": [
+                    {"index": 0, "status_code": 200, "user": {"id": 1, "name": "Carlos Santos", "email": "carlos.santos@example.com"}, "detail": None},
+                    {"index": 1, "status_code": 404, "user": None, "detail": "role not found"}
+                ]
+            }
+        }
+    }
+
+class UserPage(BaseModel):
+    items: list[UserResponse] = Field(..., title="Usuários da Página")
+    next_cursor: Optional[int] = Field(None, title="Cursor da Próxima Página (ausente na última)")
+
+    model_config: ConfigDict = {
+        "json_schema_extra": {
+            "example": {
+                "items": [{"id": 1, "name": "Carlos Santos", "email": "carlos.santos@example.com"}],
+                "next_cursor": 1
+            }
+        }
+    }
+
+class UserDetailResponse(BaseModel):
+    id: int = Field(..., title="ID do Usuário")
+    name: str = Field(..., title="Nome do Usuário")
+    email: EmailStr = Field(..., title="E-mail do Usuário")
+    role: RoleResponse = Field(..., title="Papel (Role) do Usuário")
+    claims: list[ClaimResponse] = Field(..., title="Claims do Usuário")
+
+class UserDetailPage(BaseModel):
+    items: list[UserDetailResponse] = Field(..., title="Usuários da Página")
+    next_cursor: Optional[int] = Field(None, title="Cursor da Próxima Página (ausente na última)")
+
+    model_config: ConfigDict = {
+        "json_schema_extra": {
+            "example": {
+                "items": [{
+                    "id": 1,
+                    "name": "Carlos Santos",
+                    "email": "carlos.santos@example.com",
+                    "role": {"id": 1, "description": "Administrador"},
+                    "claims": [{"id": 1, "description": "Visualizar Relatórios", "active": True}]
+                }],
+                "next_cursor": 1
+            }
+        }
+    }
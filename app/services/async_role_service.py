@@ -0,0 +1,38 @@
+"""
+serviço assíncrono para gerenciar as operações relacionadas aos papéis (roles)
+
+equivalente ao RoleService, usado quando a aplicação roda no modo assíncrono
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from ..repositories.async_role_repository import AsyncRoleRepository
+from ..cache import role_cache
+from ..config import settings
+
+class AsyncRoleService:
+    """
+    serviço assíncrono para gerenciar os papéis (roles) no sistema
+    """
+
+    @staticmethod
+    async def get_role_by_id(db: AsyncSession, role_id: int):
+        """
+        obtém um papel (role) pelo id fornecido
+
+        :param db: sessão assíncrona do banco de dados para realizar a consulta
+        :param role_id: o id do papel a ser buscado
+        :return: o papel encontrado, caso exista
+        :raises HTTPException: levanta um erro 404 caso o papel não seja encontrado
+        """
+        if settings.ROLE_CACHE_ENABLED:
+            role = await role_cache.get_role_by_id_async(
+                role_id, lambda: AsyncRoleRepository.get_role_by_id(db, role_id)
+            )
+        else:
+            role = await role_cache.fetch_role_by_id_async(
+                role_id, lambda: AsyncRoleRepository.get_role_by_id(db, role_id)
+            )
+        if not role:
+            raise HTTPException(status_code=404, detail="role not found")
+        return role
@@ -0,0 +1,72 @@
+"""
+serviço assíncrono para gerenciar as operações relacionadas aos usuários
+
+equivalente ao UserService, usado quando a aplicação roda no modo assíncrono.
+a geração de senha e o hash reaproveitam a implementação síncrona
+"""
+
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..cache.email_filter import email_filter
+from ..config import settings
+from ..models.user_model import User
+from ..repositories.async_user_repository import AsyncUserRepository
+from ..schemas.user_schema import UserCreate
+from .user_insert_batcher import user_insert_batcher
+from .user_service import UserService, email_lookups
+
+class AsyncUserService:
+    """
+    serviço assíncrono para gerenciar os usuários do sistema
+    """
+
+    @staticmethod
+    async def create_user(db: AsyncSession, user_data: UserCreate) -> Row:
+        """
+        cria um novo usuário com uma única instrução no banco de dados
+
+        o hash roda no pool de processos antes de qualquer acesso ao banco e
+        o usuário é criado com INSERT ... ON CONFLICT DO NOTHING RETURNING.
+        com USER_INSERT_BATCHING, o INSERT é feito junto com o das criações
+        simultâneas pelo user_insert_batcher, que usa as próprias sessões
+
+        :param db: sessão assíncrona do banco de dados para realizar a operação
+        :param user_data: os dados do usuário a ser criado
+        :return: linha com id, name e email do usuário criado
+        :raises HTTPException: 400 se o e-mail já estiver registrado, 404 se a role não existir
+        """
+        password = user_data.password or UserService.generate_random_password()
+
+        if user_data.password:
+            password = await UserService.hash_password_async(password)
+
+        values = UserService._user_values(user_data, password)
+
+        if settings.USER_INSERT_BATCHING:
+            row = await user_insert_batcher.insert(values)
+        else:
+            try:
+                row = await AsyncUserRepository(db).insert_user(db, values)
+            except IntegrityError as error:
+                UserService._raise_for_integrity_error(error)
+        UserService._check_inserted(row)
+        email_filter.add(values["email"])
+        return row
+
+    @staticmethod
+    async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
+        """
+        busca um usuário pelo e-mail
+
+        :param db: sessão assíncrona do banco de dados para realizar a consulta
+        :param email: o e-mail do usuário a ser buscado
+        :return: o usuário encontrado ou None se não encontrado
+        """
+        # o merge sem carga não faz i/o, então pode usar a sessão síncrona interna
+        return await email_lookups.do_async(
+            email.lower(),
+            lambda: AsyncUserRepository(db).get_user_by_email(db, email),
+            share=UserService._user_state,
+            adopt=lambda values: UserService._adopt_user(db.sync_session, values),
+        )
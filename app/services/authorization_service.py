@@ -0,0 +1,119 @@
+"""
+serviço de autorização baseado nas claims dos usuários
+
+as claims ativas de cada usuário são compiladas em um bitset e mantidas no
+cache de claims, de modo que as verificações de 'has_claim' e
+'has_all_claims' em um acerto não tocam o banco de dados
+"""
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..cache import claim_cache
+from ..repositories.user_claim_repository import UserClaimRepository
+from .user_service import is_foreign_key_violation
+
+class AuthorizationService:
+    """
+    serviço para verificar, conceder e revogar claims de usuários
+    """
+
+    @staticmethod
+    def get_claim_bits(db: Session, user_id: int) -> int | None:
+        """
+        obtém o bitset das claims ativas de um usuário
+
+        :param db: sessão do banco de dados, usada apenas em caso de falta no cache
+        :param user_id: id do usuário
+        :return: o bitset de claims, ou None se o usuário não existir
+        """
+        return claim_cache.get_claim_bits(user_id, lambda: AuthorizationService._load_bits(db, user_id))
+
+    @staticmethod
+    def has_claim(db: Session, user_id: int, claim_id: int) -> bool:
+        """
+        verifica se o usuário possui uma claim ativa
+
+        :param db: sessão do banco de dados
+        :param user_id: id do usuário
+        :param claim_id: id da claim
+        :return: True se o usuário existir e possuir a claim
+        """
+        bits = AuthorizationService.get_claim_bits(db, user_id)
+        return bits is not None and claim_cache.has_bit(bits, claim_id)
+
+    @staticmethod
+    def has_all_claims(db: Session, user_id: int, claim_ids: list[int]) -> bool:
+        """
+        verifica se o usuário possui todas as claims informadas
+
+        :param db: sessão do banco de dados
+        :param user_id: id do usuário
+        :param claim_ids: ids das claims exigidas
+        :return: True se o usuário existir e possuir todas as claims
+        """
+        bits = AuthorizationService.get_claim_bits(db, user_id)
+        if bits is None:
+            return False
+        return all(claim_cache.has_bit(bits, claim_id) for claim_id in claim_ids)
+
+    @staticmethod
+    def get_permissions(db: Session, user_id: int, claim_ids: list[int]) -> dict:
+        """
+        verifica um lote de claims de um usuário de uma só vez
+
+        :param db: sessão do banco de dados
+        :param user_id: id do usuário
+        :param claim_ids: ids das claims a verificar
+        :return: dicionário com as claims do usuário, o resultado de cada verificação
+            e se todas as claims verificadas foram concedidas
+        :raises HTTPException: 404 se o usuário não existir
+        """
+        bits = AuthorizationService.get_claim_bits(db, user_id)
+        if bits is None:
+            raise HTTPException(status_code=404, detail="user not found")
+        checks = {claim_id: claim_cache.has_bit(bits, claim_id) for claim_id in claim_ids}
+        return {
+            "user_id": user_id,
+            "claims": claim_cache.from_bits(bits),
+            "checks": checks,
+            "has_all": all(checks.values()),
+        }
+
+    @staticmethod
+    def grant_claim(db: Session, user_id: int, claim_id: int) -> None:
+        """
+        concede uma claim a um usuário e descarta o bitset em cache
+
+        :param db: sessão do banco de dados
+        :param user_id: id do usuário
+        :param claim_id: id da claim
+        :raises HTTPException: 404 se o usuário ou a claim não existirem
+        """
+        try:
+            UserClaimRepository.grant_claim(db, user_id, claim_id)
+        except IntegrityError as error:
+            if is_foreign_key_violation(error):
+                raise HTTPException(status_code=404, detail="user or claim not found")
+            raise
+        claim_cache.claim_cache.invalidate(user_id)
+
+    @staticmethod
+    def revoke_claim(db: Session, user_id: int, claim_id: int) -> None:
+        """
+        revoga uma claim de um usuário e descarta o bitset em cache
+
+        :param db: sessão do banco de dados
+        :param user_id: id do usuário
+        :param claim_id: id da claim
+        :raises HTTPException: 404 se a claim não estiver concedida ao usuário
+        """
+        revoked = UserClaimRepository.revoke_claim(db, user_id, claim_id)
+        claim_cache.claim_cache.invalidate(user_id)
+        if not revoked:
+            raise HTTPException(status_code=404, detail="claim not granted")
+
+    @staticmethod
+    def _load_bits(db: Session, user_id: int) -> int | None:
+        claim_ids = UserClaimRepository.get_active_claim_ids(db, user_id)
+        return None if claim_ids is None else claim_cache.to_bits(claim_ids)
@@ -0,0 +1,23 @@
+"""
+serviço para gerenciar as operações relacionadas às claims no sistema
+
+este serviço fornece métodos para consultar o catálogo de claims
+"""
+
+from sqlalchemy.orm import Session
+from ..repositories.claim_repository import ClaimRepository
+
+class ClaimService:
+    """
+    serviço para gerenciar as claims do sistema
+    """
+
+    @staticmethod
+    def get_all_claims(db: Session):
+        """
+        obtém todas as claims cadastradas
+
+        :param db: sessão do banco de dados para realizar a consulta
+        :return: lista de claims
+        """
+        return ClaimRepository(db).get_all_claims()
@@ -0,0 +1,141 @@
+"""
+executor dedicado para o hash de senhas
+
+o bcrypt consome centenas de milissegundos de cpu por chamada. este módulo
+mantém um pool de processos, dimensionado pelo número de núcleos, para que
+o hash não ocupe as threads do servidor nem as conexões do banco de dados.
+os processos devolvem, junto com cada hash, o tempo gasto nele, que é
+registrado nas métricas do processo do servidor. o custo do bcrypt é
+calibrado no processo do servidor e repassado aos processos do pool na
+inicialização, para que todos usem o mesmo número de rounds
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from ..config import settings
+from ..metrics.instruments import observe_password_hash
+from . import password_hashing
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _hash_in_worker(password: str) -> tuple[str, float]:
+    """
+    função executada dentro dos processos do pool
+
+    :param password: a senha a ser hashada
+    :return: o hash gerado para a senha e a duração do hash em segundos
+    """
+    from .user_service import UserService
+
+    start = time.perf_counter()
+    hashed = UserService.hash_password(password)
+    return hashed, time.perf_counter() - start
+
+
+def _verify_in_worker(password: str, hashed: str) -> tuple[bool, str | None]:
+    """
+    confere uma senha dentro de um processo do pool
+
+    :param password: a senha informada
+    :param hashed: o hash gravado
+    :return: se a senha confere e, quando o hash estiver desatualizado, o novo hash
+    """
+    return password_hashing.verify_and_update(password, hashed)
+
+
+def _hash_many_in_worker(passwords: list[str]) -> list[tuple[str, float]]:
+    """
+    gera o hash de um lote de senhas dentro de um processo do pool
+
+    :param passwords: senhas a serem hashadas
+    :return: os hashes e as durações, na mesma ordem das senhas
+    """
+    return [_hash_in_worker(password) for password in passwords]
+
+
+def get_hashing_executor() -> ProcessPoolExecutor:
+    """
+    retorna o pool de processos de hash, criando-o na primeira chamada
+
+    o contexto 'spawn' é usado porque o processo do servidor possui threads
+    ativas, o que torna o 'fork' inseguro
+
+    :return: o executor compartilhado
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=max(1, settings.HASH_POOL_WORKERS),
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=password_hashing.configure_policy,
+                    initargs=(password_hashing.get_policy(),),
+                )
+    return _executor
+
+
+async def hash_password_in_pool(password: str) -> str:
+    """
+    gera o hash de uma senha no pool de processos sem bloquear o event loop
+
+    :param password: a senha a ser hashada
+    :return: o hash gerado para a senha
+    """
+    loop = asyncio.get_running_loop()
+    hashed, seconds = await loop.run_in_executor(get_hashing_executor(), _hash_in_worker, password)
+    observe_password_hash(seconds)
+    return hashed
+
+
+async def verify_password_in_pool(password: str, hashed: str) -> tuple[bool, str | None]:
+    """
+    confere uma senha no pool de processos sem bloquear o event loop
+
+    :param password: a senha informada
+    :param hashed: o hash gravado
+    :return: se a senha confere e, quando o hash estiver desatualizado, o novo hash
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_hashing_executor(), _verify_in_worker, password, hashed)
+
+
+async def hash_passwords_in_pool(passwords: list[str]) -> list[str]:
+    """
+    gera o hash de várias senhas em paralelo, usando todos os processos do pool
+
+    as senhas são enviadas em lotes de HASH_BATCH_SIZE para reduzir o custo
+    de comunicação entre processos
+
+    :param passwords: senhas a serem hashadas
+    :return: os hashes, na mesma ordem das senhas
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_hashing_executor()
+    batch_size = max(1, settings.HASH_BATCH_SIZE)
+    batches = [passwords[i:i + batch_size] for i in range(0, len(passwords), batch_size)]
+    results = await asyncio.gather(
+        *(loop.run_in_executor(executor, _hash_many_in_worker, batch) for batch in batches)
+    )
+    hashes = []
+    for batch in results:
+        for hashed, seconds in batch:
+            observe_password_hash(seconds)
+            hashes.append(hashed)
+    return hashes
+
+
+def shutdown_hashing_executor() -> None:
+    """
+    encerra o pool de processos, se ele tiver sido criado
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
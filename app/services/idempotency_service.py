@@ -0,0 +1,166 @@
+"""
+serviço para as requisições repetidas com o cabeçalho Idempotency-Key
+
+a primeira requisição com uma chave a reserva, executa o trabalho e grava a
+resposta (inclusive os erros 4xx, que são determinísticos). as repetições
+recebem a resposta gravada sem refazer o hash nem as consultas do trabalho.
+uma repetição que chega com a primeira ainda em andamento espera por ela,
+consultando a chave com intervalos crescentes, em vez de executar em paralelo
+
+a chave vale por rota e por IDEMPOTENCY_TTL segundos. reutilizá-la com dados
+diferentes é um erro do cliente (422). os campos sensíveis, como a senha,
+entram na impressão digital apenas como HMAC com IDEMPOTENCY_SECRET, para que
+o banco não guarde um hash rápido deles que possa ser testado por força bruta
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..repositories.idempotency_repository import IdempotencyRepository
+
+logger = logging.getLogger(__name__)
+
+_POLL_FIRST_DELAY = 0.02
+_POLL_MAX_DELAY = 0.5
+
+if settings.IDEMPOTENCY_SECRET is None:
+    logger.warning("IDEMPOTENCY_SECRET não definida; usando uma chave sorteada para este processo")
+_SECRET = (settings.IDEMPOTENCY_SECRET or secrets.token_hex(32)).encode()
+
+
+class IdempotencyService:
+    """
+    serviço que executa um trabalho no máximo uma vez por chave de idempotência
+    """
+
+    @staticmethod
+    def request_hash(data: dict, sensitive: dict[str, str | None] | None = None) -> str:
+        """
+        calcula a impressão digital dos dados da requisição
+
+        :param data: dados da requisição, já sem campos sensíveis
+        :param sensitive: campos sensíveis, incluídos apenas como HMAC com IDEMPOTENCY_SECRET
+        :return: sha-256 em hexadecimal do json canônico
+        """
+        data = dict(data)
+        for name, value in (sensitive or {}).items():
+            data[name] = None if value is None else hmac.new(_SECRET, value.encode(), hashlib.sha256).hexdigest()
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @staticmethod
+    async def run(
+        db: Session, route: str, key: str, request_hash: str, work: Callable[[], Awaitable[dict]]
+    ) -> tuple[dict, bool]:
+        """
+        executa 'work' uma única vez para a chave, ou devolve a resposta já gravada
+
+        :param db: sessão do banco de dados
+        :param route: rota da requisição, por exemplo 'POST /users/'
+        :param key: valor do cabeçalho Idempotency-Key
+        :param request_hash: impressão digital dos dados ('request_hash')
+        :param work: corrotina que faz o trabalho e devolve o corpo json da resposta 200
+        :return: o corpo da resposta e se ele é uma repetição da resposta gravada
+        :raises HTTPException:
+            - o erro 4xx gravado pela primeira requisição, ou levantado por 'work'
+            - 422 se a chave já foi usada com outros dados
+            - 409 com Retry-After se a primeira requisição não terminar em IDEMPOTENCY_WAIT_TIMEOUT
+        """
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+        delay = _POLL_FIRST_DELAY
+        while (token := await run_in_threadpool(IdempotencyService._claim, db, route, key, request_hash)) is None:
+            stored = await run_in_threadpool(IdempotencyRepository.get, db, route, key)
+            if stored is None:
+                # a primeira requisição falhou e liberou a chave: tenta reservá-la de novo
+                continue
+            if stored.request_hash != request_hash:
+                raise HTTPException(status_code=422, detail="idempotency key already used with a different request")
+            if stored.status_code is not None:
+                return IdempotencyService._replay(stored.status_code, stored.response_body), True
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=409,
+                    detail="a request with this idempotency key is still in progress",
+                    headers={"Retry-After": str(max(1, round(settings.IDEMPOTENCY_WAIT_TIMEOUT)))},
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _POLL_MAX_DELAY)
+
+        try:
+            body = await work()
+        except HTTPException as error:
+            if error.status_code >= 500:
+                await run_in_threadpool(IdempotencyRepository.release, db, route, key, token)
+            else:
+                await run_in_threadpool(
+                    IdempotencyService._complete, db, route, key, token, error.status_code, {"detail": error.detail}
+                )
+            raise
+        except BaseException:
+            await asyncio.shield(run_in_threadpool(IdempotencyRepository.release, db, route, key, token))
+            raise
+        await run_in_threadpool(IdempotencyService._complete, db, route, key, token, 200, body)
+        return body, False
+
+    @staticmethod
+    def _claim(db: Session, route: str, key: str, request_hash: str) -> str | None:
+        now = datetime.now(timezone.utc)
+        return IdempotencyRepository.claim(
+            db, route, key, request_hash,
+            now=now,
+            locked_until=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT),
+            expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_TTL),
+        )
+
+    @staticmethod
+    def _complete(db: Session, route: str, key: str, token: str, status_code: int, body: dict) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.IDEMPOTENCY_TTL)
+        stored = IdempotencyRepository.complete(
+            db, route, key, token, status_code, json.dumps(body, ensure_ascii=False), expires_at
+        )
+        if not stored:
+            # o prazo acabou e uma repetição assumiu a chave: a resposta dela é a que vale
+            logger.warning("chave de idempotência assumida por outra requisição antes da resposta: %s %s", route, key)
+
+    @staticmethod
+    def _replay(status_code: int, response_body: str) -> dict:
+        body = json.loads(response_body)
+        if status_code >= 400:
+            raise HTTPException(status_code=status_code, detail=body.get("detail"))
+        return body
+
+    @staticmethod
+    def purge_expired(session_factory: Callable[[], Session]) -> int:
+        """
+        apaga as chaves vencidas
+
+        :param session_factory: fábrica de sessões do banco de dados
+        :return: quantidade de chaves apagadas
+        """
+        with session_factory() as db:
+            return IdempotencyRepository.delete_expired(db, datetime.now(timezone.utc))
+
+    @staticmethod
+    async def purge_expired_periodically(session_factory: Callable[[], Session], interval: float) -> None:
+        """
+        apaga as chaves vencidas a cada 'interval' segundos, até ser cancelada
+
+        :param session_factory: fábrica de sessões do banco de dados
+        :param interval: intervalo entre as limpezas, em segundos
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(IdempotencyService.purge_expired, session_factory)
+            except Exception:
+                logger.exception("falha ao apagar as chaves de idempotência vencidas")
@@ -0,0 +1,139 @@
+"""
+custo do hash de senhas calibrado para o hardware
+
+o custo do bcrypt dobra a cada round. em vez do padrão fixo do passlib, o
+número de rounds é escolhido na primeira vez em que é pedido (normalmente
+no startup): um hash de custo baixo é medido e extrapolado para o maior
+número de rounds que caiba em PASSWORD_HASH_TARGET_MS, nunca abaixo de
+BCRYPT_MIN_ROUNDS. BCRYPT_ROUNDS fixa o valor e dispensa a calibração
+
+hashes gravados com um custo fora de 'rounds ± BCRYPT_ROUNDS_TOLERANCE'
+são marcados como desatualizados (needs_update) e refeitos no próximo
+login bem-sucedido; a tolerância evita que pods com hardware um pouco
+diferente fiquem refazendo os hashes uns dos outros
+"""
+
+import functools
+import math
+import threading
+import time
+from ..config import settings
+
+_CALIBRATION_ROUNDS = 8
+_CALIBRATION_SAMPLES = 3
+
+_rounds: int | None = None
+_policy: tuple[int, int, int] | None = None
+_rounds_lock = threading.Lock()
+
+
+def calibrate_bcrypt_rounds(target_seconds: float, min_rounds: int, max_rounds: int) -> int:
+    """
+    escolhe o maior número de rounds cujo hash leva até 'target_seconds'
+
+    :param target_seconds: tempo desejado por hash neste hardware
+    :param min_rounds: piso de segurança, usado mesmo que ultrapasse o alvo
+    :param max_rounds: teto do custo
+    :return: o número de rounds escolhido
+    """
+    import bcrypt
+
+    salt = bcrypt.gensalt(_CALIBRATION_ROUNDS)
+    elapsed = []
+    for _ in range(_CALIBRATION_SAMPLES):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration-password", salt)
+        elapsed.append(time.perf_counter() - start)
+    per_hash = min(elapsed)
+    rounds = _CALIBRATION_ROUNDS + math.floor(math.log2(target_seconds / per_hash)) if target_seconds > 0 else min_rounds
+    return max(min_rounds, min(max_rounds, rounds))
+
+
+def configure_rounds(rounds: int) -> None:
+    """
+    define o custo usado pelos novos hashes deste processo
+
+    :param rounds: número de rounds do bcrypt
+    """
+    tolerance = max(0, settings.BCRYPT_ROUNDS_TOLERANCE)
+    configure_policy((rounds, max(settings.BCRYPT_MIN_ROUNDS, rounds - tolerance), rounds + tolerance))
+
+
+def configure_policy(policy: tuple[int, int, int]) -> None:
+    """
+    define o custo dos novos hashes e a faixa de custos aceita sem refazer o hash
+
+    usado também para repassar a política aos processos do pool de hash
+
+    :param policy: rounds dos novos hashes, menor e maior número de rounds aceitos
+    """
+    global _rounds, _policy
+    with _rounds_lock:
+        _rounds = policy[0]
+        _policy = policy
+        get_pwd_context.cache_clear()
+
+
+def get_policy() -> tuple[int, int, int]:
+    """
+    :return: rounds dos novos hashes, menor e maior número de rounds aceitos
+    """
+    if _policy is None:
+        configure_rounds(get_rounds())
+    return _policy
+
+
+def get_rounds() -> int:
+    """
+    retorna o custo dos novos hashes, calibrando-o na primeira chamada
+
+    :return: número de rounds do bcrypt
+    """
+    global _rounds
+    if _rounds is None:
+        with _rounds_lock:
+            if _rounds is None:
+                if settings.BCRYPT_ROUNDS:
+                    _rounds = max(settings.BCRYPT_MIN_ROUNDS, settings.BCRYPT_ROUNDS)
+                else:
+                    _rounds = calibrate_bcrypt_rounds(
+                        settings.PASSWORD_HASH_TARGET_MS / 1000, settings.BCRYPT_MIN_ROUNDS, settings.BCRYPT_MAX_ROUNDS
+                    )
+    return _rounds
+
+
+@functools.cache
+def get_pwd_context():
+    """
+    retorna o contexto do passlib, importando passlib e bcrypt só no primeiro uso
+
+    :return: o CryptContext configurado para bcrypt com o custo calibrado
+    """
+    from passlib.context import CryptContext
+
+    rounds, min_rounds, max_rounds = get_policy()
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=min_rounds,
+        bcrypt__max_rounds=max_rounds,
+    )
+
+
+def verify_and_update(password: str, hashed: str) -> tuple[bool, str | None]:
+    """
+    confere uma senha e indica o novo hash quando o gravado estiver desatualizado
+
+    usuários criados sem senha têm uma senha aleatória gravada sem hash, que
+    o passlib não reconhece; nesse caso a verificação apenas falha
+
+    :param password: a senha informada
+    :param hashed: o valor gravado em 'users.password'
+    :return: se a senha confere e, quando o hash estiver desatualizado, o novo hash
+    """
+    try:
+        return get_pwd_context().verify_and_update(password, hashed)
+    except ValueError:
+        # "hash could not be identified"
+        return False, None
@@ -8,6 +8,8 @@ como buscar um papel por seu id
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from ..repositories.role_repository import RoleRepository
+from ..cache import role_cache
+from ..config import settings
 
 class RoleService:
     """
@@ -22,7 +24,9 @@ class RoleService:
         """
         obtém um papel (role) pelo id fornecido
 
-        este método busca um papel no banco de dados usando o repositório de papéis
+        este método busca um papel no banco de dados usando o repositório de papéis,
+        passando antes pelo cache de papéis quando ROLE_CACHE_ENABLED está ativo.
+        buscas simultâneas pelo mesmo id compartilham uma única consulta
         se o papel não for encontrado, uma exceção http 404 é levantada
 
         :param db: sessão do banco de dados para realizar a consulta
@@ -34,7 +38,10 @@ class RoleService:
         - role_id: 1
         - retorna o papel com id 1, caso exista no banco de dados
         """
-        role = RoleRepository.get_role_by_id(db, role_id)
+        if settings.ROLE_CACHE_ENABLED:
+            role = role_cache.get_role_by_id(role_id, lambda: RoleRepository.get_role_by_id(db, role_id))
+        else:
+            role = role_cache.fetch_role_by_id(role_id, lambda: RoleRepository.get_role_by_id(db, role_id))
         if not role:
             raise HTTPException(status_code=404, detail="role not found")
         return role
@@ -0,0 +1,42 @@
+"""
+serviço para consultar as versões das tabelas de catálogo
+
+as versões são usadas para montar etags sem ler as linhas das tabelas
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..cache import table_version_cache
+from ..repositories.table_version_repository import TableVersionRepository
+from ..repositories.async_table_version_repository import AsyncTableVersionRepository
+
+class TableVersionService:
+    """
+    serviço para obter a versão atual de uma tabela versionada
+    """
+
+    @staticmethod
+    def get_version(db: Session, table_name: str) -> int | None:
+        """
+        obtém a versão de uma tabela, passando pelo cache de versões
+
+        :param db: sessão do banco de dados usada em caso de falta no cache
+        :param table_name: nome da tabela versionada
+        :return: o contador de alterações da tabela, ou None se ela não é versionada
+        """
+        return table_version_cache.get_version(
+            table_name, lambda: TableVersionRepository.get_version(db, table_name)
+        )
+
+    @staticmethod
+    async def get_version_async(db: AsyncSession, table_name: str) -> int | None:
+        """
+        equivalente assíncrono de 'get_version'
+
+        :param db: sessão assíncrona usada em caso de falta no cache
+        :param table_name: nome da tabela versionada
+        :return: o contador de alterações da tabela, ou None se ela não é versionada
+        """
+        return await table_version_cache.get_version_async(
+            table_name, lambda: AsyncTableVersionRepository.get_version(db, table_name)
+        )
@@ -0,0 +1,138 @@
+"""
+agrupamento das criações de usuário simultâneas em uma única transação
+
+no postgres, cada commit espera a gravação do wal em disco. com
+USER_INSERT_BATCHING ativo, as criações que chegam em uma janela de
+USER_INSERT_BATCH_WINDOW_MS (ou até USER_INSERT_BATCH_MAX_ROWS linhas) são
+inseridas com um único INSERT de várias linhas e um único commit, e cada
+requisição recebe o próprio resultado: a linha criada, None para um e-mail
+já registrado (inclusive repetido dentro do mesmo lote) ou o erro 404 de uma
+role inexistente
+
+o lote otimista não consulta as roles. se o banco recusar o INSERT por
+chave estrangeira, as roles do lote são verificadas e o INSERT é repetido
+apenas com as linhas válidas
+
+o estado fica no event loop do worker; a escrita roda no threadpool, com
+uma sessão própria
+"""
+
+import asyncio
+from typing import Callable
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database.database import get_session_factory
+from ..repositories.role_repository import RoleRepository
+from ..repositories.user_repository import UserRepository
+
+
+def write_batch(db: Session, rows: list[dict]) -> list[Row | None | HTTPException]:
+    """
+    insere um lote de usuários em uma transação, com um resultado por linha
+
+    :param db: sessão ativa do banco de dados
+    :param rows: valores das colunas de cada usuário, na ordem dos pedidos
+    :return: para cada linha, a linha criada (id, name, email), None se o
+        e-mail já estiver registrado ou HTTPException 404 se a role não existir
+    """
+    results: list[Row | None | HTTPException] = [None] * len(rows)
+    # o primeiro pedido de cada e-mail vence; os repetidos recebem None (400)
+    first_index: dict[str, int] = {}
+    for index, row in enumerate(rows):
+        first_index.setdefault(row["email"].lower(), index)
+    pending = sorted(first_index.values())
+
+    try:
+        created = UserRepository(db).insert_users(db, [rows[index] for index in pending])
+    except IntegrityError:
+        valid_roles = RoleRepository.get_existing_role_ids(db, {rows[index]["role_id"] for index in pending})
+        db.rollback()
+        if all(rows[index]["role_id"] in valid_roles for index in pending):
+            # a violação não foi de chave estrangeira
+            raise
+        for index in pending:
+            if rows[index]["role_id"] not in valid_roles:
+                results[index] = HTTPException(status_code=404, detail="role not found")
+        pending = [index for index in pending if rows[index]["role_id"] in valid_roles]
+        created = UserRepository(db).insert_users(db, [rows[index] for index in pending])
+
+    by_email = {row.email.lower(): row for row in created}
+    for index in pending:
+        results[index] = by_email.get(rows[index]["email"].lower())
+    return results
+
+
+class UserInsertBatcher:
+    """
+    fila de criações de usuário que é gravada em lotes
+
+    :param window: tempo máximo, em segundos, que o primeiro pedido de um lote espera
+    :param max_rows: quantidade de pedidos que grava o lote imediatamente
+    :param session_factory: fábrica das sessões usadas na escrita; por padrão, a da aplicação
+    """
+
+    def __init__(self, window: float, max_rows: int, session_factory: Callable[[], Session] | None = None):
+        self.window = window
+        self.max_rows = max_rows
+        self.session_factory = session_factory
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def insert(self, values: dict) -> Row | None:
+        """
+        agenda a inserção de um usuário no próximo lote e aguarda o resultado
+
+        :param values: valores das colunas do novo usuário
+        :return: linha com id, name e email, ou None se o e-mail já existir
+        :raises HTTPException: 404 se a role não existir
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((values, future))
+        if len(self._pending) >= self.max_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._write(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _write(self, batch: list[tuple[dict, asyncio.Future]]) -> None:
+        try:
+            results = await run_in_threadpool(self._write_in_session, [values for values, _ in batch])
+        except BaseException as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                # quem pediu desistiu; a linha pode ter sido criada mesmo assim
+                continue
+            if isinstance(result, HTTPException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _write_in_session(self, rows: list[dict]) -> list[Row | None | HTTPException]:
+        session_factory = self.session_factory or get_session_factory()
+        with session_factory() as db:
+            return write_batch(db, rows)
+
+
+user_insert_batcher = UserInsertBatcher(
+    settings.USER_INSERT_BATCH_WINDOW_MS / 1000, settings.USER_INSERT_BATCH_MAX_ROWS
+)
@@ -5,17 +5,53 @@ este serviço fornece métodos para criar e buscar usuários no sistema,
 além de gerar senhas aleatórias e realizar o hash das senhas
 """
 
+import asyncio
+import json
+import logging
 import random
 import string
+import time
+from typing import Callable, Iterator
 from datetime import date
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 from ..models.user_model import User
 from ..repositories.user_repository import UserRepository
 from ..services.role_service import RoleService
+from ..repositories.role_repository import RoleRepository
 from ..schemas.user_schema import UserCreate
+from ..config import settings
+from ..cache.email_filter import email_filter
+from ..cache.single_flight import SingleFlight
+from ..metrics.instruments import observe_password_hash
+from .hashing_executor import hash_password_in_pool, hash_passwords_in_pool, verify_password_in_pool
+from .password_hashing import get_pwd_context, verify_and_update
+from .user_insert_batcher import user_insert_batcher
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+logger = logging.getLogger(__name__)
+
+_FOREIGN_KEY_VIOLATION = "23503"
+
+# buscas simultâneas pelo mesmo e-mail (sem diferenciar maiúsculas) viram uma única consulta
+email_lookups = SingleFlight(settings.SINGLE_FLIGHT_TIMEOUT)
+
+
+def is_foreign_key_violation(error: IntegrityError) -> bool:
+    """
+    indica se o erro de integridade é uma violação de chave estrangeira
+
+    :param error: erro levantado pelo sqlalchemy
+    :return: True para violações de chave estrangeira no postgres ou no sqlite
+    """
+    if getattr(error.orig, "pgcode", None) == _FOREIGN_KEY_VIOLATION:
+        return True
+    if getattr(error.orig, "sqlstate", None) == _FOREIGN_KEY_VIOLATION:
+        return True
+    return "FOREIGN KEY constraint failed" in str(error.orig)
 
 class UserService:
     """
@@ -56,7 +92,71 @@ class UserService:
         - password: "password123"
         - retorna o hash bcrypt da senha "password123"
         """
-        return pwd_context.hash(password)
+        start = time.perf_counter()
+        hashed = get_pwd_context().hash(password)
+        observe_password_hash(time.perf_counter() - start)
+        return hashed
+
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """
+        gera o hash de uma senha no pool de processos dedicado
+
+        este método tem o mesmo resultado de 'hash_password', mas executa o
+        bcrypt fora do processo do servidor, liberando o event loop e as
+        threads de trabalho enquanto o hash é calculado
+
+        :param password: a senha a ser hashada
+        :return: o hash gerado para a senha
+        """
+        return await hash_password_in_pool(password)
+
+    @staticmethod
+    def verify_password(db: Session, user: User, password: str) -> bool:
+        """
+        confere a senha de um usuário e atualiza o hash se ele estiver desatualizado
+
+        quando a senha confere e o hash foi gerado com um custo fora da
+        política atual (needs_update), um novo hash é gravado. assim o custo
+        pode ser ajustado sem migrar todas as senhas de uma vez. um valor
+        gravado que não é um hash reconhecido apenas não confere
+
+        :param db: sessão do banco de dados
+        :param user: o usuário, com o hash gravado
+        :param password: a senha informada
+        :return: True se a senha confere
+        """
+        valid, new_hash = verify_and_update(password, user.password)
+        if valid and new_hash is not None:
+            UserService._store_rehash(db, user, new_hash)
+        return valid
+
+    @staticmethod
+    async def verify_password_async(db: Session, user: User, password: str) -> bool:
+        """
+        equivalente a 'verify_password', com o bcrypt executado no pool de processos
+
+        :param db: sessão do banco de dados
+        :param user: o usuário, com o hash gravado
+        :param password: a senha informada
+        :return: True se a senha confere
+        """
+        valid, new_hash = await verify_password_in_pool(password, user.password)
+        if valid and new_hash is not None:
+            await run_in_threadpool(UserService._store_rehash, db, user, new_hash)
+        return valid
+
+    @staticmethod
+    def _store_rehash(db: Session, user: User, new_hash: str) -> None:
+        """
+        grava o hash refeito, desde que a senha não tenha sido trocada nesse meio tempo
+
+        :param db: sessão do banco de dados
+        :param user: o usuário, com o hash antigo
+        :param new_hash: o hash com o custo atual
+        """
+        if UserRepository(db).update_password_hash(db, user.id, user.password, new_hash):
+            user.password = new_hash
 
     @staticmethod
     def create_user(db: Session, user_data: UserCreate) -> User:
@@ -87,15 +187,222 @@ class UserService:
         if user_data.password:
             password = UserService.hash_password(password)
 
-        new_user = User(
-            name=user_data.name,
-            email=user_data.email,
-            password=password,
-            role_id=user_data.role_id,
-            created_at=date.today()
+        new_user = UserService._build_user(user_data, password)
+
+        user = UserRepository(db).create_user(db, new_user)
+        email_filter.add(user.email)
+        return user
+
+    @staticmethod
+    async def create_user_async(db: Session, user_data: UserCreate) -> Row:
+        """
+        cria um novo usuário com uma única instrução no banco de dados
+
+        o hash é aguardado no pool de processos antes de qualquer acesso ao
+        banco, então nenhuma conexão fica presa durante o bcrypt. em seguida
+        um único INSERT ... ON CONFLICT DO NOTHING RETURNING substitui a
+        verificação de e-mail, a busca da role e o refresh do usuário. com
+        USER_INSERT_BATCHING, o INSERT é feito junto com o das criações
+        simultâneas, em uma transação compartilhada (user_insert_batcher)
+
+        :param db: sessão do banco de dados para realizar a operação
+        :param user_data: os dados do usuário a ser criado
+        :return: linha com id, name e email do usuário criado
+        :raises HTTPException: 400 se o e-mail já estiver registrado, 404 se a role não existir
+        """
+        password = user_data.password or UserService.generate_random_password()
+
+        if user_data.password:
+            password = await UserService.hash_password_async(password)
+
+        values = UserService._user_values(user_data, password)
+
+        if settings.USER_INSERT_BATCHING:
+            row = UserService._check_inserted(await user_insert_batcher.insert(values))
+        else:
+            try:
+                row = await run_in_threadpool(UserRepository(db).insert_user, db, values)
+            except IntegrityError as error:
+                UserService._raise_for_integrity_error(error)
+            UserService._check_inserted(row)
+        email_filter.add(values["email"])
+        return row
+
+    @staticmethod
+    async def create_users_bulk(db: Session, users_data: list[UserCreate]) -> dict:
+        """
+        cria vários usuários de uma vez, retornando o resultado de cada item
+
+        a validação usa uma consulta para todas as roles e outra para todos
+        os e-mails. a conexão é devolvida ao pool antes dos hashes, que rodam
+        em paralelo em todos os processos do pool, e os usuários válidos são
+        inseridos em lotes de BULK_INSERT_CHUNK_SIZE linhas
+
+        :param db: sessão do banco de dados para realizar a operação
+        :param users_data: os dados dos usuários a serem criados
+        :return: dicionário com as contagens e o resultado de cada item, na ordem recebida
+        :raises HTTPException: 413 se a requisição exceder BULK_MAX_ITEMS itens
+        """
+        if len(users_data) > settings.BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"at most {settings.BULK_MAX_ITEMS} users per request"
+            )
+
+        existing_role_ids = await run_in_threadpool(
+            RoleRepository.get_existing_role_ids, db, {item.role_id for item in users_data}
         )
+        # só os e-mails que o filtro não descarta vão para a consulta. um e-mail
+        # cadastrado por outro worker pode escapar do filtro até a próxima
+        # reconstrução; nesse caso, o ON CONFLICT do insert o recusa
+        existing_emails = await run_in_threadpool(
+            UserRepository(db).get_existing_emails,
+            db,
+            [email for email in {item.email for item in users_data} if email_filter.might_contain(email)]
+        )
+        await run_in_threadpool(db.rollback)
+
+        results: list[dict | None] = [None] * len(users_data)
+        accepted: list[int] = []
+        seen_emails: set[str] = set()
+        for index, item in enumerate(users_data):
+            if item.role_id not in existing_role_ids:
+                results[index] = {"index": index, "status_code": 404, "detail": "role not found"}
+            elif item.email.lower() in existing_emails or item.email.lower() in seen_emails:
+                results[index] = {"index": index, "status_code": 400, "detail": "email already registered"}
+            else:
+                seen_emails.add(item.email.lower())
+                accepted.append(index)
+
+        # itens sem senha recebem uma senha sorteada, que também é gravada apenas como hash
+        passwords = [users_data[index].password or UserService.generate_random_password() for index in accepted]
+        hashes = await hash_passwords_in_pool(passwords)
+
+        rows = [UserService._user_values(users_data[index], hashed) for index, hashed in zip(accepted, hashes)]
+        created_by_email = {}
+        chunk_size = max(1, settings.BULK_INSERT_CHUNK_SIZE)
+        repository = UserRepository(db)
+        for start in range(0, len(rows), chunk_size):
+            created = await run_in_threadpool(repository.insert_users, db, rows[start:start + chunk_size])
+            created_by_email.update((row.email, row) for row in created)
+            for row in created:
+                email_filter.add(row.email)
+
+        for index in accepted:
+            row = created_by_email.get(users_data[index].email)
+            if row is None:
+                results[index] = {"index": index, "status_code": 400, "detail": "email already registered"}
+            else:
+                results[index] = {"index": index, "status_code": 200, "user": row}
+
+        return {
+            "created": len(created_by_email),
+            "failed": len(users_data) - len(created_by_email),
+            "results": results,
+        }
+
+    @staticmethod
+    def _user_values(user_data: UserCreate, password: str) -> dict:
+        """
+        monta os valores das colunas do novo usuário
+
+        :param user_data: os dados do usuário a ser criado
+        :param password: a senha já processada
+        :return: dicionário com os valores das colunas
+        """
+        return {
+            "name": user_data.name,
+            "email": user_data.email,
+            "password": password,
+            "role_id": user_data.role_id,
+            "created_at": date.today(),
+        }
+
+    @staticmethod
+    def _build_user(user_data: UserCreate, password: str) -> User:
+        """
+        monta o objeto User a partir dos dados recebidos e da senha final
+
+        :param user_data: os dados do usuário a ser criado
+        :param password: a senha já processada
+        :return: o objeto User ainda não persistido
+        """
+        return User(**UserService._user_values(user_data, password))
+
+    @staticmethod
+    def _check_inserted(row: Row | None) -> Row:
+        """
+        converte o resultado vazio do ON CONFLICT DO NOTHING em erro http
+
+        :param row: linha retornada pelo insert
+        :return: a própria linha, quando o usuário foi criado
+        :raises HTTPException: 400 se o e-mail já estiver registrado
+        """
+        if row is None:
+            raise HTTPException(status_code=400, detail="email already registered")
+        return row
 
-        return UserRepository(db).create_user(db, new_user)
+    @staticmethod
+    def _raise_for_integrity_error(error: IntegrityError):
+        """
+        traduz violações de integridade do insert em erros http
+
+        :param error: erro levantado pelo banco
+        :raises HTTPException: 404 se a role referenciada não existir
+        :raises IntegrityError: o próprio erro, para qualquer outra violação
+        """
+        if is_foreign_key_violation(error):
+            raise HTTPException(status_code=404, detail="role not found")
+        raise error
+
+    @staticmethod
+    def list_users(db: Session, cursor: int | None, limit: int) -> dict:
+        """
+        lista uma página de usuários com paginação por cursor (keyset)
+
+        uma linha a mais é lida para saber se existe uma próxima página sem
+        precisar de um COUNT
+
+        :param db: sessão do banco de dados para realizar a consulta
+        :param cursor: id do último usuário da página anterior, ou None para a primeira
+        :param limit: tamanho da página
+        :return: dicionário com os itens e o cursor da próxima página (None na última)
+        """
+        rows = UserRepository(db).get_users_page(cursor, limit + 1)
+        items = rows[:limit]
+        next_cursor = items[-1].id if len(rows) > limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    def list_users_with_role_and_claims(db: Session, cursor: int | None, limit: int) -> dict:
+        """
+        lista uma página de usuários com a role e as claims de cada um
+
+        :param db: sessão do banco de dados para realizar a consulta
+        :param cursor: id do último usuário da página anterior, ou None para a primeira
+        :param limit: tamanho da página
+        :return: dicionário com os itens aninhados e o cursor da próxima página
+        """
+        users = UserRepository(db).get_users_with_role_and_claims_page(cursor, limit + 1)
+        items = users[:limit]
+        next_cursor = items[-1]["id"] if len(users) > limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    def stream_users_ndjson(session_factory: Callable[[], Session], cursor: int | None) -> Iterator[str]:
+        """
+        gera a listagem de usuários como ndjson (um objeto json por linha)
+
+        a sessão é aberta pelo próprio gerador, pois o corpo é enviado depois
+        que as dependências da requisição já foram encerradas
+
+        :param session_factory: fábrica de sessões do banco de dados
+        :param cursor: id a partir do qual a listagem começa, ou None para o início
+        :return: iterador de blocos de texto, um por lote lido do banco
+        """
+        with session_factory() as db:
+            for batch in UserRepository(db).stream_users(cursor, settings.USERS_STREAM_BATCH_SIZE):
+                yield "".join(json.dumps(row._asdict(), ensure_ascii=False) + "\n" for row in batch)
 
     @staticmethod
     def get_user_by_email(db: Session, email: str) -> User | None:
@@ -112,4 +419,80 @@ class UserService:
         - email: "carlos@example.com"
         - retorna o usuário com o e-mail "carlos@example.com", caso exista
         """
-        return UserRepository(db).get_user_by_email(db, email)
+        return email_lookups.do(
+            email.lower(),
+            lambda: UserRepository(db).get_user_by_email(db, email),
+            share=UserService._user_state,
+            adopt=lambda values: UserService._adopt_user(db, values),
+        )
+
+    @staticmethod
+    def _user_state(user: User | None) -> dict | None:
+        """
+        copia as colunas do usuário, para compartilhá-las entre sessões
+
+        :param user: usuário carregado pela consulta agrupada
+        :return: valores das colunas, ou None se o usuário não existir
+        """
+        if user is None:
+            return None
+        return {column.key: getattr(user, column.key) for column in User.__table__.columns}
+
+    @staticmethod
+    def _adopt_user(db: Session, values: dict | None) -> User | None:
+        """
+        associa à sessão de quem esperou o usuário carregado pela consulta agrupada
+
+        'merge(..., load=False)' não emite consulta: o objeto entra no mapa de
+        identidade da sessão como se tivesse sido lido por ela, e os
+        relacionamentos continuam carregando pela própria sessão
+
+        :param db: sessão de quem esperou (no modo assíncrono, a 'sync_session')
+        :param values: valores das colunas, ou None se o usuário não existir
+        :return: o usuário associado à sessão ou None
+        """
+        if values is None:
+            return None
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    @staticmethod
+    def rebuild_email_filter(session_factory: Callable[[], Session]) -> dict:
+        """
+        monta o filtro de e-mails em uma leitura em lotes de 'users.email'
+
+        :param session_factory: fábrica de sessões do banco de dados
+        :return: estado do novo filtro, como em 'email_filter.stats'
+        """
+        start = time.perf_counter()
+        with session_factory() as db:
+            repository = UserRepository(db)
+            email_filter.rebuild(
+                repository.count_users(), repository.stream_emails(settings.USERS_STREAM_BATCH_SIZE)
+            )
+        stats = email_filter.stats()
+        logger.info(
+            "filtro de e-mails montado em %.1fs: %d e-mails, %d bytes",
+            time.perf_counter() - start, stats["count"], stats["memory_bytes"]
+        )
+        return stats
+
+    @staticmethod
+    async def rebuild_email_filter_periodically(session_factory: Callable[[], Session], interval: float) -> None:
+        """
+        monta o filtro de e-mails agora e de novo a cada 'interval' segundos, até ser cancelada
+
+        enquanto a primeira carga não termina, as buscas por e-mail consultam o banco
+
+        :param session_factory: fábrica de sessões do banco de dados
+        :param interval: intervalo entre as reconstruções, em segundos (0 monta uma única vez)
+        """
+        while True:
+            try:
+                await run_in_threadpool(UserService.rebuild_email_filter, session_factory)
+            except Exception:
+                logger.exception("falha ao montar o filtro de e-mails")
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
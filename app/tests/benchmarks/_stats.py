@@ -0,0 +1,35 @@
+"""
+funções auxiliares para resumir latências coletadas nos benchmarks
+"""
+
+import math
+
+
+def percentile(values: list[float], p: float) -> float:
+    """
+    calcula o percentil 'p' (0-100) pelo método do ranque mais próximo
+
+    :param values: amostras coletadas
+    :param p: percentil desejado
+    :return: o valor do percentil ou 0.0 se não houver amostras
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: list[float]) -> dict:
+    """
+    resume uma lista de latências em segundos como milissegundos
+
+    :param latencies: latências em segundos
+    :return: dicionário com contagem, p50, p95 e p99 em ms
+    """
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
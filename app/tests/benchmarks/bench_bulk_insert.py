@@ -0,0 +1,75 @@
+"""
+benchmark de vazão do insert em lote de usuários (sem contar o hash)
+
+insere N usuários com um hash bcrypt pré-calculado usando
+UserRepository.insert_users, variando o tamanho do lote
+
+uso:
+    python -m app.tests.benchmarks.bench_bulk_insert --users 100000 --chunks 500,1000,5000
+    python -m app.tests.benchmarks.bench_bulk_insert --url postgresql+psycopg2://...
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from app.models.base import Base
+from app.models.role_model import Role
+from app.models.user_model import User
+from app.repositories.user_repository import UserRepository
+from app.services.user_service import UserService
+
+
+def _run(url: str, users: int, chunk_size: int, password_hash: str) -> float:
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with session_factory() as db:
+        db.execute(delete(User).where(User.email.like("bulk-bench-%")))
+        role = db.get(Role, 1)
+        if role is None:
+            db.add(Role(id=1, description="Administrador"))
+        db.commit()
+
+        rows = [
+            {
+                "name": f"Bulk User {i}",
+                "email": f"bulk-bench-{i}@example.com",
+                "password": password_hash,
+                "role_id": 1,
+                "created_at": date.today(),
+            }
+            for i in range(users)
+        ]
+        repository = UserRepository(db)
+        start = time.perf_counter()
+        for offset in range(0, users, chunk_size):
+            repository.insert_users(db, rows[offset:offset + chunk_size])
+        elapsed = time.perf_counter() - start
+
+        db.execute(delete(User).where(User.email.like("bulk-bench-%")))
+        db.commit()
+    engine.dispose()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="url síncrona do banco; por padrão usa um sqlite temporário")
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--chunks", default="100,1000,5000", help="tamanhos de lote separados por vírgula")
+    args = parser.parse_args()
+
+    password_hash = UserService.hash_password("password123")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        for chunk_size in (int(chunk) for chunk in args.chunks.split(",")):
+            elapsed = _run(url, args.users, chunk_size, password_hash)
+            print(f"lote {chunk_size:>6}: {args.users / elapsed:>10.0f} usuários/s ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
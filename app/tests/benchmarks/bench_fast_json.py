@@ -0,0 +1,71 @@
+"""
+micro-benchmark da serialização das respostas com e sem FAST_JSON
+
+monta dois apps em memória com o mesmo endpoint de UserPage, um com as
+rotas padrão do fastapi (validação + json da biblioteca padrão) e outro com
+FastJSONRoute (projeção + orjson), e mede a latência das requisições para
+páginas de 1 e de 10 mil linhas. as linhas são objetos com atributos, como
+as retornadas pelo sqlalchemy, e são criadas antes da medição
+
+uso:
+    python -m app.tests.benchmarks.bench_fast_json --requests 200 --rows 1,10000
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.controllers.fast_json import FastJSONRoute
+from app.schemas.user_schema import UserPage
+from ._stats import summarize
+
+
+def _build_app(route_class: type[APIRoute], rows: int) -> FastAPI:
+    page = {
+        "items": [SimpleNamespace(id=i, name=f"User {i}", email=f"user{i}@example.com") for i in range(rows)],
+        "next_cursor": rows,
+    }
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/users", response_model=UserPage)
+    def list_users():
+        return page
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def _measure(app: FastAPI, requests: int) -> dict:
+    latencies = []
+    with TestClient(app) as client:
+        client.get("/users")
+        for _ in range(requests):
+            start = time.perf_counter()
+            client.get("/users")
+            latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rows", default="1,10000", help="tamanhos de página separados por vírgula")
+    args = parser.parse_args()
+
+    for rows in (int(value) for value in args.rows.split(",")):
+        requests = args.requests if rows < 1000 else max(1, args.requests // 10)
+        default = _measure(_build_app(APIRoute, rows), requests)
+        with patch.object(settings, "FAST_JSON", True):
+            fast = _measure(_build_app(FastJSONRoute, rows), requests)
+        print(f"{rows} linha(s):")
+        print(f"  padrão:    {default}")
+        print(f"  fast json: {fast}")
+
+
+if __name__ == "__main__":
+    main()
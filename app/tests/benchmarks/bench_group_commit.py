@@ -0,0 +1,111 @@
+"""
+benchmark das criações de usuário concorrentes com e sem agrupamento de commits
+
+N clientes concorrentes criam usuários (com um hash pré-calculado) pelo
+mesmo caminho de create_user_async. a janela 0 é a referência: um INSERT e um
+commit por requisição; as demais usam UserInsertBatcher com a janela indicada
+
+uso:
+    python -m app.tests.benchmarks.bench_group_commit --concurrency 64 --users 5000
+    python -m app.tests.benchmarks.bench_group_commit --windows 0,1,2,5,10 --url postgresql+psycopg2://...
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import tempfile
+import time
+from datetime import date
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from app.models.base import Base
+from app.models.role_model import Role
+from app.models.user_model import User
+from app.repositories.user_repository import UserRepository
+from app.services.user_insert_batcher import UserInsertBatcher
+from app.services.user_service import UserService
+from ._stats import summarize
+
+_emails = itertools.count()
+
+
+def _values(password_hash: str) -> dict:
+    number = next(_emails)
+    return {
+        "name": f"Group User {number}",
+        "email": f"group-bench-{number}@example.com",
+        "password": password_hash,
+        "role_id": 1,
+        "created_at": date.today(),
+    }
+
+
+def _insert_one(session_factory, values: dict):
+    with session_factory() as db:
+        return UserRepository(db).insert_user(db, values)
+
+
+async def _client(insert, password_hash: str, requests: int, latencies: list[float]):
+    for _ in range(requests):
+        start = time.perf_counter()
+        await insert(_values(password_hash))
+        latencies.append(time.perf_counter() - start)
+
+
+async def _run(session_factory, window_ms: float, users: int, concurrency: int, max_rows: int, password_hash: str):
+    if window_ms:
+        batcher = UserInsertBatcher(window_ms / 1000, max_rows, session_factory=session_factory)
+        insert = batcher.insert
+    else:
+        async def insert(values):
+            return await run_in_threadpool(_insert_one, session_factory, values)
+
+    latencies: list[float] = []
+    per_client = max(1, users // concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(insert, password_hash, per_client, latencies) for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="url síncrona do banco; por padrão usa um sqlite temporário")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--windows", default="0,1,2,5,10", help="janelas em ms separadas por vírgula; 0 = sem agrupar")
+    parser.add_argument("--max-rows", type=int, default=100)
+    args = parser.parse_args()
+
+    password_hash = UserService.hash_password("password123")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        connect_args = {"check_same_thread": False, "timeout": 30} if url.startswith("sqlite") else {}
+        engine = create_engine(url, connect_args=connect_args, pool_size=args.concurrency, max_overflow=0)
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with session_factory() as db:
+            if db.get(Role, 1) is None:
+                db.add(Role(id=1, description="Administrador"))
+            db.commit()
+
+        for window_ms in (float(window) for window in args.windows.split(",")):
+            elapsed, latencies = asyncio.run(
+                _run(session_factory, window_ms, args.users, args.concurrency, args.max_rows, password_hash)
+            )
+            stats = summarize(latencies)
+            label = "sem lote" if not window_ms else f"{window_ms:g}ms"
+            print(
+                f"janela {label:>8}: {stats['count'] / elapsed:>8.0f} usuários/s "
+                f"p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms"
+            )
+
+        with session_factory() as db:
+            db.execute(delete(User).where(User.email.like("group-bench-%")))
+            db.commit()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
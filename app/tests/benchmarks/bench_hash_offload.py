@@ -0,0 +1,125 @@
+"""
+benchmark da latência de GET /role/{role_id} com criação de usuários concorrente
+
+mede o p99 das leituras de role sozinhas e depois com escritores criando
+usuários em paralelo. com '--inline' o hash volta a ser feito na thread da
+requisição, reproduzindo o comportamento anterior ao pool de processos
+
+uso:
+    python -m app.tests.benchmarks.bench_hash_offload --duration 10 --writers 8
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import tempfile
+import time
+from unittest.mock import patch
+import httpx
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database.database import get_db
+from app.models.base import Base
+from app.models.role_model import Role
+from app.services.user_service import UserService
+from app.services.hashing_executor import shutdown_hashing_executor
+from ._stats import summarize
+
+_emails = itertools.count()
+
+
+def _setup_database(path: str):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        pool_size=20,
+        max_overflow=20,
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with session_factory() as db:
+        db.add_all([Role(description="Administrador"), Role(description="Usuário Padrão")])
+        db.commit()
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return engine
+
+
+async def _reader(client: httpx.AsyncClient, deadline: float, latencies: list[float]):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await client.get("/role/1")
+        latencies.append(time.perf_counter() - start)
+
+
+async def _writer(client: httpx.AsyncClient, deadline: float, latencies: list[float]):
+    while time.perf_counter() < deadline:
+        payload = {
+            "name": "Bench User",
+            "email": f"bench{next(_emails)}@example.com",
+            "password": "password123",
+            "role_id": 2,
+        }
+        start = time.perf_counter()
+        await client.post("/users/", json=payload)
+        latencies.append(time.perf_counter() - start)
+
+
+async def _scenario(duration: float, readers: int, writers: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.perf_counter() + duration
+        read_latencies: list[float] = []
+        write_latencies: list[float] = []
+        tasks = [_reader(client, deadline, read_latencies) for _ in range(readers)]
+        tasks += [_writer(client, deadline, write_latencies) for _ in range(writers)]
+        await asyncio.gather(*tasks)
+    return {"role_reads": summarize(read_latencies), "user_creates": summarize(write_latencies)}
+
+
+async def _inline_hash(password: str) -> str:
+    return await run_in_threadpool(UserService.hash_password, password)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--inline", action="store_true", help="faz o hash na thread da requisição")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = _setup_database(os.path.join(tmp, "bench.db"))
+        try:
+            hash_patch = patch.object(UserService, "hash_password_async", new=_inline_hash)
+            if args.inline:
+                hash_patch.start()
+            baseline = asyncio.run(_scenario(args.duration, args.readers, 0))
+            loaded = asyncio.run(_scenario(args.duration, args.readers, args.writers))
+            if args.inline:
+                hash_patch.stop()
+        finally:
+            shutdown_hashing_executor()
+            app.dependency_overrides.pop(get_db, None)
+            engine.dispose()
+
+    mode = "inline" if args.inline else "process-pool"
+    print(f"modo de hash: {mode}")
+    print(f"somente leituras:      {baseline['role_reads']}")
+    print(f"leituras com escritas: {loaded['role_reads']}")
+    print(f"criações de usuário:   {loaded['user_creates']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+benchmark do custo da instrumentação de métricas
+
+compara a vazão de um endpoint que executa um SELECT no sqlite em memória
+com e sem o MetricsMiddleware e os eventos de medição do engine. as
+requisições são feitas em processo, sem rede, o que torna o custo relativo
+da instrumentação o maior possível
+
+uso:
+    python -m app.tests.benchmarks.bench_metrics_overhead --requests 5000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from app.metrics.instruments import attach_engine
+from app.metrics.middleware import MetricsMiddleware
+
+
+def _build_app(instrumented: bool) -> FastAPI:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    if instrumented:
+        attach_engine(engine)
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+
+    @app.get("/role/{role_id}")
+    async def get_role(role_id: int):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT :id"), {"id": role_id}).scalar()
+        return {"id": role_id, "description": "Administrador"}
+
+    return app
+
+
+async def _throughput(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(200):
+            await client.get("/role/1")
+        start = time.perf_counter()
+        for index in range(requests):
+            await client.get(f"/role/{index}")
+        return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    apps = {False: _build_app(False), True: _build_app(True)}
+    results = {False: [], True: []}
+    # as rodadas se alternam para que ruído da máquina afete os dois lados
+    for _ in range(args.rounds):
+        for instrumented in (False, True):
+            results[instrumented].append(asyncio.run(_throughput(apps[instrumented], args.requests)))
+    plain = statistics.median(results[False])
+    instrumented = statistics.median(results[True])
+    overhead = (plain - instrumented) / plain * 100
+    print(f"sem métricas: {plain:.0f} req/s")
+    print(f"com métricas: {instrumented:.0f} req/s")
+    print(f"custo:        {overhead:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+benchmark do tempo de inicialização a frio da aplicação
+
+cada rodada abre um interpretador novo, mede o tempo de 'import app.main' e
+o tempo até o fim do startup do lifespan (momento em que o worker passa a
+aceitar requisições). com '--create-all' o lifespan também executa o
+create_all, reproduzindo a inicialização anterior
+
+uso:
+    python -m app.tests.benchmarks.bench_startup --runs 10
+    python -m app.tests.benchmarks.bench_startup --url postgresql+psycopg2://... --create-all
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from ._stats import summarize
+
+_PROBE = """
+import json, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app):
+    ready = time.perf_counter()
+print(json.dumps({"import": imported - start, "ready": ready - start}))
+"""
+
+
+def _run_once(env: dict) -> dict:
+    result = subprocess.run([sys.executable, "-c", _PROBE], env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--url", help="url do banco; por padrão, um sqlite temporário")
+    parser.add_argument("--create-all", action="store_true", help="executa o create_all no startup")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["DATABASE_URL"] = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        env["DB_CREATE_ALL"] = "true" if args.create_all else "false"
+        samples = [_run_once(env) for _ in range(args.runs)]
+
+    print(f"create_all no startup: {'sim' if args.create_all else 'não'}")
+    print(f"import app.main:     {summarize([sample['import'] for sample in samples])}")
+    print(f"pronto para servir:  {summarize([sample['ready'] for sample in samples])}")
+
+
+if __name__ == "__main__":
+    main()
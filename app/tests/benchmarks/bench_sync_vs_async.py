@@ -0,0 +1,110 @@
+"""
+benchmark de vazão de GET /role/{role_id} no modo síncrono e no assíncrono
+
+os dois modos são montados em aplicações separadas, apontando para o mesmo
+banco, e exercitados em processo com a mesma concorrência
+
+uso:
+    python -m app.tests.benchmarks.bench_sync_vs_async --duration 10 --concurrency 64
+    python -m app.tests.benchmarks.bench_sync_vs_async --url postgresql+psycopg2://...
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.controllers.user_controller import router as sync_router
+from app.controllers.async_user_controller import router as async_router
+from app.database.database import get_db
+from app.database.async_database import get_async_db, to_async_url
+from app.models.base import Base
+from app.models.role_model import Role
+from ._stats import summarize
+
+
+def _sync_app(url: str) -> tuple[FastAPI, callable]:
+    engine = create_engine(url)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(sync_router)
+    app.dependency_overrides[get_db] = override_get_db
+    return app, engine.dispose
+
+
+def _async_app(url: str) -> tuple[FastAPI, callable]:
+    engine = create_async_engine(to_async_url(url))
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(async_router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app, engine.dispose
+
+
+async def _run(app: FastAPI, duration: float, concurrency: int) -> dict:
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/role/1")
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result = summarize(latencies)
+    result["requests_per_s"] = round(len(latencies) / duration, 1)
+    return result
+
+
+def _prepare(url: str) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        if db.get(Role, 1) is None:
+            db.add(Role(id=1, description="Administrador"))
+            db.commit()
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="url síncrona do banco; por padrão usa um sqlite temporário")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        _prepare(url)
+        for mode, factory in (("sync", _sync_app), ("async", _async_app)):
+            app, dispose = factory(url)
+            result = asyncio.run(_run(app, args.duration, args.concurrency))
+            cleanup = dispose()
+            if asyncio.iscoroutine(cleanup):
+                asyncio.run(cleanup)
+            print(f"{mode:>5}: {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+suíte de benchmarks de repositórios, serviços e endpoints com baselines
+
+'run' executa os casos em um sqlite temporário (ou no banco de '--url') e
+grava p50/p95/p99 de cada caso em json. 'compare' confronta um resultado
+com uma baseline e termina com código 1 se o p50 ou o p95 de algum caso
+piorar além do limite. as baselines ficam em app/tests/benchmarks/baselines
+
+uso:
+    python -m app.tests.benchmarks.suite run --output results.json
+    python -m app.tests.benchmarks.suite run --rows 1000,100000,1000000 --only user_repository
+    python -m app.tests.benchmarks.suite run --save-baseline default
+    python -m app.tests.benchmarks.suite compare app/tests/benchmarks/baselines/default.json results.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Callable
+from unittest.mock import patch
+import httpx
+from sqlalchemy import create_engine, insert, select, func
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.database.database import get_db, get_session_factory
+from app.models.base import Base
+from app.models.role_model import Role
+from app.models.claim_model import Claim
+from app.models.user_model import User
+from app.models.user_claim_model import UserClaim
+from app.repositories.user_repository import UserRepository
+from app.schemas.user_schema import UserCreate
+from app.services.role_service import RoleService
+from app.services.user_service import UserService
+from app.services.hashing_executor import shutdown_hashing_executor
+from ._stats import summarize
+
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+
+_SEED_CHUNK = 10000
+_ROLES = 10
+_CLAIMS = 20
+
+_emails = itertools.count()
+
+
+def _timed(function: Callable[[], object], iterations: int, warmup: int = 1) -> list[float]:
+    for _ in range(warmup):
+        function()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def _timed_async(function, iterations: int, warmup: int = 1) -> list[float]:
+    for _ in range(warmup):
+        await function()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await function()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _seed(session_factory, rows: int, password_hash: str) -> None:
+    """
+    cria roles, claims e 'rows' usuários com 0 a 3 claims cada, em lotes
+    """
+    with session_factory() as db:
+        existing = db.scalar(select(func.count()).select_from(User))
+        if existing >= rows:
+            return
+        if not db.scalar(select(func.count()).select_from(Role)):
+            db.execute(insert(Role), [{"description": f"Role {i}"} for i in range(_ROLES)])
+            db.execute(insert(Claim), [{"description": f"Claim {i}", "active": True} for i in range(_CLAIMS)])
+        today = date.today()
+        for start in range(existing, rows, _SEED_CHUNK):
+            stop = min(start + _SEED_CHUNK, rows)
+            db.execute(insert(User), [
+                {"name": f"User {i}", "email": f"seed{i}@example.com", "password": password_hash,
+                 "role_id": i % _ROLES + 1, "created_at": today}
+                for i in range(start, stop)
+            ])
+            db.execute(insert(UserClaim), [
+                {"user_id": i + 1, "claim_id": (i + k) % _CLAIMS + 1}
+                for i in range(start, stop) for k in range(i % 4)
+            ])
+        db.commit()
+
+
+def bench_hash_password(iterations: int) -> list[float]:
+    return _timed(lambda: UserService.hash_password("password123"), iterations)
+
+
+def bench_create_user(session_factory, iterations: int) -> list[float]:
+    def create():
+        user = UserCreate(name="Bench", email=f"bench{next(_emails)}@example.com", password="password123", role_id=1)
+        with session_factory() as db:
+            UserService.create_user(db, user)
+
+    return _timed(create, iterations)
+
+
+def bench_get_role(session_factory, iterations: int, cached: bool) -> list[float]:
+    with session_factory() as db, patch.object(settings, "ROLE_CACHE_ENABLED", cached):
+        return _timed(lambda: RoleService.get_role_by_id(db, 1), iterations)
+
+
+def bench_users_with_role_and_claims(session_factory, iterations: int, rows: int) -> list[float]:
+    with session_factory() as db:
+        repository = UserRepository(db)
+        cursor = max(0, rows - 100)
+        return _timed(lambda: repository.get_users_with_role_and_claims_page(cursor, 50), iterations)
+
+
+async def bench_endpoints(session_factory, iterations: int) -> dict[str, list[float]]:
+    from app.main import app
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def create_user():
+                payload = {"name": "Bench", "email": f"bench{next(_emails)}@example.com", "password": "password123", "role_id": 1}
+                await client.post("/users/", json=payload)
+
+            return {
+                "endpoint.get_role": await _timed_async(lambda: client.get("/role/1"), iterations),
+                "endpoint.list_users": await _timed_async(lambda: client.get("/users?limit=50"), iterations),
+                "endpoint.list_user_details": await _timed_async(lambda: client.get("/users/details?limit=50"), iterations),
+                "endpoint.create_user": await _timed_async(create_user, max(1, iterations // 10)),
+            }
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_session_factory, None)
+
+
+def run(url: str, rows_list: list[int], iterations: int, only: str | None) -> dict:
+    """
+    executa os casos da suíte
+
+    :param url: url do banco onde os dados são criados
+    :param rows_list: quantidades de usuários para os casos de repositório
+    :param iterations: repetições de cada caso rápido (os de bcrypt usam um décimo)
+    :param only: prefixo dos casos a executar
+    :return: resumo de latências por caso
+    """
+    def selected(name: str) -> bool:
+        return only is None or name.startswith(only)
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    password_hash = UserService.hash_password("password123")
+    slow_iterations = max(1, iterations // 10)
+    results: dict[str, list[float]] = {}
+
+    try:
+        _seed(session_factory, min(rows_list), password_hash)
+        if selected("user_service.hash_password"):
+            results["user_service.hash_password"] = bench_hash_password(slow_iterations)
+        if selected("user_service.create_user"):
+            results["user_service.create_user"] = bench_create_user(session_factory, slow_iterations)
+        if selected("role_service.get_role_by_id"):
+            results["role_service.get_role_by_id.cached"] = bench_get_role(session_factory, iterations, True)
+            results["role_service.get_role_by_id.uncached"] = bench_get_role(session_factory, iterations, False)
+        if selected("endpoint"):
+            results.update(asyncio.run(bench_endpoints(session_factory, iterations)))
+        if selected("user_repository"):
+            for rows in sorted(rows_list):
+                _seed(session_factory, rows, password_hash)
+                name = f"user_repository.get_users_with_role_and_claims.{rows}"
+                results[name] = bench_users_with_role_and_claims(session_factory, iterations, rows)
+    finally:
+        shutdown_hashing_executor()
+        engine.dispose()
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "iterations": iterations,
+        },
+        "results": {name: summarize(latencies) for name, latencies in results.items()},
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    """
+    compara dois resultados da suíte
+
+    um caso regride quando o p50 ou o p95 fica mais de 'threshold' (fração)
+    acima da baseline e a diferença absoluta passa de 'min_delta_ms', o que
+    evita alarmes por ruído em casos de microssegundos
+
+    :param baseline: resultado de referência
+    :param current: resultado a verificar
+    :param threshold: piora relativa tolerada (0.2 = 20%)
+    :param min_delta_ms: piora absoluta mínima, em ms, para contar como regressão
+    :return: descrição de cada regressão encontrada
+    """
+    regressions = []
+    for name, reference in sorted(baseline["results"].items()):
+        measured = current["results"].get(name)
+        if measured is None:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            before, after = reference[metric], measured[metric]
+            if after > before * (1 + threshold) and after - before > min_delta_ms:
+                regressions.append(f"{name} {metric}: {before:.3f} -> {after:.3f} (+{(after / before - 1) * 100 if before else float('inf'):.0f}%)")
+    return regressions
+
+
+def _print_table(baseline: dict, current: dict) -> None:
+    print(f"{'caso':<58} {'p50 base':>10} {'p50 atual':>10} {'p95 base':>10} {'p95 atual':>10}")
+    for name, measured in sorted(current["results"].items()):
+        reference = baseline["results"].get(name, {})
+        print(
+            f"{name:<58} {reference.get('p50_ms', float('nan')):>10.3f} {measured['p50_ms']:>10.3f}"
+            f" {reference.get('p95_ms', float('nan')):>10.3f} {measured['p95_ms']:>10.3f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="executa a suíte")
+    run_parser.add_argument("--url", help="url síncrona do banco; por padrão usa um sqlite temporário")
+    run_parser.add_argument("--rows", default="1000", help="usuários nos casos de repositório, separados por vírgula")
+    run_parser.add_argument("--iterations", type=int, default=200)
+    run_parser.add_argument("--only", help="executa apenas os casos com esse prefixo")
+    run_parser.add_argument("--output", help="arquivo json de saída")
+    run_parser.add_argument("--save-baseline", metavar="NOME", help="grava o resultado em baselines/NOME.json")
+
+    compare_parser = commands.add_parser("compare", help="compara um resultado com uma baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="piora relativa tolerada (0.2 = 20%%)")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=0.05)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        rows_list = [int(value) for value in args.rows.split(",")]
+        with tempfile.TemporaryDirectory() as tmp:
+            url = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            result = run(url, rows_list, args.iterations, args.only)
+        text = json.dumps(result, indent=2, sort_keys=True)
+        if args.save_baseline:
+            BASELINES_DIR.mkdir(exist_ok=True)
+            (BASELINES_DIR / f"{args.save_baseline}.json").write_text(text + "\n")
+        if args.output:
+            Path(args.output).write_text(text + "\n")
+        if not args.output and not args.save_baseline:
+            print(text)
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    _print_table(baseline, current)
+    regressions = compare(baseline, current, args.threshold, args.min_delta_ms)
+    for regression in regressions:
+        print(f"REGRESSÃO {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.main import app
+from app.database.database import get_db
+from app.models.base import Base
+from app.diagnostics.query_diagnostics import assert_max_queries
+from app.cache.role_cache import role_cache
+from app.cache.table_version_cache import version_cache
+from app.cache.claim_cache import claim_cache
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Garante que caches em memória não vazem entre os testes."""
+    role_cache.clear()
+    version_cache.clear()
+    claim_cache.clear()
+    yield
+    role_cache.clear()
+    version_cache.clear()
+    claim_cache.clear()
+
+@pytest.fixture
+def query_budget():
+    """
+    Limita os comandos SQL de um bloco: `with query_budget(2): client.get(...)`.
+    """
+    return assert_max_queries
+
+@pytest.fixture
+def memory_engine():
+    """
+    Banco sqlite em memória, compartilhado por todas as conexões, com as tabelas criadas.
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def memory_session_factory(memory_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=memory_engine)
+
+@pytest.fixture
+def app_client(memory_session_factory):
+    """
+    TestClient da aplicação com `get_db` apontando para `memory_engine`.
+    """
+    def override_get_db():
+        db = memory_session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.pop(get_db)
+    if previous is not None:
+        app.dependency_overrides[get_db] = previous
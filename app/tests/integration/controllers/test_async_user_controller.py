@@ -0,0 +1,116 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.controllers.async_user_controller import router
+from app.database import replica
+from app.database.async_database import get_async_db
+from app.database.database import get_db
+from app.models.base import Base
+from app.services.async_user_service import AsyncUserService
+from app.services.async_role_service import AsyncRoleService
+from app.services.table_version_service import TableVersionService
+from app.services.user_service import UserService
+from app.repositories.async_user_repository import AsyncUserRepository
+
+app = FastAPI()
+app.include_router(router)
+
+async def override_get_async_db():
+    yield None
+
+app.dependency_overrides[get_async_db] = override_get_async_db
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+def test_create_user(client):
+    user_data = {
+        "name": "Carlos Santos",
+        "email": "carlos.santos@example.com",
+        "password": "password123",
+        "role_id": 2
+    }
+
+    with patch.object(AsyncUserService, 'create_user', return_value={
+        "id": 1,
+        "name": user_data["name"],
+        "email": user_data["email"]
+    }):
+        response = client.post("/users/", json=user_data)
+
+    assert response.status_code == 200
+    assert response.json() == {"id": 1, "name": user_data["name"], "email": user_data["email"]}
+
+def test_create_user_pins_reads_to_primary(client, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", "sqlite:///replica.db")
+    monkeypatch.setattr(settings, "DB_REPLICA_READ_AFTER_WRITE", 5)
+    user_data = {"name": "Carlos Santos", "email": "carlos.santos@example.com", "password": "password123", "role_id": 2}
+
+    with patch.object(AsyncUserService, 'create_user', return_value={"id": 1, "name": "Carlos Santos", "email": user_data["email"]}):
+        response = client.post("/users/", json=user_data)
+
+    assert response.status_code == 200
+    assert replica.PRIMARY_READS_COOKIE in response.cookies
+
+def test_create_user_with_idempotency_key_replays(client, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'idempotency.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    user_data = {"name": "Carlos Santos", "email": "carlos.santos@example.com", "password": "password123", "role_id": 2}
+    created = AsyncMock(return_value={"id": 1, "name": "Carlos Santos", "email": user_data["email"]})
+    try:
+        with patch.object(AsyncUserService, 'create_user', new=created):
+            first = client.post("/users/", json=user_data, headers={"Idempotency-Key": "async-1"})
+            second = client.post("/users/", json=user_data, headers={"Idempotency-Key": "async-1"})
+    finally:
+        app.dependency_overrides.pop(get_db)
+        engine.dispose()
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    created.assert_awaited_once()
+
+def test_create_user_with_existing_email(client):
+    user_data = {
+        "name": "Carlos Santos",
+        "email": "carlos.santos@example.com",
+        "password": "password123",
+        "role_id": 2
+    }
+
+    with patch.object(UserService, 'hash_password_async', return_value="hashed_password"):
+        with patch.object(AsyncUserRepository, 'insert_user', return_value=None):
+            response = client.post("/users/", json=user_data)
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "email already registered"}
+
+def test_get_role_by_id(client):
+    with patch.object(TableVersionService, 'get_version_async', return_value=4):
+        with patch.object(AsyncRoleService, 'get_role_by_id', return_value={"id": 2, "description": "Administrator role"}):
+            response = client.get("/role/2")
+
+    assert response.status_code == 200
+    assert response.json() == {"id": 2, "description": "Administrator role"}
+    assert response.headers["etag"] == '"roles-v4-2"'
+
+def test_get_role_by_id_not_modified(client):
+    with patch.object(TableVersionService, 'get_version_async', return_value=4):
+        with patch.object(AsyncRoleService, 'get_role_by_id') as mock_get_role_by_id:
+            response = client.get("/role/2", headers={"If-None-Match": '"roles-v4-2"'})
+
+    assert response.status_code == 304
+    mock_get_role_by_id.assert_not_called()
@@ -0,0 +1,43 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from app.main import app
+from app.services.authorization_service import AuthorizationService
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+def test_get_permissions(client):
+    permissions = {"user_id": 1, "claims": [1, 2], "checks": {1: True, 3: False}, "has_all": False}
+
+    with patch.object(AuthorizationService, 'get_permissions', return_value=permissions) as mock_get:
+        response = client.get("/users/1/permissions?claim_id=1&claim_id=3")
+
+    assert response.status_code == 200
+    assert response.json() == {"user_id": 1, "claims": [1, 2], "checks": {"1": True, "3": False}, "has_all": False}
+    assert mock_get.call_args.args[1:] == (1, [1, 3])
+
+@pytest.mark.parametrize("claim_id", ["-1", "0", "400000000"])
+def test_get_permissions_rejects_out_of_range_claim_ids(client, claim_id):
+    with patch.object(AuthorizationService, 'get_permissions') as mock_get:
+        response = client.get(f"/users/1/permissions?claim_id=1&claim_id={claim_id}")
+
+    assert response.status_code == 422
+    mock_get.assert_not_called()
+
+def test_grant_claim(client):
+    with patch.object(AuthorizationService, 'grant_claim') as mock_grant:
+        response = client.put("/users/1/claims/2")
+
+    assert response.status_code == 204
+    assert mock_grant.call_args.args[1:] == (1, 2)
+
+def test_revoke_claim_not_granted(client):
+    error = HTTPException(status_code=404, detail="claim not granted")
+    with patch.object(AuthorizationService, 'revoke_claim', side_effect=error):
+        response = client.delete("/users/1/claims/2")
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "claim not granted"}
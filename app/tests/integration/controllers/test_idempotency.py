@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import event
+from app.models.role_model import Role
+from app.services.user_service import UserService
+
+USER = {"name": "Carlos Santos", "email": "carlos@example.com", "password": "password123", "role_id": 1}
+
+@pytest.fixture
+def engine(memory_engine, memory_session_factory):
+    with memory_session_factory() as db:
+        db.add(Role(id=1, description="Administrador"))
+        db.commit()
+    return memory_engine
+
+@pytest.fixture
+def client(engine, app_client):
+    return app_client
+
+@pytest.fixture
+def hashes():
+    calls = []
+
+    async def fake_hash(password):
+        calls.append(password)
+        return "hashed"
+
+    with patch.object(UserService, "hash_password_async", side_effect=fake_hash):
+        yield calls
+
+def test_retry_replays_the_original_response(client, engine, hashes):
+    headers = {"Idempotency-Key": "retry-1"}
+    first = client.post("/users/", json=USER, headers=headers)
+
+    user_statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if "users" in statement:
+            user_statements.append(statement)
+
+    second = client.post("/users/", json=USER, headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert len(hashes) == 1
+    assert user_statements == []
+
+def test_without_key_a_retry_is_a_duplicate(client, hashes):
+    assert client.post("/users/", json=USER).status_code == 200
+    assert client.post("/users/", json=USER).status_code == 400
+
+def test_key_reused_with_another_payload_is_rejected(client, hashes):
+    headers = {"Idempotency-Key": "retry-2"}
+    assert client.post("/users/", json=USER, headers=headers).status_code == 200
+
+    response = client.post("/users/", json={**USER, "email": "other@example.com"}, headers=headers)
+
+    assert response.status_code == 422
+    assert len(hashes) == 1
+
+def test_key_reused_with_another_password_is_rejected(client, hashes):
+    headers = {"Idempotency-Key": "retry-3"}
+    assert client.post("/users/", json=USER, headers=headers).status_code == 200
+
+    response = client.post("/users/", json={**USER, "password": "another-secret"}, headers=headers)
+
+    assert response.status_code == 422
+    assert len(hashes) == 1
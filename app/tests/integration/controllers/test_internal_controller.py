@@ -0,0 +1,22 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+def test_get_pool_stats(client):
+    response = client.get("/internal/pool")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["pool_class"]
+    assert {"checked_out", "idle", "overflow", "wait_avg_ms", "wait_max_ms"} <= body.keys()
+
+def test_get_email_filter_stats(client):
+    response = client.get("/internal/email-filter")
+
+    assert response.status_code == 200
+    assert response.json()["ready"] is False
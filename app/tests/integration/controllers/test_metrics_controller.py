@@ -0,0 +1,28 @@
+import pytest
+from app.metrics.instruments import attach_engine, HTTP_REQUEST_DB_STATEMENTS, HTTP_REQUEST_DURATION
+
+@pytest.fixture
+def client(memory_engine, app_client):
+    attach_engine(memory_engine)
+    return app_client
+
+def test_metrics_records_route_template_and_db_usage(client):
+    requests_before = HTTP_REQUEST_DURATION.count("GET", "/users", 200)
+    statements_before = HTTP_REQUEST_DB_STATEMENTS.count("GET", "/users")
+
+    assert client.get("/users?limit=5").status_code == 200
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert HTTP_REQUEST_DURATION.count("GET", "/users", 200) == requests_before + 1
+    assert HTTP_REQUEST_DB_STATEMENTS.count("GET", "/users") == statements_before + 1
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/users",status="200"}' in body
+    assert 'http_request_db_statements_bucket{method="GET",route="/users",le="0"}' in body
+    assert "# TYPE password_hash_duration_seconds histogram" in body
+
+def test_unmatched_routes_share_one_label(client):
+    client.get("/does-not-exist/123")
+
+    assert HTTP_REQUEST_DURATION.count("GET", "unmatched", 404) >= 1
@@ -0,0 +1,30 @@
+import pytest
+from datetime import date
+from app.models.role_model import Role
+from app.models.user_model import User
+from app.models.claim_model import Claim
+
+@pytest.fixture
+def client(memory_session_factory, app_client):
+    with memory_session_factory() as db:
+        roles = [Role(description="Administrador"), Role(description="Usuário Padrão")]
+        claims = [Claim(description="Visualizar Relatórios"), Claim(description="Editar Dados")]
+        db.add_all(roles + claims)
+        db.flush()
+        for i in range(20):
+            user = User(name=f"User {i}", email=f"user{i}@example.com", password="hash", role_id=roles[i % 2].id, created_at=date.today())
+            user.claims = claims[: i % 3]
+            db.add(user)
+        db.commit()
+    return app_client
+
+def test_user_details_query_count_does_not_grow_with_page_size(client, query_budget):
+    with query_budget(2):
+        response = client.get("/users/details?limit=20")
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 20
+
+def test_user_page_is_a_single_query(client, query_budget):
+    with query_budget(1):
+        assert client.get("/users?limit=20").status_code == 200
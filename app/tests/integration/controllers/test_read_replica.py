@@ -0,0 +1,96 @@
+import pytest
+from datetime import date
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.main import app
+from app.database import replica
+from app.database.database import get_db
+from app.models.base import Base
+from app.models.claim_model import Claim
+from app.models.role_model import Role
+from app.models.user_model import User
+
+def _database(path, label):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with session_factory() as db:
+        db.add(Role(id=1, description=f"Role {label}"))
+        db.add(Claim(id=1, description=f"Claim {label}", active=True))
+        db.add(User(name=f"User {label}", email=f"{label}@example.com", password="hash", role_id=1, created_at=date.today()))
+        db.commit()
+    return engine, session_factory
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    """
+    dois bancos sqlite fazendo o papel de primário e de réplica, com dados
+    diferentes para que a origem de cada leitura seja visível
+    """
+    primary_engine, primary_factory = _database(tmp_path / "primary.db", "primary")
+    replica_engine, _ = _database(tmp_path / "replica.db", "replica")
+    replica.dispose_replica_engine()
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", f"sqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(settings, "DB_REPLICA_READ_AFTER_WRITE", 5)
+    monkeypatch.setattr(settings, "ROLE_CACHE_ENABLED", False)
+
+    def override_get_db():
+        db = primary_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield primary_factory
+    app.dependency_overrides.pop(get_db)
+    if previous is not None:
+        app.dependency_overrides[get_db] = previous
+    replica.dispose_replica_engine()
+    primary_engine.dispose()
+    replica_engine.dispose()
+
+@pytest.fixture
+def client(databases):
+    return TestClient(app)
+
+def _emails(response):
+    return [user["email"] for user in response.json()["items"]]
+
+def test_read_endpoints_use_replica(client):
+    assert client.get("/role/1").json()["description"] == "Role replica"
+    assert client.get("/claims").json()[0]["description"] == "Claim replica"
+    assert _emails(client.get("/users")) == ["replica@example.com"]
+    assert client.get("/users/details").json()["items"][0]["role"]["description"] == "Role replica"
+    assert client.get("/users?stream=true").text.count("replica@example.com") == 1
+
+def test_writes_go_to_primary_and_pin_reads_of_same_client(client, databases):
+    response = client.post("/users/", json={"name": "Nova", "email": "nova@example.com", "password": "password123", "role_id": 1})
+
+    assert response.status_code == 200
+    assert replica.PRIMARY_READS_COOKIE in response.cookies
+    with databases() as db:
+        assert db.query(User).filter_by(email="nova@example.com").count() == 1
+    assert _emails(client.get("/users")) == ["primary@example.com", "nova@example.com"]
+    assert client.get(f"/users/{response.json()['id']}/permissions").status_code == 200
+
+    other_client = TestClient(app)
+    assert _emails(other_client.get("/users")) == ["replica@example.com"]
+
+def test_expired_pin_reads_from_replica(client):
+    client.cookies.set(replica.PRIMARY_READS_COOKIE, "1.0")
+
+    assert _emails(client.get("/users")) == ["replica@example.com"]
+
+def test_without_replica_reads_use_primary(client, monkeypatch):
+    replica.dispose_replica_engine()
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", None)
+
+    response = client.post("/users/", json={"name": "Nova", "email": "nova@example.com", "password": "password123", "role_id": 1})
+
+    assert replica.PRIMARY_READS_COOKIE not in response.cookies
+    assert client.get("/role/1").json()["description"] == "Role primary"
+    assert _emails(TestClient(app).get("/users")) == ["primary@example.com", "nova@example.com"]
@@ -3,10 +3,15 @@ from fastapi.testclient import TestClient
 from app.main import app
 from app.services.user_service import UserService
 from app.services.role_service import RoleService
+from app.services.claim_service import ClaimService
+from app.services.table_version_service import TableVersionService
 from app.schemas.user_schema import UserCreate, UserResponse
 from app.schemas.role_schema import RoleResponse
+from app.repositories.user_repository import UserRepository
 from app.database.database import get_db
+from app.controllers.user_controller import CREATE_USER_LIMIT
 from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 from unittest.mock import patch
 
@@ -38,7 +43,7 @@ def test_create_user(client):
     }
 
     with patch.object(UserService, 'get_user_by_email', return_value=None):
-        with patch.object(UserService, 'create_user', return_value={
+        with patch.object(UserService, 'create_user_async', return_value={
             "id": 1,
             "name": user_data["name"],
             "email": user_data["email"]
@@ -60,12 +65,29 @@ def test_create_user_with_existing_email(client):
         "role_id": 2
     }
 
-    with patch.object(UserService, 'get_user_by_email', return_value={"id": 1, "name": user_data["name"], "email": user_data["email"]}):
-        response = client.post("/users/", json=user_data)
+    with patch.object(UserService, 'hash_password_async', return_value="hashed_password"):
+        with patch.object(UserRepository, 'insert_user', return_value=None):
+            response = client.post("/users/", json=user_data)
     
     assert response.status_code == 400
     assert response.json() == {"detail": "email already registered"}
 
+def test_create_user_with_unknown_role(client):
+    user_data = {
+        "name": "Carlos Santos",
+        "email": "carlos.santos@example.com",
+        "password": "password123",
+        "role_id": 999
+    }
+    foreign_key_error = IntegrityError("INSERT", {}, Exception("FOREIGN KEY constraint failed"))
+
+    with patch.object(UserService, 'hash_password_async', return_value="hashed_password"):
+        with patch.object(UserRepository, 'insert_user', side_effect=foreign_key_error):
+            response = client.post("/users/", json=user_data)
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "role not found"}
+
 def test_get_role_by_id(client):
     with patch.object(RoleService, 'get_role_by_id', return_value={
         "id": 2,
@@ -81,3 +103,134 @@ def test_get_role_by_id_not_found(client):
     
     assert response.status_code == 404
     assert response.json() == {"detail": "role not found"}
+
+def test_get_role_by_id_sends_cache_headers(client):
+    with patch.object(TableVersionService, 'get_version', return_value=7):
+        with patch.object(RoleService, 'get_role_by_id', return_value={"id": 2, "description": "Administrator role"}):
+            response = client.get("/role/2")
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"roles-v7-2"'
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+def test_get_role_by_id_not_modified(client):
+    with patch.object(TableVersionService, 'get_version', return_value=7):
+        with patch.object(RoleService, 'get_role_by_id') as mock_get_role_by_id:
+            response = client.get("/role/2", headers={"If-None-Match": 'W/"other", "roles-v7-2"'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == '"roles-v7-2"'
+    mock_get_role_by_id.assert_not_called()
+
+def test_get_role_by_id_stale_etag(client):
+    with patch.object(TableVersionService, 'get_version', return_value=8):
+        with patch.object(RoleService, 'get_role_by_id', return_value={"id": 2, "description": "Administrator role"}):
+            response = client.get("/role/2", headers={"If-None-Match": '"roles-v7-2"'})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"roles-v8-2"'
+
+def test_get_role_by_id_wildcard_only_matches_existing_roles(client):
+    with patch.object(TableVersionService, 'get_version', return_value=7):
+        with patch.object(RoleService, 'get_role_by_id', return_value=None):
+            missing = client.get("/role/99", headers={"If-None-Match": "*"})
+        with patch.object(RoleService, 'get_role_by_id', return_value={"id": 2, "description": "Administrator role"}):
+            existing = client.get("/role/2", headers={"If-None-Match": "*"})
+
+    assert missing.status_code == 404
+    assert existing.status_code == 304
+
+def test_get_role_by_id_without_table_version_skips_etag(client):
+    with patch.object(TableVersionService, 'get_version', return_value=None):
+        with patch.object(RoleService, 'get_role_by_id', return_value={"id": 2, "description": "Administrator role"}):
+            response = client.get("/role/2", headers={"If-None-Match": '"roles-v0-2"'})
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert "cache-control" not in response.headers
+
+def test_get_all_claims(client):
+    claims = [{"id": 1, "description": "Visualizar Relatórios", "active": True}]
+    with patch.object(TableVersionService, 'get_version', return_value=3):
+        with patch.object(ClaimService, 'get_all_claims', return_value=claims):
+            response = client.get("/claims")
+            etag = response.headers["etag"]
+            not_modified = client.get("/claims", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json() == claims
+    assert etag == '"claims-v3"'
+    assert not_modified.status_code == 304
+
+def test_create_users_bulk(client):
+    users = [
+        {"name": "Carlos Santos", "email": "carlos.santos@example.com", "password": "password123", "role_id": 2},
+        {"name": "Ana Lima", "email": "ana.lima@example.com", "password": "password123", "role_id": 9},
+    ]
+    result = {
+        "created": 1,
+        "failed": 1,
+        "results": [
+            {"index": 0, "status_code": 200, "user": {"id": 1, "name": "Carlos Santos", "email": "carlos.santos@example.com"}, "detail": None},
+            {"index": 1, "status_code": 404, "user": None, "detail": "role not found"},
+        ]
+    }
+
+    with patch.object(UserService, 'create_users_bulk', return_value=result) as mock_create_users_bulk:
+        response = client.post("/users/bulk", json=users)
+
+    assert response.status_code == 200
+    assert response.json() == result
+    assert [user.email for user in mock_create_users_bulk.call_args.args[1]] == [users[0]["email"], users[1]["email"]]
+
+def test_list_users(client):
+    page = {"items": [{"id": 1, "name": "Carlos Santos", "email": "carlos.santos@example.com"}], "next_cursor": 1}
+
+    with patch.object(UserService, 'list_users', return_value=page) as mock_list_users:
+        response = client.get("/users?cursor=0&limit=1")
+
+    assert response.status_code == 200
+    assert response.json() == page
+    assert mock_list_users.call_args.args[1:] == (0, 1)
+
+def test_list_users_stream(client):
+    with patch.object(UserService, 'stream_users_ndjson', return_value=iter(['{"id": 1}\n', '{"id": 2}\n'])):
+        response = client.get("/users?stream=true")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.splitlines() == ['{"id": 1}', '{"id": 2}']
+
+def test_list_users_with_role_and_claims(client):
+    page = {
+        "items": [{
+            "id": 1,
+            "name": "Carlos Santos",
+            "email": "carlos.santos@example.com",
+            "role": {"id": 1, "description": "Administrador"},
+            "claims": [{"id": 1, "description": "Visualizar Relatórios", "active": True}]
+        }],
+        "next_cursor": None
+    }
+
+    with patch.object(UserService, 'list_users_with_role_and_claims', return_value=page):
+        response = client.get("/users/details?limit=10")
+
+    assert response.status_code == 200
+    assert response.json() == page
+
+def test_create_user_sheds_load_when_admission_queue_is_full(client):
+    user_data = {"name": "Busy", "email": "busy@example.com", "password": "password123", "role_id": 1}
+
+    # simula a rota no limite de execuções simultâneas e sem fila de espera
+    with patch.object(CREATE_USER_LIMIT, "concurrency", 1), patch.object(CREATE_USER_LIMIT, "queue", 0), \
+            patch.object(CREATE_USER_LIMIT, "active", 1):
+        with patch.object(UserService, "create_user_async") as create_user_async:
+            response = client.post("/users/", json=user_data)
+        role_response = client.get("/role/1")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"]
+    create_user_async.assert_not_called()
+    assert role_response.status_code in (200, 404)
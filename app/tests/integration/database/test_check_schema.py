@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from app.models.base import Base
+from app.database.check_schema import check_schema, expected_heads
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+    yield engine
+    engine.dispose()
+
+def _stamp(engine, revision):
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        connection.execute(text("INSERT INTO alembic_version VALUES (:revision)"), {"revision": revision})
+
+def test_expected_heads_has_single_head():
+    assert len(expected_heads()) == 1
+
+def test_check_schema_up_to_date(engine):
+    Base.metadata.create_all(bind=engine)
+    _stamp(engine, "abc123")
+
+    assert check_schema(engine, {"abc123"}) == []
+
+def test_check_schema_reports_problems(engine):
+    problems = check_schema(engine, {"abc123"})
+
+    assert "alembic upgrade head" in problems[0]
+    assert problems[1].startswith("tabelas ausentes: claims")
+
+def test_check_schema_outdated_revision(engine):
+    Base.metadata.create_all(bind=engine)
+    _stamp(engine, "old")
+
+    assert check_schema(engine, {"abc123"}) == ["revisão do banco ['old'] diferente da esperada ['abc123']"]
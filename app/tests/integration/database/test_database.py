@@ -4,6 +4,8 @@ from sqlalchemy.orm import sessionmaker
 from app.database.database import get_db
 from dotenv import load_dotenv
 import os
+import subprocess
+import sys
 from sqlalchemy.exc import SQLAlchemyError
 
 load_dotenv()
@@ -37,3 +39,14 @@ def test_get_db(db_session):
 
     with pytest.raises(StopIteration):
         next(db_generator)
+
+def test_import_has_no_side_effects():
+    """Importar a aplicação não deve criar o engine nem carregar o passlib"""
+    code = (
+        "import sys, app.main, app.database.database as database;"
+        "assert database._engine is None;"
+        "assert 'passlib' not in sys.modules"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
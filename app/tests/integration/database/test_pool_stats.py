@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.database.pool_stats import InstrumentedQueuePool, PoolStats, pool_stats
+from app.database.database import engine_options
+
+@pytest.fixture
+def instrumented_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05
+    )
+    pool_stats.reset()
+    pool_stats.attach(engine)
+    yield engine
+    engine.dispose()
+    pool_stats.reset()
+
+def test_pool_stats_tracks_usage_and_timeouts(instrumented_engine):
+    connection = instrumented_engine.connect()
+    connection.execute(text("SELECT 1"))
+
+    stats = pool_stats.snapshot(instrumented_engine.pool)
+    assert stats["checked_out"] == 1
+    assert stats["idle"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["connects"] == 1
+
+    with pytest.raises(exc.TimeoutError):
+        instrumented_engine.connect()
+
+    connection.close()
+
+    stats = pool_stats.snapshot(instrumented_engine.pool)
+    assert stats["checked_out"] == 0
+    assert stats["idle"] == 1
+    assert stats["checkins"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["waits"] == 2
+    assert stats["wait_max_ms"] >= 50
+
+def test_snapshot_without_queue_pool():
+    engine = create_engine("sqlite:///:memory:")
+    stats = PoolStats().snapshot(engine.pool)
+
+    assert stats["pool_class"] == "SingletonThreadPool"
+    assert stats["checked_out"] is None
+
+def test_engine_options_for_postgres(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "DB_POOL_RECYCLE", 600)
+
+    options = engine_options("postgresql+psycopg2://u:p@localhost/db")
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 20
+    assert options["pool_recycle"] == 600
+    assert "pool_size" not in engine_options("sqlite:///./test.db")
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import create_engine, func, select
+from app.models.base import Base
+from app.models.user_model import User
+from app.models.user_claim_model import UserClaim
+from app.database.seed import SeedPlan, generate_chunk, seed
+
+def _plan(url="sqlite://", users=2500, seed_value=7, chunk_size=1000):
+    return SeedPlan(
+        url=url, seed=seed_value, users=users, roles=5, claims=30, chunk_size=chunk_size,
+        claims_alpha=1.6, max_claims_per_user=30, password_hash="$2b$12$hash",
+    )
+
+@pytest.fixture
+def url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'seed.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    return url
+
+def _dump(url):
+    engine = create_engine(url)
+    try:
+        with engine.connect() as connection:
+            users = connection.execute(select(User.__table__).order_by(User.id)).all()
+            claims = connection.execute(select(UserClaim.__table__).order_by(UserClaim.user_id, UserClaim.claim_id)).all()
+        return users, claims
+    finally:
+        engine.dispose()
+
+def test_generate_chunk_is_reproducible_by_seed():
+    assert generate_chunk(_plan(), 1) == generate_chunk(_plan(), 1)
+    assert generate_chunk(_plan(), 1) != generate_chunk(_plan(seed_value=8), 1)
+
+def test_generate_chunk_covers_its_id_range_with_distinct_claims():
+    users, user_claims = generate_chunk(_plan(), 2)
+
+    assert [user[0] for user in users] == list(range(2001, 2501))
+    assert len(set(user_claims)) == len(user_claims)
+    assert all(1 <= claim_id <= 30 for _, claim_id in user_claims)
+
+def test_claims_per_user_follow_a_power_law():
+    plan = _plan(users=20000, chunk_size=20000)
+    _, user_claims = generate_chunk(plan, 0)
+    counts = {}
+    for user_id, _ in user_claims:
+        counts[user_id] = counts.get(user_id, 0) + 1
+    histogram = [list(counts.values()).count(k) for k in range(1, 5)]
+
+    assert histogram == sorted(histogram, reverse=True)
+    assert max(counts.values()) >= 20
+    assert 20000 - len(counts) > histogram[0]
+
+def test_seed_loads_database_and_is_reproducible(url, tmp_path):
+    users, user_claims = seed(_plan(url))
+
+    with create_engine(url).connect() as connection:
+        assert connection.scalar(select(func.count()).select_from(User)) == users == 2500
+        assert connection.scalar(select(func.count()).select_from(UserClaim)) == user_claims
+
+    other = f"sqlite:///{tmp_path / 'other.db'}"
+    seed(_plan(other), create_tables=True)
+    assert _dump(url) == _dump(other)
+
+def test_seed_refuses_existing_data_unless_truncate(url):
+    seed(_plan(url, users=10))
+
+    with pytest.raises(RuntimeError):
+        seed(_plan(url, users=10))
+    assert seed(_plan(url, users=20), truncate=True)[0] == 20
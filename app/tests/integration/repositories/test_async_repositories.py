@@ -0,0 +1,86 @@
+import asyncio
+from datetime import date
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models.base import Base
+from app.models.user_model import User
+from app.models.role_model import Role
+from app.models.claim_model import Claim
+from app.models.user_claim_model import UserClaim
+from app.repositories.async_user_repository import AsyncUserRepository
+from app.repositories.async_role_repository import AsyncRoleRepository
+from app.repositories.async_claim_repository import AsyncClaimRepository
+from app.database.async_database import to_async_url
+
+async def _run_with_session(scenario):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    try:
+        async with session_factory() as db:
+            role = Role(description="Administrador")
+            claim = Claim(description="Visualizar Relatórios")
+            db.add_all([role, claim])
+            await db.commit()
+            user = User(
+                name="Carlos Henrique",
+                email="carlos@example.com",
+                password="password123",
+                role_id=role.id,
+                created_at=date.today()
+            )
+            await AsyncUserRepository(db).create_user(db, user)
+            db.add(UserClaim(user_id=user.id, claim_id=claim.id))
+            await db.commit()
+            return await scenario(db, role, user)
+    finally:
+        await engine.dispose()
+
+def test_async_get_role_by_id():
+    async def scenario(db, role, user):
+        found = await AsyncRoleRepository.get_role_by_id(db, role.id)
+        missing = await AsyncRoleRepository.get_role_by_id(db, 999)
+        return found, missing
+
+    found, missing = asyncio.run(_run_with_session(scenario))
+
+    assert found.description == "Administrador"
+    assert missing is None
+
+def test_async_get_all_claims():
+    async def scenario(db, role, user):
+        return await AsyncClaimRepository(db).get_all_claims()
+
+    claims = asyncio.run(_run_with_session(scenario))
+
+    assert [claim.description for claim in claims] == ["Visualizar Relatórios"]
+
+def test_async_user_repository():
+    async def scenario(db, role, user):
+        repository = AsyncUserRepository(db)
+        return (
+            await repository.get_user_by_email(db, "carlos@example.com"),
+            await repository.get_user_by_email(db, "nobody@example.com"),
+            await repository.get_all_users(),
+            await repository.get_users_with_role_and_claims(),
+        )
+
+    found, missing, users, rows = asyncio.run(_run_with_session(scenario))
+
+    assert found.name == "Carlos Henrique"
+    assert missing is None
+    assert len(users) == 1
+    assert len(rows) == 1
+    user, role, claim = rows[0]
+    assert role.description == "Administrador"
+    assert claim.description == "Visualizar Relatórios"
+
+@pytest.mark.parametrize("url, expected", [
+    ("postgresql+psycopg2://u:p@localhost:5432/db", "postgresql+asyncpg://u:p@localhost:5432/db"),
+    ("postgresql://u:p@localhost/db", "postgresql+asyncpg://u:p@localhost/db"),
+    ("sqlite:///./test.db", "sqlite+aiosqlite:///./test.db"),
+])
+def test_to_async_url(url, expected):
+    assert to_async_url(url) == expected
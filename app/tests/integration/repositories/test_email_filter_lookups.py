@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from datetime import date
+from unittest.mock import patch
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.cache.email_filter import email_filter
+from app.models.base import Base
+from app.models.role_model import Role
+from app.models.user_model import User
+from app.schemas.user_schema import UserCreate
+from app.services.user_service import UserService
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'email_filter.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        db.add(Role(id=1, description="Administrador"))
+        db.add(User(id=1, name="Ana", email="Ana@example.com", password="x", role_id=1, created_at=date.today()))
+        db.commit()
+    UserService.rebuild_email_filter(factory)
+    yield factory
+    email_filter.clear()
+    engine.dispose()
+
+@pytest.fixture
+def user_selects(session_factory):
+    statements = []
+
+    @event.listens_for(session_factory.kw["bind"], "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            statements.append((statement, parameters))
+
+    return statements
+
+def test_lookup_by_email_does_not_trust_the_filter(session_factory, user_selects):
+    # criado por outro processo depois da carga: o filtro ainda não o conhece
+    with session_factory() as db:
+        db.add(User(id=2, name="Duda", email="duda@example.com", password="x", role_id=1, created_at=date.today()))
+        db.commit()
+    assert not email_filter.might_contain("duda@example.com")
+
+    with session_factory() as db:
+        assert UserService.get_user_by_email(db, "duda@example.com").id == 2
+        assert UserService.get_user_by_email(db, "nobody@example.com") is None
+        assert len(user_selects) == 2
+
+def test_created_users_enter_the_filter(session_factory):
+    user = UserCreate(name="Bia", email="bia@example.com", password="password123", role_id=1)
+
+    async def fake_hash(password):
+        return "hashed"
+
+    with session_factory() as db, patch.object(UserService, "hash_password_async", side_effect=fake_hash):
+        asyncio.run(UserService.create_user_async(db, user))
+
+        assert email_filter.might_contain("bia@example.com")
+        assert UserService.get_user_by_email(db, "bia@example.com").name == "Bia"
+
+def test_bulk_only_checks_emails_the_filter_cannot_rule_out(session_factory, user_selects):
+    users = [
+        UserCreate(name="Ana", email="ana@example.com", password=None, role_id=1),
+        UserCreate(name="Caio", email="caio@example.com", password=None, role_id=1),
+    ]
+
+    with session_factory() as db:
+        result = asyncio.run(UserService.create_users_bulk(db, users))
+
+    assert [item["status_code"] for item in result["results"]] == [400, 200]
+    email_checks = [parameters for statement, parameters in user_selects if "lower(users.email) IN" in statement]
+    assert email_checks == [("ana@example.com",)]
+    assert email_filter.might_contain("caio@example.com")
+
+def test_stats_report_the_memory_used(session_factory):
+    stats = email_filter.stats()
+
+    assert stats["ready"] and stats["count"] == 1
+    assert stats["capacity"] == 100000
+    assert stats["memory_bytes"] == 119814
+
+def test_bulk_with_a_stale_filter_still_rejects_the_duplicate(session_factory):
+    with session_factory() as db:
+        db.add(User(id=2, name="Duda", email="duda@example.com", password="x", role_id=1, created_at=date.today()))
+        db.commit()
+
+    with session_factory() as db:
+        result = asyncio.run(UserService.create_users_bulk(
+            db, [UserCreate(name="Duda", email="duda@example.com", password=None, role_id=1)]
+        ))
+
+    assert result["results"][0]["status_code"] == 400
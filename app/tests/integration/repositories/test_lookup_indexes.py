@@ -0,0 +1,73 @@
+import pytest
+from datetime import date
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models.base import Base
+from app.models.role_model import Role
+from app.models.user_model import User
+from app.models.user_claim_model import UserClaim
+from app.repositories.user_repository import UserRepository
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db_session(engine):
+    db = sessionmaker(bind=engine)()
+    db.add(Role(id=1, description="Administrador"))
+    db.add(User(name="Carlos", email="Carlos.Henrique@Example.com", password="hash", role_id=1, created_at=date.today()))
+    db.commit()
+    yield db
+    db.close()
+
+@pytest.fixture
+def captured(engine):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", capture)
+
+def _plan(engine, statement, parameters=()) -> str:
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return " | ".join(row[-1] for row in rows)
+
+def test_get_user_by_email_is_case_insensitive_and_uses_lower_email_index(engine, db_session, captured):
+    user = UserRepository(db_session).get_user_by_email(db_session, "carlos.henrique@example.COM")
+
+    assert user.name == "Carlos"
+    assert "USING INDEX ix_users_email_lower" in _plan(engine, *captured[-1])
+
+def test_get_existing_emails_uses_lower_email_index(engine, db_session, captured):
+    existing = UserRepository(db_session).get_existing_emails(db_session, ["CARLOS.henrique@example.com", "nobody@example.com"])
+
+    assert existing == {"carlos.henrique@example.com"}
+    assert "USING INDEX ix_users_email_lower" in _plan(engine, *captured[-1])
+
+def test_insert_user_treats_case_variants_as_duplicates(db_session, captured):
+    values = {"name": "Outro", "email": "carlos.henrique@example.com", "password": "hash", "role_id": 1, "created_at": date.today()}
+
+    assert UserRepository(db_session).insert_user(db_session, values) is None
+    assert "ON CONFLICT (lower(email)) DO NOTHING" in captured[0][0]
+    assert db_session.query(User).count() == 1
+
+def test_foreign_key_lookups_use_indexes(engine):
+    users_by_role = select(User.id).where(User.role_id == 1).compile(engine)
+    users_by_claim = select(UserClaim.user_id).where(UserClaim.claim_id == 1).compile(engine)
+
+    assert "USING COVERING INDEX ix_users_role_id" in _plan(engine, str(users_by_role), (1,))
+    assert "USING INDEX ix_user_claims_claim_id" in _plan(engine, str(users_by_claim), (1,))
+
+def test_primary_keys_have_no_redundant_indexes():
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            assert [column.name for column in index.columns] != [column.name for column in table.primary_key], index.name
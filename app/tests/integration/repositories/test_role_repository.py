@@ -31,3 +31,7 @@ def test_get_role_by_id(db_session, sample_role):
     assert role is not None
     assert role.id == sample_role.id
     assert role.description == "Test Role"
+
+def test_get_existing_role_ids(db_session, sample_role):
+    assert RoleRepository.get_existing_role_ids(db_session, {sample_role.id, 999}) == {sample_role.id}
+    assert RoleRepository.get_existing_role_ids(db_session, set()) == set()
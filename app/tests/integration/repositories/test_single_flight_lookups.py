@@ -0,0 +1,92 @@
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from unittest.mock import patch
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.models.base import Base
+from app.models.role_model import Role
+from app.models.user_model import User
+from app.repositories.role_repository import RoleRepository
+from app.repositories.user_repository import UserRepository
+from app.services.role_service import RoleService
+from app.services.user_service import UserService, email_lookups
+from app.cache.role_cache import role_lookups
+
+CALLERS = 8
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'single_flight.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        db.add(Role(id=1, description="Administrador"))
+        db.add(User(id=1, name="Ana", email="ana@example.com", password="x", role_id=1, created_at=date.today()))
+        db.commit()
+    yield factory
+    engine.dispose()
+
+def _count_selects(engine, table):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and f"FROM {table}" in statement:
+            statements.append(statement)
+
+    return statements
+
+def _slow(method, flight):
+    # segura a consulta da líder até as demais chamadas estarem esperando por ela
+    waiting_before = flight.shared
+
+    def wrapper(*args, **kwargs):
+        deadline = time.monotonic() + 5
+        while flight.shared < waiting_before + CALLERS - 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        return method(*args, **kwargs)
+
+    return wrapper
+
+def _run_concurrently(session_factory, lookup):
+    barrier = threading.Barrier(CALLERS)
+
+    def call():
+        with session_factory() as db:
+            barrier.wait()
+            result = lookup(db)
+            return None if result is None else (result.id, result.email if isinstance(result, User) else result.description)
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+        return list(executor.map(lambda _: call(), range(CALLERS)))
+
+def test_concurrent_email_lookups_issue_one_query(session_factory):
+    statements = _count_selects(session_factory.kw["bind"], "users")
+    slow = _slow(UserRepository.get_user_by_email, email_lookups)
+
+    with patch.object(UserRepository, "get_user_by_email", slow):
+        results = _run_concurrently(session_factory, lambda db: UserService.get_user_by_email(db, "ANA@example.com"))
+
+    assert results == [(1, "ana@example.com")] * CALLERS
+    assert len(statements) == 1
+
+def test_concurrent_role_lookups_issue_one_query(session_factory):
+    statements = _count_selects(session_factory.kw["bind"], "roles")
+    slow = _slow(RoleRepository.get_role_by_id, role_lookups)
+
+    with patch.object(RoleRepository, "get_role_by_id", slow):
+        results = _run_concurrently(session_factory, lambda db: RoleService.get_role_by_id(db, 1))
+
+    assert results == [(1, "Administrador")] * CALLERS
+    assert len(statements) == 1
+
+def test_waiters_get_users_attached_to_their_own_session(session_factory):
+    with session_factory() as db:
+        user = UserService._adopt_user(db, {"id": 1, "name": "Ana", "email": "ana@example.com", "password": "x",
+                                            "role_id": 1, "created_at": date.today(), "updated_at": None})
+
+        assert user in db
+        assert user.role.description == "Administrador"
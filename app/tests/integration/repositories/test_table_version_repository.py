@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models.base import Base
+from app.models.table_version_model import TableVersion
+from app.repositories.table_version_repository import TableVersionRepository
+
+@pytest.fixture(scope="function")
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    yield session
+
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+def test_get_version(db_session):
+    db_session.add(TableVersion(table_name="roles", version=3))
+    db_session.commit()
+
+    assert TableVersionRepository.get_version(db_session, "roles") == 3
+    assert TableVersionRepository.get_version(db_session, "claims") is None
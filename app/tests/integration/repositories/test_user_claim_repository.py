@@ -0,0 +1,54 @@
+import pytest
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models.base import Base
+from app.models.role_model import Role
+from app.models.user_model import User
+from app.models.claim_model import Claim
+from app.repositories.user_claim_repository import UserClaimRepository
+
+@pytest.fixture(scope="function")
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    yield session
+
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture(scope="function")
+def sample_data(db_session):
+    role = Role(description="Administrador")
+    active = Claim(description="Visualizar Relatórios", active=True)
+    inactive = Claim(description="Editar Dados", active=False)
+    db_session.add_all([role, active, inactive])
+    db_session.commit()
+    user = User(name="Carlos", email="carlos@example.com", password="hash", role_id=role.id, created_at=date.today())
+    user.claims = [active, inactive]
+    db_session.add(user)
+    db_session.commit()
+    return user, active, inactive
+
+def test_get_active_claim_ids(db_session, sample_data):
+    user, active, _ = sample_data
+
+    assert UserClaimRepository.get_active_claim_ids(db_session, user.id) == [active.id]
+    assert UserClaimRepository.get_active_claim_ids(db_session, 999) is None
+
+def test_grant_and_revoke_claim(db_session, sample_data):
+    user, active, _ = sample_data
+    extra = Claim(description="Excluir Dados", active=True)
+    db_session.add(extra)
+    db_session.commit()
+
+    UserClaimRepository.grant_claim(db_session, user.id, extra.id)
+    UserClaimRepository.grant_claim(db_session, user.id, extra.id)
+    assert sorted(UserClaimRepository.get_active_claim_ids(db_session, user.id)) == sorted([active.id, extra.id])
+
+    assert UserClaimRepository.revoke_claim(db_session, user.id, extra.id)
+    assert not UserClaimRepository.revoke_claim(db_session, user.id, extra.id)
+    assert UserClaimRepository.get_active_claim_ids(db_session, user.id) == [active.id]
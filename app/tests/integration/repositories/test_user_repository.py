@@ -1,12 +1,15 @@
 import pytest
 from datetime import date
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
 from app.models.base import Base
 from app.models.user_model import User
 from app.models.role_model import Role
 from app.models.claim_model import Claim
 from app.models.user_claim_model import UserClaim
+from app.repositories.user_repository import UserRepository
+from app.services.user_service import is_foreign_key_violation
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -205,3 +208,101 @@ def test_delete_role_with_users(db_session, sample_roles, sample_users):
 
     updated_user = db_session.query(User).filter(User.id == user_carlos.id).one()
     assert updated_user.role_id == 2
+
+def test_insert_user_returning(db_session, sample_roles):
+    role_admin, _ = sample_roles
+    values = {
+        "name": "Alice Smith",
+        "email": "alice.smith@example.com",
+        "password": "password123",
+        "role_id": role_admin.id,
+        "created_at": date.today()
+    }
+    repository = UserRepository(db_session)
+
+    row = repository.insert_user(db_session, values)
+    duplicate = repository.insert_user(db_session, {**values, "name": "Bob Jones"})
+
+    assert row.id is not None
+    assert row.name == "Alice Smith"
+    assert row.email == "alice.smith@example.com"
+    assert duplicate is None
+    assert db_session.query(User).filter_by(email="alice.smith@example.com").one().name == "Alice Smith"
+
+def test_insert_user_with_unknown_role(db_session):
+    db_session.execute(text("PRAGMA foreign_keys=ON"))
+    values = {
+        "name": "Alice Smith",
+        "email": "alice.smith@example.com",
+        "password": "password123",
+        "role_id": 999,
+        "created_at": date.today()
+    }
+
+    with pytest.raises(IntegrityError) as exc_info:
+        UserRepository(db_session).insert_user(db_session, values)
+
+    assert is_foreign_key_violation(exc_info.value)
+    db_session.execute(text("PRAGMA foreign_keys=OFF"))
+
+def test_insert_users_and_existing_emails(db_session, sample_roles):
+    role_admin, role_user = sample_roles
+    repository = UserRepository(db_session)
+    rows = [
+        {"name": f"User {i}", "email": f"user{i}@example.com", "password": "hash", "role_id": role_user.id, "created_at": date.today()}
+        for i in range(5)
+    ]
+
+    created = repository.insert_users(db_session, rows)
+    again = repository.insert_users(db_session, rows[:2])
+
+    assert sorted(row.email for row in created) == [f"user{i}@example.com" for i in range(5)]
+    assert again == []
+    assert repository.get_existing_emails(db_session, ["user1@example.com", "nobody@example.com"]) == {"user1@example.com"}
+    assert repository.get_existing_emails(db_session, []) == set()
+
+def test_get_users_page_and_stream(db_session, sample_roles):
+    _, role_user = sample_roles
+    repository = UserRepository(db_session)
+    repository.insert_users(db_session, [
+        {"name": f"User {i}", "email": f"user{i}@example.com", "password": "hash", "role_id": role_user.id, "created_at": date.today()}
+        for i in range(5)
+    ])
+
+    first_page = repository.get_users_page(None, 2)
+    second_page = repository.get_users_page(first_page[-1].id, 2)
+    batches = list(repository.stream_users(first_page[0].id, batch_size=2))
+
+    assert [row.email for row in first_page] == ["user0@example.com", "user1@example.com"]
+    assert [row.email for row in second_page] == ["user2@example.com", "user3@example.com"]
+    assert not hasattr(first_page[0], "password")
+    assert [len(batch) for batch in batches] == [2, 2]
+
+def test_get_users_with_role_and_claims_page(db_session, sample_users):
+    user_carlos, user_gabrielly = sample_users
+    repository = UserRepository(db_session)
+    repository.insert_users(db_session, [
+        {"name": "Sem Claims", "email": "sem.claims@example.com", "password": "hash", "role_id": user_gabrielly.role_id, "created_at": date.today()}
+    ])
+
+    first_page = repository.get_users_with_role_and_claims_page(None, 2)
+    second_page = repository.get_users_with_role_and_claims_page(first_page[-1]["id"], 2)
+
+    assert [user["email"] for user in first_page] == ["carlos@example.com", "gabrielly@example.com"]
+    assert first_page[0]["role"]["description"] == "Administrador"
+    assert [claim["description"] for claim in first_page[0]["claims"]] == ["Visualizar Relatórios", "Editar Dados"]
+    assert len(first_page[1]["claims"]) == 1
+    assert second_page == [{
+        "id": second_page[0]["id"],
+        "name": "Sem Claims",
+        "email": "sem.claims@example.com",
+        "role": {"id": user_gabrielly.role_id, "description": "Usuário Padrão"},
+        "claims": []
+    }]
+
+def test_nested_users_statement_aggregates_in_postgres():
+    sql = str(UserRepository._nested_users_statement(10, 50).compile(dialect=postgresql.dialect()))
+
+    assert "json_agg(json_build_object('id', claims.id" in sql
+    assert "LEFT OUTER JOIN user_claims" in sql
+    assert "FILTER (WHERE claims.id IS NOT NULL)" in sql
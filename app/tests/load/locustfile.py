@@ -1,81 +1,182 @@
-from locust import HttpUser, TaskSet, task, between
-import random
+"""
+teste de carga dos endpoints de usuários, roles e claims
 
-class UserBehavior(TaskSet):
-    """
-    Comportamento do usuário para testar endpoints relacionados a roles e criação de usuários.
+as cargas são determinísticas: cada usuário simulado escolhe as ações com um
+gerador semeado por '--seed' e pelo seu índice, e os e-mails são únicos por
+execução ('--run-id'), então todo POST mede de fato o caminho de escrita
+
+perfis ('--profile'): read-heavy, write-heavy, bulk e cold-cache (os pesos
+ficam em workloads.PROFILES). formas de carga ('--shape'):
+    constant  sobe até --users e mantém até --run-time
+    ramp      sobe em degraus até --users ao longo de --run-time
+    soak      sobe até --users e mantém por --run-time (padrão de 1h)
+
+com '--results-file', ao final grava p50/p95/p99 e taxa de erro por endpoint
+em json e compara com os slos de '--slo-file'; qualquer violação termina o
+processo com código 1
+
+uso:
+    locust -f app/tests/load/locustfile.py --headless -H http://localhost:8000 \\
+        -u 50 -r 10 -t 5m --profile read-heavy --seed 42 --results-file results.json
+"""
+
+import itertools
+import json
+import time
+import uuid
+from pathlib import Path
+from locust import HttpUser, LoadTestShape, between, events, task
+from locust.runners import WorkerRunner
+from workloads import PROFILES, ActionPicker, UniqueEmails, DEFAULT_SLO_FILE, check_slo, load_slo, summarize_stats
+
+SOAK_DEFAULT_SECONDS = 3600
+
+
+@events.init_command_line_parser.add_listener
+def _add_arguments(parser):
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="read-heavy", help="perfil de carga")
+    parser.add_argument("--seed", type=int, default=1, help="semente das escolhas de cada usuário")
+    parser.add_argument("--shape", choices=["constant", "ramp", "soak"], default="constant", help="forma da carga")
+    parser.add_argument("--ramp-steps", type=int, default=5, help="degraus da forma ramp")
+    parser.add_argument("--run-id", default="", help="prefixo dos e-mails criados (padrão: aleatório)")
+    parser.add_argument("--bulk-size", type=int, default=100, help="usuários por requisição no perfil bulk")
+    parser.add_argument("--role-id-max", type=int, default=5, help="maior id de role consultado")
+    parser.add_argument("--user-id-max", type=int, default=1000, help="maior cursor usado no perfil cold-cache")
+    parser.add_argument("--results-file", default="", help="grava o resumo por endpoint neste json")
+    parser.add_argument("--slo-file", default=str(DEFAULT_SLO_FILE), help="limites de slo por endpoint")
+
+
+@events.init.add_listener
+def _init_run_id(environment, **kwargs):
+    options = environment.parsed_options
+    if options is not None and not options.run_id:
+        options.run_id = uuid.uuid4().hex[:8]
 
-    Esta classe define as tarefas a serem executadas durante o teste de carga,
-    incluindo a obtenção de roles por ID e a criação de novos usuários com dados simulados.
+
+class ApiUser(HttpUser):
+    """
+    usuário simulado que executa as ações do perfil escolhido
     """
 
-    @task(2)
-    def get_role_by_id(self):
-        """
-        Testa o endpoint de obter role por ID.
+    wait_time = between(0.5, 2)
+    _indexes = itertools.count()
+
+    def on_start(self):
+        options = self.environment.parsed_options
+        worker_index = getattr(self.environment.runner, "worker_index", 0)
+        user_index = next(self._indexes)
+        self.options = options
+        self.picker = ActionPicker(options.profile, options.seed, worker_index * 100_000 + user_index)
+        self.random = self.picker.random
+        self.emails = UniqueEmails(options.run_id, worker_index)
+        self.etags: dict[int, str] = {}
+
+    @task
+    def run_action(self):
+        getattr(self, self.picker.next())()
 
-        Este método simula a consulta a diferentes IDs de roles, incluindo IDs válidos e inválidos,
-        e avalia o comportamento do sistema com base nos status de resposta recebidos.
-        
-        A tarefa envia um ID aleatório (entre 1 e 5) para verificar o comportamento do endpoint `/role/{role_id}`.
+    def _role_id(self) -> int:
+        return self.random.randint(1, self.options.role_id_max)
 
-        Caso um ID inválido seja enviado e o sistema retorne um 404, considera-se que o teste foi bem-sucedido.
-        Caso o status seja 200, considera-se que o role foi encontrado corretamente.
+    def _new_user(self) -> dict:
+        email = self.emails.next()
+        return {"name": email.split("@")[0], "email": email, "password": "test1234", "role_id": self._role_id()}
 
-        :return: None
+    def get_role(self):
         """
-        role_id = random.randint(1, 5)
-        with self.client.get(f"/role/{role_id}", catch_response=True) as response:
-            if response.status_code == 404:
+        consulta uma role reenviando o etag recebido antes, como um cliente com cache
+        """
+        role_id = self._role_id()
+        headers = {"If-None-Match": self.etags[role_id]} if role_id in self.etags else {}
+        with self.client.get(f"/role/{role_id}", headers=headers, name="/role/[role_id]", catch_response=True) as response:
+            if response.status_code == 200:
+                self.etags[role_id] = response.headers.get("ETag", "")
                 response.success()
-                print(f"Role ID {role_id} não encontrado. Status: {response.status_code}")
-            elif response.status_code == 200:
+            elif response.status_code in (304, 404):
                 response.success()
-                print(f"Role ID {role_id} encontrado com sucesso.")
             else:
-                response.failure(f"Falha ao obter role com ID {role_id}. Status: {response.status_code}")
+                response.failure(f"status {response.status_code}")
 
-    @task(1)
-    def create_user(self):
+    def get_role_cold(self):
         """
-        Testa o endpoint de criação de usuário.
+        consulta uma role sem etag, como um cliente sem cache
+        """
+        with self.client.get(f"/role/{self._role_id()}", name="/role/[role_id]", catch_response=True) as response:
+            if response.status_code == 404:
+                response.success()
+
+    def get_claims(self):
+        self.client.get("/claims")
 
-        Este método envia dados fictícios para criar novos usuários no sistema através do endpoint `/users/`.
+    def list_users(self):
+        self.client.get("/users?limit=50", name="/users")
 
-        A tarefa envia um conjunto de dados, incluindo nome, e-mail, senha e ID de role.
-        Caso o usuário seja criado com sucesso (status 201 ou 200), considera-se que o teste foi bem-sucedido.
-        Se o erro for "e-mail já registrado" (status 400), esse erro é tratado como esperado e considerado sucesso.
-        
-        :return: None
+    def list_users_deep(self):
         """
-        user_data = {
-            "name": f"Test User {random.randint(1, 1000)}",
-            "email": f"user{random.randint(1, 1000)}@example.com",
-            "password": "test1234",
-            "role_id": random.randint(1, 2)
-        }
-        with self.client.post("/users/", json=user_data, catch_response=True) as response:
-            if response.status_code == 201:
-                response.success()
-                print(f"Usuário criado com sucesso: {response.json()}")
-            elif response.status_code == 200:
-                response.success()
-                print(f"Usuário criado com sucesso: {response.json()}")
-            elif response.status_code == 400 and "email already registered" in response.text:
-                response.success()
-                print("Erro esperado: E-mail já registrado.")
-            else:
-                response.failure(f"Falha ao criar usuário (Status: {response.status_code}): {response.text}")
+        lê uma página a partir de um cursor aleatório, fora das páginas mais acessadas
+        """
+        cursor = self.random.randint(0, self.options.user_id_max)
+        self.client.get(f"/users?cursor={cursor}&limit=50", name="/users")
 
-class WebsiteUser(HttpUser):
-    """
-    Define o usuário de carga para testar os endpoints com comportamento definido em `UserBehavior`.
+    def list_user_details(self):
+        self.client.get("/users/details?limit=50", name="/users/details")
+
+    def create_user(self):
+        self.client.post("/users/", json=self._new_user())
 
-    Esta classe herda de `HttpUser` e inclui o comportamento de carga que foi definido na classe `UserBehavior`.
-    Define também o intervalo de tempo entre as requisições, para simular a atividade do usuário.
+    def create_users_bulk(self):
+        users = [self._new_user() for _ in range(self.options.bulk_size)]
+        with self.client.post("/users/bulk", json=users, catch_response=True) as response:
+            if response.status_code != 200:
+                response.failure(f"status {response.status_code}")
+            elif response.json()["failed"]:
+                response.failure(f"{response.json()['failed']} itens com falha")
 
-    :param tasks: A lista de tarefas a serem realizadas, definida como `UserBehavior`.
-    :param wait_time: Intervalo entre as requisições (em segundos), determinado entre 1 e 5 segundos.
+
+class WorkloadShape(LoadTestShape):
+    """
+    forma da carga escolhida por '--shape', a partir de --users, --spawn-rate e --run-time
     """
-    tasks = [UserBehavior]
-    wait_time = between(1, 5)
+
+    use_common_options = True
+
+    def tick(self):
+        options = self.runner.environment.parsed_options
+        users = options.num_users or 1
+        spawn_rate = options.spawn_rate or 1
+        run_time = options.run_time or (SOAK_DEFAULT_SECONDS if options.shape == "soak" else None)
+        elapsed = self.get_run_time()
+
+        if run_time is not None and elapsed >= run_time:
+            return None
+        if options.shape != "ramp" or run_time is None:
+            return users, spawn_rate
+
+        steps = max(1, options.ramp_steps)
+        step = min(steps, int(elapsed / (run_time / steps)) + 1)
+        return max(1, users * step // steps), spawn_rate
+
+
+@events.quitting.add_listener
+def _write_results(environment, **kwargs):
+    options = environment.parsed_options
+    if isinstance(environment.runner, WorkerRunner) or not options.results_file:
+        return
+
+    summary = summarize_stats(environment.stats.entries.values())
+    violations = check_slo(summary, load_slo(options.slo_file))
+    result = {
+        "meta": {
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "profile": options.profile,
+            "shape": options.shape,
+            "seed": options.seed,
+            "run_id": options.run_id,
+            "users": options.num_users,
+        },
+        "endpoints": summary,
+        "slo_violations": violations,
+    }
+    Path(options.results_file).write_text(json.dumps(result, indent=2, sort_keys=True) + "\n")
+    if violations:
+        environment.process_exit_code = 1
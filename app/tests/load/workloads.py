@@ -0,0 +1,109 @@
+"""
+perfis de carga, geração de dados e verificação de slo do teste de carga
+
+este módulo não depende do locust, para que a lógica dos perfis e da
+comparação com os slos possa ser testada com o pytest
+"""
+
+import itertools
+import json
+import random
+from pathlib import Path
+
+# peso de cada ação em cada perfil; as ações são métodos do usuário do locustfile
+PROFILES: dict[str, dict[str, int]] = {
+    "read-heavy": {"get_role": 60, "get_claims": 10, "list_users": 15, "list_user_details": 10, "create_user": 5},
+    "write-heavy": {"create_user": 70, "get_role": 20, "list_users": 10},
+    "bulk": {"create_users_bulk": 80, "list_users": 20},
+    "cold-cache": {"get_role_cold": 60, "list_users_deep": 30, "create_user": 10},
+}
+
+DEFAULT_SLO_FILE = Path(__file__).resolve().parent / "slo.json"
+
+
+class UniqueEmails:
+    """
+    gera e-mails que não se repetem entre usuários, processos e execuções
+
+    o 'run_id' separa execuções diferentes contra o mesmo banco; o
+    'worker_index' separa os processos de um teste distribuído
+    """
+
+    def __init__(self, run_id: str, worker_index: int = 0):
+        self.prefix = f"load-{run_id}-w{worker_index}"
+        self._counter = itertools.count()
+
+    def next(self) -> str:
+        """
+        :return: um e-mail ainda não usado nesta execução
+        """
+        return f"{self.prefix}-{next(self._counter)}@example.com"
+
+
+class ActionPicker:
+    """
+    escolhe a próxima ação de um usuário simulado segundo os pesos do perfil
+
+    cada usuário tem o próprio gerador, semeado com a semente da execução e o
+    índice do usuário, então a sequência de ações é reproduzível
+    """
+
+    def __init__(self, profile: str, seed: int, user_index: int):
+        weights = PROFILES[profile]
+        self.actions = list(weights)
+        self.weights = [weights[action] for action in self.actions]
+        self.random = random.Random(seed * 1_000_003 + user_index)
+
+    def next(self) -> str:
+        """
+        :return: nome da próxima ação
+        """
+        return self.random.choices(self.actions, self.weights)[0]
+
+
+def load_slo(path: Path | str = DEFAULT_SLO_FILE) -> dict:
+    """
+    :param path: arquivo json com os limites por endpoint e o bloco 'default'
+    :return: os limites de slo
+    """
+    return json.loads(Path(path).read_text())
+
+
+def summarize_stats(entries) -> dict[str, dict]:
+    """
+    resume as estatísticas do locust por endpoint
+
+    :param entries: objetos com name, method, num_requests, num_failures e
+        get_response_time_percentile (as entradas de environment.stats)
+    :return: dicionário 'MÉTODO nome' -> requisições, taxa de erro e percentis em ms
+    """
+    summary = {}
+    for entry in entries:
+        if not entry.num_requests:
+            continue
+        summary[f"{entry.method} {entry.name}"] = {
+            "requests": entry.num_requests,
+            "error_rate": round(entry.num_failures / entry.num_requests, 5),
+            "p50_ms": entry.get_response_time_percentile(0.50),
+            "p95_ms": entry.get_response_time_percentile(0.95),
+            "p99_ms": entry.get_response_time_percentile(0.99),
+        }
+    return summary
+
+
+def check_slo(summary: dict[str, dict], slo: dict) -> list[str]:
+    """
+    compara o resumo por endpoint com os limites de slo
+
+    :param summary: resultado de 'summarize_stats'
+    :param slo: limites por endpoint ('MÉTODO nome'); endpoints ausentes usam 'default'
+    :return: descrição de cada limite violado
+    """
+    violations = []
+    for endpoint, measured in sorted(summary.items()):
+        limits = {**slo.get("default", {}), **slo.get(endpoint, {})}
+        for metric, limit in sorted(limits.items()):
+            value = measured.get(metric)
+            if value is not None and value > limit:
+                violations.append(f"{endpoint} {metric}: {value} > {limit}")
+    return violations
@@ -0,0 +1,22 @@
+from app.tests.benchmarks.suite import compare
+
+def _result(**cases):
+    return {"results": {name: {"p50_ms": p50, "p95_ms": p95} for name, (p50, p95) in cases.items()}}
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = _result(get_role=(1.0, 2.0), hash=(300.0, 310.0))
+    current = _result(get_role=(1.1, 3.0), hash=(400.0, 410.0))
+
+    regressions = compare(baseline, current, threshold=0.2, min_delta_ms=0.05)
+
+    assert regressions == [
+        "get_role p95_ms: 2.000 -> 3.000 (+50%)",
+        "hash p50_ms: 300.000 -> 400.000 (+33%)",
+        "hash p95_ms: 310.000 -> 410.000 (+32%)",
+    ]
+
+def test_compare_ignores_tiny_absolute_changes_and_new_cases():
+    baseline = _result(cached=(0.007, 0.009))
+    current = _result(cached=(0.014, 0.020), new_case=(5.0, 6.0))
+
+    assert compare(baseline, current, threshold=0.2, min_delta_ms=0.05) == []
@@ -0,0 +1,30 @@
+from app.cache import claim_cache
+
+def test_bits_round_trip():
+    bits = claim_cache.to_bits([1, 3, 64])
+
+    assert bits == (1 << 1) | (1 << 3) | (1 << 64)
+    assert claim_cache.from_bits(bits) == [1, 3, 64]
+    assert claim_cache.from_bits(0) == []
+
+def test_get_claim_bits_loads_once():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return 0b110
+
+    assert claim_cache.get_claim_bits(7, loader) == 0b110
+    assert claim_cache.get_claim_bits(7, loader) == 0b110
+    assert len(calls) == 1
+
+def test_invalidate_payloads():
+    claim_cache.claim_cache.set(1, 0b10)
+    claim_cache.claim_cache.set(2, 0b100)
+
+    claim_cache.invalidate("1")
+    assert claim_cache.claim_cache.get(1) is claim_cache.MISSING
+    assert claim_cache.claim_cache.get(2) == 0b100
+
+    claim_cache.invalidate("*")
+    assert len(claim_cache.claim_cache) == 0
@@ -0,0 +1,52 @@
+import math
+from app.cache.email_filter import BloomFilter, EmailFilter
+
+def test_bloom_filter_has_no_false_negatives_and_respects_the_rate():
+    bloom = BloomFilter(10000, 0.01)
+    for i in range(10000):
+        bloom.add(f"user{i}@example.com")
+
+    assert all(f"user{i}@example.com" in bloom for i in range(10000))
+    false_positives = sum(f"absent{i}@example.com" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
+    assert math.isclose(bloom.estimated_false_positive_rate, 0.01, rel_tol=0.1)
+
+def test_bloom_filter_size_follows_the_rate():
+    # cerca de 9,6 bits por item a 1% e 14,4 bits a 0,1%
+    assert BloomFilter(100000, 0.01).memory_bytes == 119814
+    assert BloomFilter(100000, 0.001).memory_bytes == 179720
+    assert BloomFilter(100000, 0.01).hashes == 7
+
+def test_email_filter_is_permissive_until_loaded():
+    email_filter = EmailFilter(0.01, 1000)
+    email_filter.add("early@example.com")
+
+    assert not email_filter.ready
+    assert email_filter.might_contain("anything@example.com")
+    assert email_filter.stats() == {"ready": False, "false_positive_rate": 0.01}
+
+def test_rebuild_keeps_emails_added_while_loading():
+    email_filter = EmailFilter(0.01, 1000)
+
+    def batches():
+        yield ["ana@example.com"]
+        email_filter.add("Bia@Example.com")
+        yield ["caio@example.com"]
+
+    email_filter.rebuild(2, batches())
+
+    assert email_filter.might_contain("ANA@example.com")
+    assert email_filter.might_contain("bia@example.com")
+    assert email_filter.might_contain("caio@example.com")
+    assert not email_filter.might_contain("nobody@example.com")
+    stats = email_filter.stats()
+    assert (stats["ready"], stats["count"], stats["capacity"]) == (True, 3, 1000)
+
+def test_email_filter_can_be_discarded():
+    email_filter = EmailFilter(0.01, 1000)
+    email_filter.rebuild(0, [])
+    assert not email_filter.might_contain("x@example.com")
+
+    email_filter.clear()
+
+    assert email_filter.might_contain("x@example.com")
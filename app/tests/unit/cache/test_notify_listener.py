@@ -0,0 +1,39 @@
+from unittest.mock import MagicMock
+from app.cache.notify_listener import NotifyListener
+
+def test_dispatch_routes_payload_to_channel_callback():
+    listener = NotifyListener(MagicMock())
+    roles_callback = MagicMock()
+    listener.subscribe("roles_changed", roles_callback)
+
+    listener.dispatch("roles_changed", "7")
+    listener.dispatch("other_channel", "1")
+
+    roles_callback.assert_called_once_with("7")
+
+def test_dispatch_swallows_callback_errors():
+    listener = NotifyListener(MagicMock())
+    listener.subscribe("roles_changed", MagicMock(side_effect=ValueError("bad payload")))
+
+    listener.dispatch("roles_changed", "x")
+
+def test_start_without_subscriptions_is_noop():
+    listener = NotifyListener(MagicMock())
+    listener.start()
+    listener.stop()
+
+def test_receive_redispatches_after_delay(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.cache.notify_listener.time.monotonic", lambda: now[0])
+    listener = NotifyListener(MagicMock(), redispatch_after=2)
+    callback = MagicMock()
+    listener.subscribe("roles_changed", callback)
+
+    listener.receive("roles_changed", "7")
+    listener.dispatch_pending()
+    assert callback.call_count == 1
+
+    now[0] = 102.5
+    listener.dispatch_pending()
+    listener.dispatch_pending()
+    assert callback.call_count == 2
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.cache.single_flight import SingleFlight
+
+def test_concurrent_threads_share_one_call():
+    flight = SingleFlight(timeout=5)
+    calls = []
+    release = threading.Event()
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return {"id": 1}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(flight.do, "key", load, dict, lambda shared: ("copy", shared)) for _ in range(8)]
+        while flight.shared < 7:
+            time.sleep(0.001)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert results.count({"id": 1}) == 1
+    assert results.count(("copy", {"id": 1})) == 7
+
+def test_leader_error_reaches_every_waiter():
+    flight = SingleFlight(timeout=5)
+    release = threading.Event()
+
+    def load():
+        release.wait(5)
+        raise ValueError("banco indisponível")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(flight.do, "key", load) for _ in range(4)]
+        while flight.shared < 3:
+            time.sleep(0.001)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+    # a chave é liberada: a próxima chamada consulta de novo
+    assert flight.do("key", lambda: 2) == 2
+
+def test_waiter_runs_its_own_call_after_timeout():
+    flight = SingleFlight(timeout=0.01)
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "leader"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        leader = executor.submit(flight.do, "key", slow)
+        while "key" not in flight._calls:
+            time.sleep(0.001)
+        assert flight.do("key", lambda: "own") == "own"
+        release.set()
+        assert leader.result() == "leader"
+
+def test_concurrent_tasks_share_one_call():
+    flight = SingleFlight(timeout=5)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 7
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do_async("key", load, adopt=lambda value: -value) for _ in range(10)))
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert sorted(results) == [-7] * 9 + [7]
+
+def test_cancelled_async_leader_lets_waiters_query():
+    flight = SingleFlight(timeout=5)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.05 if len(calls) == 1 else 0)
+        return len(calls)
+
+    async def scenario():
+        leader = asyncio.create_task(flight.do_async("key", load))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do_async("key", load))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter
+
+    assert asyncio.run(scenario()) == 2
+    assert len(calls) == 2
@@ -0,0 +1,43 @@
+import time
+from app.cache.ttl_cache import MISSING, TTLCache
+
+def test_get_and_set():
+    cache = TTLCache(max_size=10, ttl=60)
+
+    assert cache.get("a") is MISSING
+    cache.set("a", 1)
+    cache.set("b", None)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.hits == 2
+    assert cache.misses == 1
+
+def test_entries_expire():
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("a", 1, ttl=0.01)
+
+    time.sleep(0.02)
+
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == 3
+
+def test_stale_value_is_not_stored_after_invalidation():
+    cache = TTLCache(max_size=10, ttl=60)
+    generation = cache.generation
+
+    cache.invalidate("a")
+    cache.set("a", "stale", generation=generation)
+
+    assert cache.get("a") is MISSING
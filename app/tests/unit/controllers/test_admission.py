@@ -0,0 +1,151 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.controllers.admission import READ, WRITE, AdmissionController, RouteLimit
+from app.metrics.instruments import ADMISSION_IN_FLIGHT, ADMISSION_REJECTED
+
+def _run(scenario):
+    return asyncio.run(scenario())
+
+async def _settle():
+    # deixa as tarefas acordadas chegarem ao fim de 'acquire'
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+def test_route_limit_queues_and_rejects_when_queue_is_full():
+    controller = AdmissionController(capacity=10, read_reserve=2, timeout=5)
+    limit = RouteLimit("POST /test-queue", WRITE, concurrency=1, queue=1)
+    rejected_before = ADMISSION_REJECTED.value("POST /test-queue", "queue_full")
+
+    async def scenario():
+        await controller.acquire(limit)
+        queued = asyncio.create_task(controller.acquire(limit))
+        await asyncio.sleep(0)
+        assert limit.waiting == 1
+
+        with pytest.raises(HTTPException) as exc_info:
+            await controller.acquire(limit)
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"]
+
+        controller.release(limit)
+        await queued
+        assert (limit.active, limit.waiting) == (1, 0)
+        controller.release(limit)
+
+    _run(scenario)
+
+    assert ADMISSION_REJECTED.value("POST /test-queue", "queue_full") == rejected_before + 1
+    assert controller.in_use == 0
+    assert ADMISSION_IN_FLIGHT.value("POST /test-queue") == 0
+
+def test_writes_leave_the_reserve_to_reads():
+    controller = AdmissionController(capacity=3, read_reserve=1, timeout=5)
+    writes = RouteLimit("POST /test-writes", WRITE, concurrency=0, queue=10)
+    reads = RouteLimit("GET /test-reads", READ, concurrency=0, queue=10)
+
+    async def scenario():
+        await controller.acquire(writes)
+        await controller.acquire(writes)
+        blocked_write = asyncio.create_task(controller.acquire(writes))
+        await asyncio.sleep(0)
+        assert writes.waiting == 1
+
+        # a vaga reservada atende a leitura mesmo com uma escrita na fila
+        await asyncio.wait_for(controller.acquire(reads), timeout=1)
+        controller.release(reads)
+        controller.release(writes)
+        await blocked_write
+        controller.release(writes)
+        controller.release(writes)
+
+    _run(scenario)
+
+    assert controller.in_use == 0
+
+def test_released_slot_goes_to_queued_reads_first():
+    controller = AdmissionController(capacity=2, read_reserve=0, timeout=5)
+    writes = RouteLimit("POST /test-order", WRITE, concurrency=0, queue=10)
+    reads = RouteLimit("GET /test-order", READ, concurrency=0, queue=10)
+    admitted = []
+
+    async def enter(limit, name):
+        await controller.acquire(limit)
+        admitted.append(name)
+
+    async def scenario():
+        await controller.acquire(writes)
+        await controller.acquire(writes)
+        waiting_write = asyncio.create_task(enter(writes, "write"))
+        await asyncio.sleep(0)
+        waiting_read = asyncio.create_task(enter(reads, "read"))
+        await asyncio.sleep(0)
+
+        controller.release(writes)
+        await _settle()
+        assert admitted == ["read"]
+        controller.release(writes)
+        await asyncio.gather(waiting_write, waiting_read)
+        controller.release(reads)
+        controller.release(writes)
+
+    _run(scenario)
+
+    assert admitted == ["read", "write"]
+
+def test_queue_timeout_rejects_and_leaves_the_queue():
+    controller = AdmissionController(capacity=1, read_reserve=0, timeout=0.01)
+    limit = RouteLimit("POST /test-timeout", WRITE, concurrency=0, queue=5)
+    rejected_before = ADMISSION_REJECTED.value("POST /test-timeout", "timeout")
+
+    async def scenario():
+        await controller.acquire(limit)
+        with pytest.raises(HTTPException):
+            await controller.acquire(limit)
+        assert limit.waiting == 0
+        controller.release(limit)
+
+    _run(scenario)
+
+    assert ADMISSION_REJECTED.value("POST /test-timeout", "timeout") == rejected_before + 1
+
+def test_cancelled_waiter_does_not_hold_a_slot():
+    controller = AdmissionController(capacity=1, read_reserve=0, timeout=5)
+    limit = RouteLimit("POST /test-cancel", WRITE, concurrency=0, queue=5)
+
+    async def scenario():
+        await controller.acquire(limit)
+        waiter = asyncio.create_task(controller.acquire(limit))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        controller.release(limit)
+
+    _run(scenario)
+
+    assert (controller.in_use, limit.active, limit.waiting) == (0, 0, 0)
+
+def test_saturated_route_does_not_hold_back_other_routes():
+    controller = AdmissionController(capacity=10, read_reserve=2, timeout=5)
+    bulk = RouteLimit("POST /test-bulk", WRITE, concurrency=1, queue=5)
+    create = RouteLimit("POST /test-create", WRITE, concurrency=4, queue=5)
+
+    async def scenario():
+        await controller.acquire(bulk)
+        queued_bulk = asyncio.create_task(controller.acquire(bulk))
+        await asyncio.sleep(0)
+        assert bulk.waiting == 1
+
+        # há vagas livres: a criação não espera atrás do lote, que aguarda o próprio limite
+        await asyncio.wait_for(controller.acquire(create), timeout=1)
+        assert create.waiting == 0
+
+        controller.release(create)
+        controller.release(bulk)
+        await queued_bulk
+        controller.release(bulk)
+
+    _run(scenario)
+
+    assert controller.in_use == 0
@@ -0,0 +1,83 @@
+import pytest
+from datetime import date
+from types import SimpleNamespace
+from typing import Optional
+from fastapi import APIRouter, FastAPI, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from app.config import settings
+from app.controllers.fast_json import FastJSONRoute, compile_projector
+from app.schemas.user_schema import UserDetailPage, BulkUserResponse
+
+class Item(BaseModel):
+    id: int
+    created_at: Optional[date] = None
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "FAST_JSON", True)
+    router = APIRouter(route_class=FastJSONRoute)
+
+    @router.get("/items/{item_id}", response_model=Item)
+    def get_item(item_id: int, response: Response):
+        response.headers["ETag"] = '"v1"'
+        return SimpleNamespace(id=item_id, created_at=date(2024, 1, 2), secret="hidden")
+
+    @router.post("/items", response_model=list[Item], status_code=201)
+    async def create_items():
+        return [{"id": 1}, {"id": 2, "created_at": None}]
+
+    @router.get("/raw", response_model=Item)
+    def raw():
+        return Response(status_code=304)
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+def test_projects_orm_objects_and_keeps_headers(client):
+    response = client.get("/items/7")
+
+    assert response.status_code == 200
+    assert response.json() == {"id": 7, "created_at": "2024-01-02"}
+    assert response.headers["etag"] == '"v1"'
+
+def test_async_endpoint_and_status_code(client):
+    response = client.post("/items")
+
+    assert response.status_code == 201
+    assert response.json() == [{"id": 1, "created_at": None}, {"id": 2, "created_at": None}]
+
+def test_response_passthrough(client):
+    assert client.get("/raw").status_code == 304
+
+def test_compile_projector_nested_models():
+    project = compile_projector(UserDetailPage)
+    role = SimpleNamespace(id=1, description="Admin")
+
+    page = project({"items": [SimpleNamespace(id=1, name="Ana", email="ana@example.com", role=role, claims=[])], "next_cursor": None})
+
+    assert page == {
+        "items": [{"id": 1, "name": "Ana", "email": "ana@example.com", "role": {"id": 1, "description": "Admin"}, "claims": []}],
+        "next_cursor": None
+    }
+
+def test_compile_projector_optional_model():
+    project = compile_projector(BulkUserResponse)
+
+    result = project({"created": 0, "failed": 1, "results": [{"index": 0, "status_code": 404, "user": None, "detail": "role not found"}]})
+
+    assert result["results"][0] == {"index": 0, "status_code": 404, "user": None, "detail": "role not found"}
+
+def test_disabled_by_default(monkeypatch):
+    monkeypatch.setattr(settings, "FAST_JSON", False)
+    router = APIRouter(route_class=FastJSONRoute)
+
+    @router.get("/item", response_model=Item)
+    def get_item():
+        return {"id": "3"}
+
+    app = FastAPI()
+    app.include_router(router)
+
+    assert TestClient(app).get("/item").json() == {"id": 3, "created_at": None}
@@ -0,0 +1,130 @@
+import logging
+import pytest
+from datetime import date
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.config import settings
+from app.diagnostics import query_diagnostics
+from app.diagnostics.middleware import QueryDiagnosticsMiddleware
+from app.models.base import Base
+from app.models.role_model import Role
+from app.models.user_model import User
+from app.repositories.claim_repository import ClaimRepository
+from app.repositories.user_repository import UserRepository
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    query_diagnostics.attach_engine(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db_session(engine):
+    session = sessionmaker(bind=engine)()
+    roles = [Role(description=f"Role {i}") for i in range(3)]
+    session.add_all(roles)
+    session.commit()
+    session.add_all([
+        User(name=f"User {i}", email=f"user{i}@example.com", password="hash", role_id=roles[i].id, created_at=date.today())
+        for i in range(3)
+    ])
+    session.commit()
+    session.expunge_all()
+    yield session
+    session.close()
+
+def test_slow_query_logs_parameters_and_repository(db_session, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 1e-9)
+
+    with caplog.at_level(logging.WARNING, logger=query_diagnostics.__name__):
+        ClaimRepository(db_session).get_all_claims()
+
+    message = caplog.records[-1].getMessage()
+    assert message.startswith("consulta lenta")
+    assert "app.repositories.claim_repository.ClaimRepository.get_all_claims" in message
+    assert "FROM claims" in message
+
+def test_slow_users_insert_does_not_log_the_password(db_session, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 1e-9)
+    repository = UserRepository(db_session)
+    values = {"name": "New", "role_id": 1, "created_at": date.today()}
+
+    with caplog.at_level(logging.WARNING, logger=query_diagnostics.__name__):
+        repository.insert_users(db_session, [
+            {**values, "email": "bulk0@example.com", "password": "bulk-secret-0"},
+            {**values, "email": "bulk1@example.com", "password": "bulk-secret-1"},
+        ])
+        row = repository.insert_user(db_session, {**values, "email": "single@example.com", "password": "single-secret"})
+        repository.update_password_hash(db_session, row.id, "single-secret", "rehashed-secret")
+
+    logged = "\n".join(record.getMessage() for record in caplog.records)
+    assert "INSERT INTO users" in logged and "UPDATE users" in logged
+    assert "bulk0@example.com" in logged and "single@example.com" in logged
+    assert "secret" not in logged
+
+def test_named_parameters_are_redacted_by_key():
+    parameters = {"email__0": "a@example.com", "password__0": "x", "password": "y", "password_1": "z"}
+
+    redacted = query_diagnostics._redact_parameters(parameters, None, False)
+
+    assert redacted == {"email__0": "a@example.com", "password__0": "***", "password": "***", "password_1": "***"}
+
+def test_slow_query_disabled(db_session, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+
+    with caplog.at_level(logging.WARNING, logger=query_diagnostics.__name__):
+        ClaimRepository(db_session).get_all_claims()
+
+    assert caplog.records == []
+
+def test_lazy_loading_is_reported_as_n_plus_one(db_session, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 3)
+    query_log = query_diagnostics.QueryLog()
+    token = query_diagnostics.current_query_log.set(query_log)
+    try:
+        users = db_session.query(User).all()
+        [user.role.description for user in users]
+    finally:
+        query_diagnostics.current_query_log.reset(token)
+
+    with caplog.at_level(logging.WARNING, logger=query_diagnostics.__name__):
+        repeated = query_diagnostics.report_n_plus_one(query_log, "GET /users")
+
+    assert len(repeated) == 1
+    assert repeated[0][1] == 3
+    assert "FROM roles" in repeated[0][0]
+    assert "possível n+1 em GET /users" in caplog.records[-1].getMessage()
+
+def test_middleware_reports_n_plus_one(engine, db_session, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 2)
+    app = FastAPI()
+    app.add_middleware(QueryDiagnosticsMiddleware)
+
+    @app.get("/repeat/{times}")
+    def repeat(times: int):
+        with engine.connect() as connection:
+            for _ in range(times):
+                connection.execute(text("SELECT 1"))
+        return {}
+
+    with caplog.at_level(logging.WARNING, logger=query_diagnostics.__name__):
+        TestClient(app).get("/repeat/1")
+        assert caplog.records == []
+        TestClient(app).get("/repeat/2")
+
+    assert "possível n+1 em GET /repeat/{times}: comando executado 2 vezes" in caplog.records[-1].getMessage()
+
+def test_assert_max_queries(db_session):
+    with query_diagnostics.assert_max_queries(1) as query_log:
+        ClaimRepository(db_session).get_all_claims()
+    assert query_log.count == 1
+
+    with pytest.raises(AssertionError, match="2 comandos sql executados, orçamento de 1"):
+        with query_diagnostics.assert_max_queries(1):
+            ClaimRepository(db_session).get_all_claims()
+            ClaimRepository(db_session).get_all_claims()
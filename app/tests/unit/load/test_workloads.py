@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+from app.tests.load.workloads import PROFILES, ActionPicker, UniqueEmails, check_slo, load_slo, summarize_stats
+
+def _entry(name, method, requests, failures, p50, p95, p99):
+    percentiles = {0.50: p50, 0.95: p95, 0.99: p99}
+    return SimpleNamespace(
+        name=name, method=method, num_requests=requests, num_failures=failures,
+        get_response_time_percentile=percentiles.__getitem__,
+    )
+
+def test_unique_emails_do_not_repeat_across_workers():
+    first, second = UniqueEmails("run1", 0), UniqueEmails("run1", 1)
+
+    emails = [first.next() for _ in range(1000)] + [second.next() for _ in range(1000)]
+
+    assert len(set(emails)) == 2000
+    assert emails[0] == "load-run1-w0-0@example.com"
+
+def test_action_picker_is_reproducible_per_seed_and_user():
+    def sequence(seed, user):
+        picker = ActionPicker("read-heavy", seed, user)
+        return [picker.next() for _ in range(200)]
+
+    assert sequence(42, 0) == sequence(42, 0)
+    assert sequence(42, 0) != sequence(42, 1)
+    assert sequence(42, 0) != sequence(43, 0)
+
+def test_action_picker_follows_profile_weights():
+    picker = ActionPicker("write-heavy", 7, 0)
+
+    picks = [picker.next() for _ in range(10000)]
+
+    assert set(picks) == set(PROFILES["write-heavy"])
+    assert 0.65 < picks.count("create_user") / len(picks) < 0.75
+
+def test_summarize_stats_skips_endpoints_without_requests():
+    summary = summarize_stats([
+        _entry("/role/[role_id]", "GET", 200, 2, 3, 9, 20),
+        _entry("/claims", "GET", 0, 0, 0, 0, 0),
+    ])
+
+    assert summary == {
+        "GET /role/[role_id]": {"requests": 200, "error_rate": 0.01, "p50_ms": 3, "p95_ms": 9, "p99_ms": 20},
+    }
+
+def test_check_slo_uses_endpoint_limits_over_default():
+    summary = {
+        "GET /role/[role_id]": {"error_rate": 0.0, "p95_ms": 60, "p99_ms": 90},
+        "GET /unknown": {"error_rate": 0.05, "p95_ms": 100, "p99_ms": 600},
+    }
+    slo = {"default": {"p95_ms": 250, "p99_ms": 500, "error_rate": 0.01}, "GET /role/[role_id]": {"p95_ms": 50}}
+
+    assert check_slo(summary, slo) == [
+        "GET /role/[role_id] p95_ms: 60 > 50",
+        "GET /unknown error_rate: 0.05 > 0.01",
+        "GET /unknown p99_ms: 600 > 500",
+    ]
+
+def test_default_slo_file_covers_every_endpoint_metric():
+    slo = load_slo()
+
+    assert set(slo["default"]) == {"p95_ms", "p99_ms", "error_rate"}
@@ -0,0 +1,59 @@
+import threading
+from app.metrics.registry import Counter, Gauge, Histogram, render
+
+def test_counter_sums_threads():
+    counter = Counter("test_counter_total", "contador de teste", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc("a")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc("b", amount=2.5)
+
+    assert counter.value("a") == 4000
+    assert render([counter]).splitlines() == [
+        "# HELP test_counter_total contador de teste",
+        "# TYPE test_counter_total counter",
+        'test_counter_total{kind="a"} 4000',
+        'test_counter_total{kind="b"} 2.5',
+    ]
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_duration_seconds", "histograma de teste", ("route",), buckets=(0.1, 1.0))
+
+    histogram.observe(0.05, "/role/{role_id}")
+    histogram.observe(0.1, "/role/{role_id}")
+    histogram.observe(3, "/role/{role_id}")
+
+    assert histogram.count("/role/{role_id}") == 3
+    assert render([histogram]).splitlines()[2:] == [
+        'test_duration_seconds_bucket{route="/role/{role_id}",le="0.1"} 2',
+        'test_duration_seconds_bucket{route="/role/{role_id}",le="1"} 2',
+        'test_duration_seconds_bucket{route="/role/{role_id}",le="+Inf"} 3',
+        'test_duration_seconds_sum{route="/role/{role_id}"} 3.15',
+        'test_duration_seconds_count{route="/role/{role_id}"} 3',
+    ]
+
+def test_label_values_are_escaped():
+    counter = Counter("test_escape_total", "escape", ("path",))
+    counter.inc('a"b\\c')
+
+    assert render([counter]).splitlines()[-1] == 'test_escape_total{path="a\\"b\\\\c"} 1'
+
+def test_gauge_goes_up_and_down():
+    gauge = Gauge("test_in_flight", "gauge de teste", ("route",))
+
+    gauge.inc("POST /users/")
+    gauge.inc("POST /users/")
+    gauge.dec("POST /users/")
+
+    assert gauge.value("POST /users/") == 1
+    assert render([gauge]).splitlines()[1:] == [
+        "# TYPE test_in_flight gauge",
+        'test_in_flight{route="POST /users/"} 1',
+    ]
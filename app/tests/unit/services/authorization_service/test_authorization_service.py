@@ -0,0 +1,72 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from unittest.mock import patch, MagicMock
+from app.cache.claim_cache import claim_cache
+from app.services.authorization_service import AuthorizationService
+from app.repositories.user_claim_repository import UserClaimRepository
+
+@pytest.fixture
+def db_session():
+    """Mock da sessão do banco de dados."""
+    return MagicMock(spec=Session)
+
+@patch.object(UserClaimRepository, 'get_active_claim_ids', return_value=[1, 3])
+def test_has_claim_uses_cached_bits(mock_get_claims, db_session):
+    assert AuthorizationService.has_claim(db_session, 1, 1)
+    assert not AuthorizationService.has_claim(db_session, 1, 2)
+    assert AuthorizationService.has_all_claims(db_session, 1, [1, 3])
+    assert not AuthorizationService.has_all_claims(db_session, 1, [1, 2])
+    mock_get_claims.assert_called_once_with(db_session, 1)
+
+@patch.object(UserClaimRepository, 'get_active_claim_ids', return_value=None)
+def test_unknown_user_has_no_claims(mock_get_claims, db_session):
+    assert not AuthorizationService.has_claim(db_session, 99, 1)
+    assert not AuthorizationService.has_all_claims(db_session, 99, [])
+    with pytest.raises(HTTPException) as exc_info:
+        AuthorizationService.get_permissions(db_session, 99, [1])
+    assert exc_info.value.status_code == 404
+
+@patch.object(UserClaimRepository, 'get_active_claim_ids', return_value=[2, 5])
+def test_get_permissions(mock_get_claims, db_session):
+    permissions = AuthorizationService.get_permissions(db_session, 4, [2, 3])
+
+    assert permissions == {"user_id": 4, "claims": [2, 5], "checks": {2: True, 3: False}, "has_all": False}
+
+@patch.object(UserClaimRepository, 'get_active_claim_ids', return_value=[1, 3])
+def test_out_of_range_claim_ids_are_not_granted(mock_get_claims, db_session):
+    assert not AuthorizationService.has_claim(db_session, 1, -1)
+    assert not AuthorizationService.has_claim(db_session, 1, 400000000)
+    assert not AuthorizationService.has_all_claims(db_session, 1, [1, -1])
+
+    permissions = AuthorizationService.get_permissions(db_session, 1, [1, -1, 400000000])
+
+    assert permissions["checks"] == {1: True, -1: False, 400000000: False}
+    assert permissions["has_all"] is False
+
+@patch.object(UserClaimRepository, 'grant_claim')
+def test_grant_claim_invalidates_cache(mock_grant, db_session):
+    claim_cache.set(1, 0)
+
+    AuthorizationService.grant_claim(db_session, 1, 2)
+
+    mock_grant.assert_called_once_with(db_session, 1, 2)
+    assert len(claim_cache) == 0
+
+@patch.object(UserClaimRepository, 'grant_claim')
+def test_grant_claim_unknown_reference(mock_grant, db_session):
+    mock_grant.side_effect = IntegrityError("INSERT", {}, Exception("FOREIGN KEY constraint failed"))
+
+    with pytest.raises(HTTPException) as exc_info:
+        AuthorizationService.grant_claim(db_session, 1, 999)
+    assert exc_info.value.status_code == 404
+
+@patch.object(UserClaimRepository, 'revoke_claim', return_value=False)
+def test_revoke_claim_not_granted(mock_revoke, db_session):
+    claim_cache.set(1, 0b10)
+
+    with pytest.raises(HTTPException) as exc_info:
+        AuthorizationService.revoke_claim(db_session, 1, 1)
+    assert exc_info.value.status_code == 404
+    assert len(claim_cache) == 0
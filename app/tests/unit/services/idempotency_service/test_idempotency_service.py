@@ -0,0 +1,164 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.models.base import Base
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.services.idempotency_service import IdempotencyService
+
+ROUTE = "POST /users/"
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'idempotency.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+def _run(session_factory, key, request_hash, work):
+    async def call():
+        with session_factory() as db:
+            return await IdempotencyService.run(db, ROUTE, key, request_hash, work)
+    return call()
+
+def test_replay_returns_stored_body_without_running_again(session_factory):
+    calls = []
+
+    async def work():
+        calls.append(1)
+        return {"id": len(calls)}
+
+    async def scenario():
+        first = await _run(session_factory, "k1", "h", work)
+        second = await _run(session_factory, "k1", "h", work)
+        return first, second
+
+    assert asyncio.run(scenario()) == (({"id": 1}, False), ({"id": 1}, True))
+    assert len(calls) == 1
+
+def test_concurrent_duplicate_waits_for_the_first_request(session_factory):
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return {"id": 7}
+
+    async def scenario():
+        return await asyncio.gather(*(_run(session_factory, "k2", "h", work) for _ in range(3)))
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert sorted(replayed for _, replayed in results) == [False, True, True]
+    assert all(body == {"id": 7} for body, _ in results)
+
+def test_client_errors_are_stored_and_replayed(session_factory):
+    calls = []
+
+    async def work():
+        calls.append(1)
+        raise HTTPException(status_code=400, detail="email already registered")
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                await _run(session_factory, "k3", "h", work)
+            assert (exc_info.value.status_code, exc_info.value.detail) == (400, "email already registered")
+
+    asyncio.run(scenario())
+
+    assert len(calls) == 1
+
+def test_unexpected_error_releases_the_key(session_factory):
+    attempts = []
+
+    async def work():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("conexão perdida")
+        return {"id": 1}
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await _run(session_factory, "k4", "h", work)
+        return await _run(session_factory, "k4", "h", work)
+
+    assert asyncio.run(scenario()) == ({"id": 1}, False)
+    assert len(attempts) == 2
+
+def test_key_reused_with_other_data_is_rejected(session_factory):
+    async def work():
+        return {"id": 1}
+
+    async def scenario():
+        await _run(session_factory, "k5", "h1", work)
+        with pytest.raises(HTTPException) as exc_info:
+            await _run(session_factory, "k5", "h2", work)
+        return exc_info.value.status_code
+
+    assert asyncio.run(scenario()) == 422
+
+def test_request_hash_covers_sensitive_fields_without_storing_them():
+    data = {"email": "a@example.com"}
+    first = IdempotencyService.request_hash(data, sensitive={"password": "password123"})
+
+    assert first == IdempotencyService.request_hash(data, sensitive={"password": "password123"})
+    assert first != IdempotencyService.request_hash(data, sensitive={"password": "another-secret"})
+    assert first != IdempotencyService.request_hash({**data, "password": "password123"})
+    assert IdempotencyService.request_hash(data, sensitive={"password": None}) != IdempotencyService.request_hash(data)
+
+def test_waiting_gives_up_with_409(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_TIMEOUT", 0.05)
+    now = datetime.now(timezone.utc)
+    with session_factory() as db:
+        IdempotencyRepository.claim(db, ROUTE, "k6", "h", now, now + timedelta(seconds=30), now + timedelta(hours=1))
+
+    async def work():
+        raise AssertionError("a requisição em andamento não pode ser executada de novo")
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(_run(session_factory, "k6", "h", work))
+
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.headers["Retry-After"]
+
+def test_stale_and_expired_keys(session_factory):
+    now = datetime.now(timezone.utc)
+    past = now - timedelta(seconds=1)
+    future = now + timedelta(hours=1)
+    with session_factory() as db:
+        # em andamento e com o prazo vencido: outra requisição assume a chave
+        assert IdempotencyRepository.claim(db, ROUTE, "stale", "h", now, past, future)
+        assert IdempotencyRepository.claim(db, ROUTE, "stale", "h", now, future, future)
+        assert not IdempotencyRepository.claim(db, ROUTE, "stale", "h", now, future, future)
+
+        token = IdempotencyRepository.claim(db, ROUTE, "old", "h", now, future, future)
+        IdempotencyRepository.complete(db, ROUTE, "old", token, 200, "{}", past)
+        token = IdempotencyRepository.claim(db, ROUTE, "done", "h", now, future, future)
+        IdempotencyRepository.complete(db, ROUTE, "done", token, 200, "{}", future)
+
+    assert IdempotencyService.purge_expired(session_factory) == 1
+    with session_factory() as db:
+        assert IdempotencyRepository.get(db, ROUTE, "old") is None
+        assert IdempotencyRepository.get(db, ROUTE, "done").status_code == 200
+
+def test_request_whose_lease_expired_cannot_touch_the_new_owner(session_factory):
+    now = datetime.now(timezone.utc)
+    past = now - timedelta(seconds=1)
+    future = now + timedelta(hours=1)
+    with session_factory() as db:
+        slow = IdempotencyRepository.claim(db, ROUTE, "lease", "h", now, past, future)
+        retry = IdempotencyRepository.claim(db, ROUTE, "lease", "h", now, future, future)
+        assert slow and retry and slow != retry
+
+        # a requisição lenta termina depois de perder a reserva
+        assert not IdempotencyRepository.complete(db, ROUTE, "lease", slow, 500, "{}", future)
+        IdempotencyRepository.release(db, ROUTE, "lease", slow)
+        assert IdempotencyRepository.get(db, ROUTE, "lease").status_code is None
+
+        assert IdempotencyRepository.complete(db, ROUTE, "lease", retry, 200, '{"id": 1}', future)
+        assert IdempotencyRepository.get(db, ROUTE, "lease").response_body == '{"id": 1}'
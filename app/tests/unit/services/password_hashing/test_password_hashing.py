@@ -0,0 +1,59 @@
+import pytest
+from app.config import settings
+from app.services import password_hashing
+
+@pytest.fixture(autouse=True)
+def restore_rounds():
+    previous = password_hashing._rounds, password_hashing._policy
+    yield
+    password_hashing._rounds, password_hashing._policy = previous
+    password_hashing.get_pwd_context.cache_clear()
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """
+    relógio em que cada hash de calibração leva 'per_hash' segundos
+    """
+    state = {"now": 0.0, "per_hash": 0.01}
+
+    def hashpw(password, salt):
+        state["now"] += state["per_hash"]
+
+    monkeypatch.setattr(password_hashing.time, "perf_counter", lambda: state["now"])
+    monkeypatch.setattr("bcrypt.hashpw", hashpw)
+    return state
+
+def test_calibration_extrapolates_to_target(fake_clock):
+    fake_clock["per_hash"] = 0.010
+
+    # 8 rounds em 10ms: 12 rounds levam 160ms e 13 rounds, 320ms
+    assert password_hashing.calibrate_bcrypt_rounds(0.25, 4, 20) == 12
+
+def test_calibration_respects_floor_and_ceiling(fake_clock):
+    fake_clock["per_hash"] = 0.100
+    assert password_hashing.calibrate_bcrypt_rounds(0.25, 10, 20) == 10
+
+    fake_clock["per_hash"] = 0.0001
+    assert password_hashing.calibrate_bcrypt_rounds(1.0, 10, 14) == 14
+
+def test_fixed_rounds_skip_calibration(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 11)
+    monkeypatch.setattr(password_hashing, "calibrate_bcrypt_rounds", lambda *args: pytest.fail("calibrou"))
+    password_hashing._rounds = password_hashing._policy = None
+
+    assert password_hashing.get_rounds() == 11
+
+def test_hashes_outside_tolerance_need_update(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_MIN_ROUNDS", 4)
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS_TOLERANCE", 1)
+    password_hashing.configure_rounds(4)
+    cheap = password_hashing.get_pwd_context().hash("password123")
+    password_hashing.configure_rounds(5)
+    close = password_hashing.get_pwd_context().hash("password123")
+
+    password_hashing.configure_rounds(6)
+    context = password_hashing.get_pwd_context()
+
+    assert context.needs_update(cheap)
+    assert not context.needs_update(close)
+    assert context.hash("password123").startswith("$2b$06$")
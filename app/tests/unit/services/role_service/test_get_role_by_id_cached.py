@@ -0,0 +1,52 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.cache import role_cache
+from app.config import settings
+from app.models.role_model import Role
+from app.repositories.role_repository import RoleRepository
+from app.services.role_service import RoleService
+
+@pytest.fixture
+def db_session():
+    """Mock da sessão do banco de dados."""
+    return MagicMock(spec=Session)
+
+@pytest.fixture(autouse=True)
+def enable_role_cache(monkeypatch):
+    monkeypatch.setattr(settings, "ROLE_CACHE_ENABLED", True)
+
+@patch.object(RoleRepository, 'get_role_by_id')
+def test_cache_hit_does_not_query(mock_get_role_by_id, db_session):
+    mock_get_role_by_id.return_value = Role(id=1, description="Admin")
+
+    first = RoleService.get_role_by_id(db_session, 1)
+    second = RoleService.get_role_by_id(db_session, 1)
+
+    mock_get_role_by_id.assert_called_once_with(db_session, 1)
+    assert first.description == second.description == "Admin"
+    assert second.id == 1
+
+@patch.object(RoleRepository, 'get_role_by_id')
+def test_missing_role_is_cached(mock_get_role_by_id, db_session):
+    mock_get_role_by_id.return_value = None
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            RoleService.get_role_by_id(db_session, 99)
+        assert exc_info.value.status_code == 404
+
+    mock_get_role_by_id.assert_called_once_with(db_session, 99)
+
+@patch.object(RoleRepository, 'get_role_by_id')
+def test_notification_invalidates_entry(mock_get_role_by_id, db_session):
+    mock_get_role_by_id.return_value = None
+    with pytest.raises(HTTPException):
+        RoleService.get_role_by_id(db_session, 3)
+
+    role_cache.invalidate("3")
+    mock_get_role_by_id.return_value = Role(id=3, description="Nova")
+
+    assert RoleService.get_role_by_id(db_session, 3).description == "Nova"
+    assert mock_get_role_by_id.call_count == 2
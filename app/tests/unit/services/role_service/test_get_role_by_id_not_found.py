@@ -4,6 +4,7 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app.services.role_service import RoleService
 from app.repositories.role_repository import RoleRepository
+from app.models.role_model import Role
 
 @pytest.fixture
 def db_session():
@@ -13,7 +14,7 @@ def db_session():
 @patch.object(RoleRepository, 'get_role_by_id')
 def test_get_role_by_id_success(mock_get_role_by_id, db_session):
     """Teste de sucesso para o método get_role_by_id."""
-    mock_role = {"id": 1, "name": "Admin"}
+    mock_role = Role(id=1, description="Admin")
     mock_get_role_by_id.return_value = mock_role
 
     result = RoleService.get_role_by_id(db_session, 1)
@@ -0,0 +1,24 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy.orm import Session
+from app.cache.table_version_cache import version_cache
+from app.repositories.table_version_repository import TableVersionRepository
+from app.services.table_version_service import TableVersionService
+
+@pytest.fixture
+def db_session():
+    """Mock da sessão do banco de dados."""
+    return MagicMock(spec=Session)
+
+@patch.object(TableVersionRepository, 'get_version')
+def test_get_version_is_cached_until_invalidated(mock_get_version, db_session):
+    mock_get_version.return_value = 5
+
+    assert TableVersionService.get_version(db_session, "roles") == 5
+    assert TableVersionService.get_version(db_session, "roles") == 5
+    mock_get_version.assert_called_once_with(db_session, "roles")
+
+    version_cache.invalidate("roles")
+    mock_get_version.return_value = 6
+
+    assert TableVersionService.get_version(db_session, "roles") == 6
@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+from sqlalchemy.orm import Session
+from unittest.mock import patch, MagicMock, AsyncMock
+from fastapi import HTTPException
+from app.config import settings
+from app.services.async_user_service import AsyncUserService
+from app.services.user_service import UserService
+from app.services.user_insert_batcher import user_insert_batcher
+from app.repositories.async_user_repository import AsyncUserRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.user_schema import UserCreate
+
+@pytest.fixture
+def db_session():
+    """Mock da sessão do banco de dados."""
+    return MagicMock(spec=Session)
+
+@patch.object(UserRepository, 'insert_user')
+def test_create_user_async_hashes_before_single_insert(mock_insert_user, db_session):
+    user_data = UserCreate(
+        name="Carlos Santos",
+        email="carlos@example.com",
+        password="password123",
+        role_id=1
+    )
+    calls = []
+
+    async def fake_hash(password):
+        calls.append("hash")
+        return "hashed_password"
+
+    def fake_insert(db, values):
+        calls.append("insert")
+        return values
+
+    mock_insert_user.side_effect = fake_insert
+
+    with patch.object(UserService, 'hash_password_async', new=AsyncMock(side_effect=fake_hash)):
+        created_user = asyncio.run(UserService.create_user_async(db_session, user_data))
+
+    assert calls == ["hash", "insert"]
+    assert created_user["password"] == "hashed_password"
+    assert created_user["email"] == user_data.email
+    db_session.execute.assert_not_called()
+
+@patch.object(UserRepository, 'insert_user', return_value=None)
+def test_create_user_async_duplicate_email(mock_insert_user, db_session):
+    user_data = UserCreate(name="Carlos Santos", email="carlos@example.com", password=None, role_id=1)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(UserService.create_user_async(db_session, user_data))
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "email already registered"
+
+@patch.object(UserRepository, 'insert_user')
+def test_create_user_async_uses_the_insert_batcher_when_enabled(mock_insert_user, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "USER_INSERT_BATCHING", True)
+    user_data = UserCreate(name="Carlos Santos", email="carlos@example.com", password=None, role_id=1)
+
+    with patch.object(user_insert_batcher, "insert", new=AsyncMock(return_value=None)) as batched_insert:
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(UserService.create_user_async(db_session, user_data))
+
+    assert exc_info.value.status_code == 400
+    batched_insert.assert_awaited_once()
+    mock_insert_user.assert_not_called()
+
+def test_async_service_uses_the_insert_batcher_when_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "USER_INSERT_BATCHING", True)
+    user_data = UserCreate(name="Carlos Santos", email="carlos@example.com", password=None, role_id=1)
+    row = MagicMock(id=1, email="carlos@example.com")
+
+    with patch.object(user_insert_batcher, "insert", new=AsyncMock(return_value=row)) as batched_insert:
+        with patch.object(AsyncUserRepository, "insert_user") as direct_insert:
+            assert asyncio.run(AsyncUserService.create_user(MagicMock(), user_data)) is row
+
+    batched_insert.assert_awaited_once()
+    direct_insert.assert_not_called()
@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from sqlalchemy.orm import Session
+from unittest.mock import patch, MagicMock, AsyncMock
+from fastapi import HTTPException
+from app.config import settings
+from app.services.user_service import UserService
+from app.repositories.user_repository import UserRepository
+from app.repositories.role_repository import RoleRepository
+from app.schemas.user_schema import UserCreate
+
+@pytest.fixture
+def db_session():
+    """Mock da sessão do banco de dados."""
+    return MagicMock(spec=Session)
+
+def _user(email, role_id=1, password="password123"):
+    return UserCreate(name="Bulk User", email=email, password=password, role_id=role_id)
+
+@patch.object(RoleRepository, 'get_existing_role_ids', return_value={1})
+@patch.object(UserRepository, 'get_existing_emails', return_value={"taken@example.com"})
+@patch.object(UserRepository, 'insert_users')
+def test_create_users_bulk_reports_each_item(mock_insert_users, mock_get_existing_emails, mock_get_existing_role_ids, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_INSERT_CHUNK_SIZE", 1)
+    users = [
+        _user("a@example.com"),
+        _user("b@example.com", role_id=99),
+        _user("Taken@example.com"),
+        _user("A@example.com"),
+        _user("c@example.com", password=None),
+    ]
+    inserted_rows = []
+
+    def fake_insert(db, rows):
+        inserted_rows.extend(rows)
+        return [SimpleNamespace(id=i, name=row["name"], email=row["email"]) for i, row in enumerate(rows, start=len(inserted_rows))]
+
+    mock_insert_users.side_effect = fake_insert
+    hash_mock = AsyncMock(side_effect=lambda passwords: [f"hashed:{p}" for p in passwords])
+
+    with patch("app.services.user_service.hash_passwords_in_pool", new=hash_mock), \
+         patch.object(UserService, 'generate_random_password', return_value="generated"):
+        result = asyncio.run(UserService.create_users_bulk(db_session, users))
+
+    mock_get_existing_role_ids.assert_called_once_with(db_session, {1, 99})
+    mock_get_existing_emails.assert_called_once()
+    hash_mock.assert_awaited_once_with(["password123", "generated"])
+    assert mock_insert_users.call_count == 2
+    assert inserted_rows[0]["password"] == "hashed:password123"
+    assert [r["status_code"] for r in result["results"]] == [200, 404, 400, 400, 200]
+    assert result["results"][0]["user"].email == "a@example.com"
+    assert result["created"] == 2
+    assert result["failed"] == 3
+
+@patch.object(RoleRepository, 'get_existing_role_ids', return_value={1})
+@patch.object(UserRepository, 'get_existing_emails', return_value=set())
+@patch.object(UserRepository, 'insert_users', return_value=[])
+def test_create_users_bulk_conflict_during_insert(mock_insert_users, mock_get_existing_emails, mock_get_existing_role_ids, db_session):
+    with patch("app.services.user_service.hash_passwords_in_pool", new=AsyncMock(return_value=["hashed"])):
+        result = asyncio.run(UserService.create_users_bulk(db_session, [_user("late@example.com")]))
+
+    assert result["results"] == [{"index": 0, "status_code": 400, "detail": "email already registered"}]
+
+@patch.object(RoleRepository, 'get_existing_role_ids', return_value={1})
+@patch.object(UserRepository, 'get_existing_emails', return_value=set())
+@patch.object(UserRepository, 'insert_users')
+def test_create_users_bulk_stores_generated_passwords_hashed(mock_insert_users, mock_get_existing_emails, mock_get_existing_role_ids, db_session):
+    mock_insert_users.side_effect = lambda db, rows: [SimpleNamespace(id=1, name=row["name"], email=row["email"]) for row in rows]
+    hash_mock = AsyncMock(side_effect=lambda passwords: [f"hashed:{p}" for p in passwords])
+
+    with patch("app.services.user_service.hash_passwords_in_pool", new=hash_mock), \
+         patch.object(UserService, 'generate_random_password', return_value="generated"):
+        asyncio.run(UserService.create_users_bulk(db_session, [_user("nopass@example.com", password=None)]))
+
+    stored = mock_insert_users.call_args.args[1][0]["password"]
+    assert stored != "generated"
+    assert stored == "hashed:generated"
+
+def test_create_users_bulk_rejects_oversized_requests(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 1)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(UserService.create_users_bulk(db_session, [_user("a@example.com"), _user("b@example.com")]))
+
+    assert exc_info.value.status_code == 413
@@ -0,0 +1,25 @@
+import asyncio
+from app.services.user_service import UserService
+from app.services.hashing_executor import hash_passwords_in_pool, shutdown_hashing_executor
+from app.services.password_hashing import get_pwd_context
+
+def test_hash_password_async():
+    password = "password123"
+    try:
+        hashed_password = asyncio.run(UserService.hash_password_async(password))
+    finally:
+        shutdown_hashing_executor()
+
+    assert hashed_password != password
+    assert get_pwd_context().verify(password, hashed_password)
+
+def test_hash_passwords_in_pool_keeps_order():
+    passwords = ["first-pass", "second-pass", "third-pass"]
+    try:
+        hashes = asyncio.run(hash_passwords_in_pool(passwords))
+    finally:
+        shutdown_hashing_executor()
+
+    assert len(hashes) == len(passwords)
+    pwd_context = get_pwd_context()
+    assert all(pwd_context.verify(p, h) for p, h in zip(passwords, hashes))
@@ -0,0 +1,59 @@
+import json
+import pytest
+from types import SimpleNamespace
+from sqlalchemy.orm import Session
+from unittest.mock import patch, MagicMock
+from app.services.user_service import UserService
+from app.repositories.user_repository import UserRepository
+
+@pytest.fixture
+def db_session():
+    """Mock da sessão do banco de dados."""
+    return MagicMock(spec=Session)
+
+def _rows(*ids):
+    return [SimpleNamespace(id=i, name=f"User {i}", email=f"user{i}@example.com") for i in ids]
+
+@patch.object(UserRepository, 'get_users_page')
+def test_list_users_with_next_page(mock_get_users_page, db_session):
+    mock_get_users_page.return_value = _rows(4, 5, 6)
+
+    page = UserService.list_users(db_session, 3, 2)
+
+    mock_get_users_page.assert_called_once_with(3, 3)
+    assert [row.id for row in page["items"]] == [4, 5]
+    assert page["next_cursor"] == 5
+
+@patch.object(UserRepository, 'get_users_page')
+def test_list_users_last_page(mock_get_users_page, db_session):
+    mock_get_users_page.return_value = _rows(7)
+
+    page = UserService.list_users(db_session, 6, 2)
+
+    assert page["next_cursor"] is None
+
+def test_stream_users_ndjson():
+    batch = [MagicMock(_asdict=lambda: {"id": 1, "name": "Ana", "email": "ana@example.com"})]
+    session = MagicMock(spec=Session)
+    session_factory = MagicMock(return_value=MagicMock(__enter__=lambda s: session, __exit__=lambda *a: None))
+
+    with patch.object(UserRepository, 'stream_users', return_value=iter([batch, batch])):
+        chunks = list(UserService.stream_users_ndjson(session_factory, None))
+
+    lines = "".join(chunks).splitlines()
+    assert len(chunks) == 2
+    assert [json.loads(line)["email"] for line in lines] == ["ana@example.com", "ana@example.com"]
+
+@patch.object(UserRepository, 'get_users_with_role_and_claims_page')
+def test_list_users_with_role_and_claims(mock_get_page, db_session):
+    users = [
+        {"id": i, "name": f"User {i}", "email": f"user{i}@example.com", "role": {"id": 1, "description": "Admin"}, "claims": []}
+        for i in (1, 2, 3)
+    ]
+    mock_get_page.return_value = users
+
+    page = UserService.list_users_with_role_and_claims(db_session, None, 2)
+
+    mock_get_page.assert_called_once_with(None, 3)
+    assert page["items"] == users[:2]
+    assert page["next_cursor"] == 2
@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+from datetime import date
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+from app.models.base import Base
+from app.models.role_model import Role
+from app.models.user_model import User
+from app.services.user_insert_batcher import UserInsertBatcher
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'batch.db'}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", lambda connection, _: connection.execute("PRAGMA foreign_keys=ON"))
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        db.add(Role(id=1, description="Administrador"))
+        db.add(User(name="Taken", email="taken@example.com", password="x", role_id=1, created_at=date.today()))
+        db.commit()
+    yield factory
+    engine.dispose()
+
+def _values(email, role_id=1):
+    return {"name": email.split("@")[0], "email": email, "password": "hashed", "role_id": role_id, "created_at": date.today()}
+
+def _count_statements(session_factory, prefix):
+    statements = []
+    event.listen(
+        session_factory.kw["bind"], "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement) if statement.startswith(prefix) else None
+    )
+    return statements
+
+def _gather(batcher, values):
+    async def scenario():
+        return await asyncio.gather(*(batcher.insert(item) for item in values), return_exceptions=True)
+    return asyncio.run(scenario())
+
+def test_concurrent_inserts_share_one_statement(session_factory):
+    inserts = _count_statements(session_factory, "INSERT INTO users")
+    batcher = UserInsertBatcher(window=0.05, max_rows=100, session_factory=session_factory)
+
+    results = _gather(batcher, [_values(f"user{i}@example.com") for i in range(20)])
+
+    assert [row.email for row in results] == [f"user{i}@example.com" for i in range(20)]
+    assert len({row.id for row in results}) == 20
+    assert len(inserts) == 1
+
+def test_each_caller_gets_its_own_error(session_factory):
+    batcher = UserInsertBatcher(window=0.05, max_rows=100, session_factory=session_factory)
+
+    results = _gather(batcher, [
+        _values("new@example.com"),
+        _values("TAKEN@example.com"),
+        _values("bad-role@example.com", role_id=99),
+        _values("New@example.com"),
+        _values("other@example.com"),
+    ])
+
+    assert results[0].email == "new@example.com"
+    assert results[1] is None
+    assert isinstance(results[2], HTTPException) and results[2].status_code == 404
+    assert results[3] is None
+    assert results[4].email == "other@example.com"
+    with session_factory() as db:
+        assert db.scalar(select(func.count()).select_from(User)) == 3
+
+def test_full_batch_is_written_without_waiting_for_the_window(session_factory):
+    inserts = _count_statements(session_factory, "INSERT INTO users")
+    batcher = UserInsertBatcher(window=60, max_rows=5, session_factory=session_factory)
+
+    async def scenario():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.insert(_values(f"fast{i}@example.com")) for i in range(10))), timeout=5
+        )
+
+    assert len(asyncio.run(scenario())) == 10
+    assert len(inserts) == 2
@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from datetime import date
+from types import SimpleNamespace
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.config import settings
+from app.models.base import Base
+from app.models.role_model import Role
+from app.models.user_model import User
+from app.services import password_hashing
+from app.services.hashing_executor import shutdown_hashing_executor
+from app.services.user_service import UserService
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Role(id=1, description="Administrador"))
+    db.commit()
+    yield db
+    db.close()
+    engine.dispose()
+
+@pytest.fixture
+def rounds(monkeypatch):
+    """
+    política de custo barata para os testes: hashes antigos com 4 rounds, atual com 6
+    """
+    previous = password_hashing._rounds, password_hashing._policy
+    monkeypatch.setattr(settings, "BCRYPT_MIN_ROUNDS", 4)
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS_TOLERANCE", 0)
+    password_hashing.configure_rounds(4)
+    yield password_hashing.configure_rounds
+    password_hashing._rounds, password_hashing._policy = previous
+    password_hashing.get_pwd_context.cache_clear()
+
+def _user(db, password_hash):
+    user = User(name="Carlos", email="carlos@example.com", password=password_hash, role_id=1, created_at=date.today())
+    db.add(user)
+    db.commit()
+    return user
+
+def test_verify_password_rehashes_outdated_hash(db_session, rounds):
+    user = _user(db_session, UserService.hash_password("password123"))
+    rounds(6)
+
+    assert UserService.verify_password(db_session, user, "password123")
+
+    db_session.expire_all()
+    assert db_session.get(User, user.id).password.startswith("$2b$06$")
+    assert UserService.verify_password(db_session, user, "password123")
+
+def test_verify_password_rejects_wrong_password_without_rehash(db_session, rounds):
+    old_hash = UserService.hash_password("password123")
+    user = _user(db_session, old_hash)
+    rounds(6)
+
+    assert not UserService.verify_password(db_session, user, "wrong-password")
+    db_session.expire_all()
+    assert db_session.get(User, user.id).password == old_hash
+
+def test_rehash_does_not_overwrite_changed_password(db_session, rounds):
+    user = _user(db_session, UserService.hash_password("new-password"))
+    # usuário lido antes da troca de senha, ainda com o hash antigo
+    stale = SimpleNamespace(id=user.id, password=UserService.hash_password("password123"))
+    rounds(6)
+
+    assert UserService.verify_password(db_session, stale, "password123")
+    db_session.expire_all()
+    assert UserService.verify_password(db_session, db_session.get(User, user.id), "new-password")
+
+def test_verify_password_async_uses_pool(db_session, rounds):
+    user = _user(db_session, UserService.hash_password("password123"))
+    rounds(6)
+    shutdown_hashing_executor()
+    try:
+        valid = asyncio.run(UserService.verify_password_async(db_session, user, "password123"))
+    finally:
+        shutdown_hashing_executor()
+
+    assert valid
+    db_session.expire_all()
+    assert db_session.get(User, user.id).password.startswith("$2b$06$")
+
+def test_verify_password_fails_for_unhashed_generated_password(db_session, rounds):
+    # usuários criados sem senha guardam a senha aleatória sem hash
+    user = _user(db_session, UserService.generate_random_password())
+
+    assert not UserService.verify_password(db_session, user, user.password)
+    assert not UserService.verify_password(db_session, user, "password123")
+    shutdown_hashing_executor()
+    try:
+        assert not asyncio.run(UserService.verify_password_async(db_session, user, "password123"))
+    finally:
+        shutdown_hashing_executor()
@@ -0,0 +1,54 @@
+"""roles change notifications
+
+Revision ID: 3f8a1c2d9e47
+Revises: 6b902945ce46
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a1c2d9e47'
+down_revision: Union[str, None] = '6b902945ce46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_roles_changed() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                PERFORM pg_notify('roles_changed', '*');
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM pg_notify('roles_changed', OLD.id::text);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM pg_notify('roles_changed', NEW.id::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER roles_notify_changed
+        AFTER INSERT OR UPDATE OR DELETE ON roles
+        FOR EACH ROW EXECUTE FUNCTION notify_roles_changed()
+    """)
+    op.execute("""
+        CREATE TRIGGER roles_notify_truncated
+        AFTER TRUNCATE ON roles
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_roles_changed()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS roles_notify_truncated ON roles")
+    op.execute("DROP TRIGGER IF EXISTS roles_notify_changed ON roles")
+    op.execute("DROP FUNCTION IF EXISTS notify_roles_changed()")
@@ -0,0 +1,69 @@
+"""user claims change notifications
+
+Revision ID: b57e2c9a1d64
+Revises: 8d2e5b7a4c13
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b57e2c9a1d64'
+down_revision: Union[str, None] = '8d2e5b7a4c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_user_claims_changed() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                PERFORM pg_notify('user_claims_changed', '*');
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM pg_notify('user_claims_changed', OLD.user_id::text);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM pg_notify('user_claims_changed', NEW.user_id::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_claims_catalog_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('user_claims_changed', '*');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER user_claims_notify_changed
+        AFTER INSERT OR UPDATE OR DELETE ON user_claims
+        FOR EACH ROW EXECUTE FUNCTION notify_user_claims_changed()
+    """)
+    op.execute("""
+        CREATE TRIGGER user_claims_notify_truncated
+        AFTER TRUNCATE ON user_claims
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_user_claims_changed()
+    """)
+    op.execute("""
+        CREATE TRIGGER claims_notify_user_claims
+        AFTER UPDATE OR DELETE OR TRUNCATE ON claims
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_claims_catalog_changed()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS claims_notify_user_claims ON claims")
+    op.execute("DROP TRIGGER IF EXISTS user_claims_notify_truncated ON user_claims")
+    op.execute("DROP TRIGGER IF EXISTS user_claims_notify_changed ON user_claims")
+    op.execute("DROP FUNCTION IF EXISTS notify_claims_catalog_changed()")
+    op.execute("DROP FUNCTION IF EXISTS notify_user_claims_changed()")
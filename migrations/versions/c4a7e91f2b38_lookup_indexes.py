@@ -0,0 +1,56 @@
+"""lookup indexes
+
+Revision ID: c4a7e91f2b38
+Revises: b57e2c9a1d64
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e91f2b38'
+down_revision: Union[str, None] = 'b57e2c9a1d64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# índices das chaves primárias criados com index=True, que duplicam o índice da própria chave,
+# e o índice único ix_users_email, coberto pelo mais restrito ix_users_email_lower. este último
+# também precisa sair porque não é o árbitro do ON CONFLICT (lower(email)) dos inserts: dois
+# cadastros simultâneos do mesmo e-mail violariam ix_users_email em vez de serem ignorados
+REDUNDANT_INDEXES = (
+    ('ix_users_id', 'users', ['id'], False),
+    ('ix_roles_id', 'roles', ['id'], False),
+    ('ix_claims_id', 'claims', ['id'], False),
+    ('ix_users_email', 'users', ['email'], True),
+)
+
+
+def upgrade() -> None:
+    # um CREATE UNIQUE INDEX CONCURRENTLY que falha deixa um índice inválido para trás
+    duplicates = [] if op.get_context().as_sql else op.get_bind().execute(sa.text(
+        "SELECT lower(email) FROM users GROUP BY lower(email) HAVING count(*) > 1 LIMIT 10"
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "e-mails duplicados sem diferenciar maiúsculas; corrija-os antes da migração: " + ", ".join(duplicates)
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True, postgresql_concurrently=True)
+        op.create_index('ix_users_role_id', 'users', ['role_id'], postgresql_concurrently=True)
+        op.create_index('ix_user_claims_claim_id', 'user_claims', ['claim_id'], postgresql_concurrently=True)
+        for name, table, _, _ in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in REDUNDANT_INDEXES:
+            op.create_index(name, table, columns, unique=unique, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_user_claims_claim_id', table_name='user_claims', postgresql_concurrently=True)
+        op.drop_index('ix_users_role_id', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_email_lower', table_name='users', postgresql_concurrently=True)